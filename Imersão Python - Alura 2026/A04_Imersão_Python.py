@@ -1,6 +1,9 @@
-import pandas as pd
 import streamlit as st
-import plotly.express as px
+
+import dados_salarios
+import graficos_salarios
+import indice_bitmap
+import paginacao
 
 # --- Configuração da Página ---
 # Define o título da página, o ícone e o layout para ocupar a largura inteira.
@@ -9,8 +12,20 @@ st.set_page_config(
     page_icon="📊",
     layout="wide",
 )
+# --- Gráficos em cache ---
+# Cada gráfico recebe uma tabela já agregada (poucas linhas). O st.cache_data usa
+# o hash dessa tabela como chave, então o Plotly só é chamado quando ela muda.
+# As tabelas e as figuras são montadas em graficos_salarios.py, o mesmo código
+# que o benchmarks/bench_dashboard.py mede.
+grafico_top_cargos = st.cache_data(max_entries=64)(graficos_salarios.grafico_top_cargos)
+grafico_histograma = st.cache_data(max_entries=64)(graficos_salarios.grafico_histograma)
+grafico_remoto = st.cache_data(max_entries=64)(graficos_salarios.grafico_remoto)
+grafico_paises = st.cache_data(max_entries=64)(graficos_salarios.grafico_paises)
+
+
 # --- Carregamento dos dados ---
-df = pd.read_csv("https://raw.githubusercontent.com/vqrca/dashboard_salarios_dados/refs/heads/main/dados-imersao-final.csv")
+# O CSV é baixado só uma vez e fica em cache no disco e na memória (ver dados_salarios.py)
+df = dados_salarios.carregar_salarios()
 
 # --- Barra Lateral (Filtros) ---
 st.sidebar.header("🔍 Filtros")
@@ -32,13 +47,17 @@ tamanhos_disponiveis = sorted(df['tamanho_empresa'].unique())
 tamanhos_selecionados = st.sidebar.multiselect("Tamanho da Empresa", tamanhos_disponiveis, default=tamanhos_disponiveis)
 
 # --- Filtragem do DataFrame ---
-# O dataframe principal é filtrado com base nas seleções feitas na barra lateral.
-df_filtrado = df[
-    (df['ano'].isin(anos_selecionados)) &
-    (df['senioridade'].isin(senioridades_selecionadas)) &
-    (df['contrato'].isin(contratos_selecionados)) &
-    (df['tamanho_empresa'].isin(tamanhos_selecionados))
-]
+# O dataframe principal é filtrado com base nas seleções feitas na barra lateral,
+# usando o índice bitmap montado uma vez por carga dos dados (ver indice_bitmap.py).
+indice = indice_bitmap.indice_para(df)
+selecoes = {
+    'ano': anos_selecionados,
+    'senioridade': senioridades_selecionadas,
+    'contrato': contratos_selecionados,
+    'tamanho_empresa': tamanhos_selecionados,
+}
+mascara_filtro = indice.filtrar(selecoes)
+df_filtrado = df[mascara_filtro]
 # --- Conteúdo Principal ---
 st.title("🎲 Dashboard de Análise de Salários na Área de Dados")
 st.markdown("Explore os dados salariais na área de dados nos últimos anos. Utilize os filtros à esquerda para refinar sua análise.")
@@ -46,13 +65,9 @@ st.markdown("Explore os dados salariais na área de dados nos últimos anos. Uti
 # --- Métricas Principais (KPIs) ---
 st.subheader("Métricas gerais (Salário anual em USD)")
 
-if not df_filtrado.empty:
-    salario_medio = df_filtrado['usd'].mean()
-    salario_maximo = df_filtrado['usd'].max()
-    total_registros = df_filtrado.shape[0]
-    cargo_mais_frequente = df_filtrado["cargo"].mode()[0]
-else:
-    salario_medio, salario_mediano, salario_maximo, total_registros, cargo_mais_comum = 0, 0, 0, ""
+# As métricas de cada combinação de filtros ficam memorizadas no índice (calculadas
+# sobre o df_filtrado acima, sem filtrar de novo)
+salario_medio, salario_maximo, total_registros, cargo_mais_frequente = indice.kpis(df_filtrado, selecoes)
 
 col1, col2, col3, col4 = st.columns(4)
 col1.metric("Salário médio", f"${salario_medio:,.0f}")
@@ -69,30 +84,14 @@ col_graf1, col_graf2 = st.columns(2)
 
 with col_graf1:
     if not df_filtrado.empty:
-        top_cargos = df_filtrado.groupby('cargo')['usd'].mean().nlargest(10).sort_values(ascending=True).reset_index()
-        grafico_cargos = px.bar(
-            top_cargos,
-            x='usd',
-            y='cargo',
-            orientation='h',
-            title="Top 10 cargos por salário médio",
-            labels={'usd': 'Média salarial anual (USD)', 'cargo': ''}
-        )
-        grafico_cargos.update_layout(title_x=0.1, yaxis={'categoryorder':'total ascending'})
+        grafico_cargos = grafico_top_cargos(graficos_salarios.top_cargos(df_filtrado))
         st.plotly_chart(grafico_cargos, use_container_width=True)
     else:
         st.warning("Nenhum dado para exibir no gráfico de cargos.")
 
 with col_graf2:
     if not df_filtrado.empty:
-        grafico_hist = px.histogram(
-            df_filtrado,
-            x='usd',
-            nbins=30,
-            title="Distribuição de salários anuais",
-            labels={'usd': 'Faixa salarial (USD)', 'count': ''}
-        )
-        grafico_hist.update_layout(title_x=0.1)
+        grafico_hist = grafico_histograma(graficos_salarios.faixas_salariais(df_filtrado))
         st.plotly_chart(grafico_hist, use_container_width=True)
     else:
         st.warning("Nenhum dado para exibir no gráfico de distribuição.")
@@ -101,36 +100,31 @@ col_graf3, col_graf4 = st.columns(2)
 
 with col_graf3:
     if not df_filtrado.empty:
-        remoto_contagem = df_filtrado['remoto'].value_counts().reset_index()
-        remoto_contagem.columns = ['tipo_trabalho', 'quantidade']
-        grafico_remoto = px.pie(
-            remoto_contagem,
-            names='tipo_trabalho',
-            values='quantidade',
-            title='Proporção dos tipos de trabalho',
-            hole=0.5
-        )
-        grafico_remoto.update_traces(textinfo='percent+label')
-        grafico_remoto.update_layout(title_x=0.1)
-        st.plotly_chart(grafico_remoto, use_container_width=True)
+        st.plotly_chart(grafico_remoto(graficos_salarios.contagem_remoto(df_filtrado)), use_container_width=True)
     else:
         st.warning("Nenhum dado para exibir no gráfico dos tipos de trabalho.")
 
 with col_graf4:
-    if not df_filtrado.empty:
-        df_ds = df_filtrado[df_filtrado['cargo'] == 'Data Scientist']
-        media_ds_pais = df_ds.groupby('residencia_iso3')['usd'].mean().reset_index()
-        grafico_paises = px.choropleth(media_ds_pais,
-            locations='residencia_iso3',
-            color='usd',
-            color_continuous_scale='rdylgn',
-            title='Salário médio de Cientista de Dados por país',
-            labels={'usd': 'Salário médio (USD)', 'residencia_iso3': 'País'})
-        grafico_paises.update_layout(title_x=0.1)
-        st.plotly_chart(grafico_paises, use_container_width=True)
+    if 'residencia_iso3' not in df_filtrado.columns:
+        # Arquivo limpo sem o pycountry instalado (ver limpeza_salarios.iso3_por_categoria)
+        st.info("Mapa de países indisponível: os dados não têm a coluna residencia_iso3.")
+    elif not df_filtrado.empty:
+        media_ds_pais = graficos_salarios.media_cientistas_por_pais(df_filtrado)
+        st.plotly_chart(grafico_paises(media_ds_pais), use_container_width=True)
     else:
         st.warning("Nenhum dado para exibir no gráfico de países.")
 
 # --- Tabela de Dados Detalhados ---
 st.subheader("Dados Detalhados")
-st.dataframe(df_filtrado)
\ No newline at end of file
+# Ordenação feita no servidor com a ordem pré-calculada de cada coluna (ver indice_bitmap.py);
+# só a página visível é enviada ao navegador (ver paginacao.py)
+ordenacoes = {
+    "Ordem original": (None, False),
+    "Maior salário": ('usd', True),
+    "Menor salário": ('usd', False),
+    "Mais recentes": ('ano', True),
+}
+ordenacao = st.radio("Ordenar por:", list(ordenacoes), horizontal=True)
+coluna_ordem, decrescente = ordenacoes[ordenacao]
+posicoes = indice.posicoes(df, mascara_filtro, coluna_ordem, decrescente)
+paginacao.mostrar_paginada(df, "pagina_detalhes", posicoes)
\ No newline at end of file
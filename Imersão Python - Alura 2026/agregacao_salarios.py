@@ -0,0 +1,217 @@
+import argparse
+import copy
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+# --- AGREGAÇÃO FORA DA MEMÓRIA ---
+# As análises da aula 3 e do dashboard (média por senioridade, top 10 cargos,
+# histograma, quantis do boxplot, média por país) calculadas pedaço por pedaço.
+# Cada pedaço gera um estado parcial pequeno (somas, contagens, máximos e um
+# "sketch" de quantis) e os estados parciais podem ser juntados em qualquer ordem.
+# Assim a memória usada depende do número de grupos, não do número de linhas.
+TOTAL = "Total"
+# Erro relativo máximo dos quantis aproximados (1%)
+PRECISAO_QUANTIS = 0.01
+
+
+def ler_partes(origem, tamanho_parte=500_000, colunas=None):
+    """Lê um CSV ou Parquet em pedaços de até tamanho_parte linhas."""
+    if str(origem).endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        arquivo = pq.ParquetFile(origem)
+        for lote in arquivo.iter_batches(batch_size=tamanho_parte, columns=colunas):
+            yield lote.to_pandas()
+    else:
+        with pd.read_csv(origem, chunksize=tamanho_parte, usecols=colunas) as leitor:
+            yield from leitor
+
+
+class Resumo:
+    """Estado parcial (e juntável) de uma coluna numérica, opcionalmente por grupo.
+
+    Os quantis usam um sketch de baldes logarítmicos (como o DDSketch): cada valor
+    positivo cai no balde ceil(log(x) / log(gama)), e qualquer quantil é devolvido
+    com erro relativo de no máximo `precisao`. Com precisao=None o sketch não é
+    montado (só contagem, soma, mínimo e máximo, bem mais rápido).
+    """
+
+    def __init__(self, valor='usd', grupo=None, limites_histograma=None, precisao=PRECISAO_QUANTIS):
+        self.valor = valor
+        self.grupo = grupo
+        self.limites = None if limites_histograma is None else np.asarray(limites_histograma, dtype=float)
+        self.gama = None if precisao is None else (1 + precisao) / (1 - precisao)
+        self.estatisticas = None
+        self.baldes = pd.Series(dtype='int64')
+        self.histograma_parcial = pd.Series(dtype='int64')
+
+    def _chaves(self, parte):
+        if self.grupo is None:
+            return pd.Series(TOTAL, index=parte.index)
+        return parte[self.grupo].astype(str)
+
+    def atualizar(self, parte):
+        parte = parte.dropna(subset=[self.valor])
+        chaves = self._chaves(parte)
+        valores = parte[self.valor].astype(float)
+
+        estatisticas = valores.groupby(chaves).agg(n='count', soma='sum', minimo='min', maximo='max')
+        self._juntar_estatisticas(estatisticas)
+
+        if self.gama is not None:
+            # Valores <= 0 vão todos para um balde especial (índice mínimo)
+            positivos = valores.to_numpy() > 0
+            indices = np.full(len(valores), np.iinfo(np.int32).min, dtype=np.int64)
+            indices[positivos] = np.ceil(np.log(valores.to_numpy()[positivos]) / math.log(self.gama))
+            baldes = pd.Series(1, index=pd.MultiIndex.from_arrays([chaves.to_numpy(), indices]))
+            self.baldes = self.baldes.add(baldes.groupby(level=[0, 1]).sum(), fill_value=0).astype('int64')
+
+        if self.limites is not None:
+            faixas = np.digitize(valores.to_numpy(), self.limites[1:-1])
+            contagem = pd.Series(1, index=pd.MultiIndex.from_arrays([chaves.to_numpy(), faixas]))
+            self.histograma_parcial = self.histograma_parcial.add(
+                contagem.groupby(level=[0, 1]).sum(), fill_value=0).astype('int64')
+        return self
+
+    def _juntar_estatisticas(self, estatisticas):
+        if self.estatisticas is None:
+            self.estatisticas = estatisticas
+            return
+        juntas = pd.concat([self.estatisticas, estatisticas]).groupby(level=0)
+        self.estatisticas = pd.DataFrame({
+            'n': juntas['n'].sum(),
+            'soma': juntas['soma'].sum(),
+            'minimo': juntas['minimo'].min(),
+            'maximo': juntas['maximo'].max(),
+        })
+
+    def juntar(self, outro):
+        """Soma o estado de outro Resumo (de outro pedaço ou de outro processo) a este."""
+        if outro.estatisticas is not None:
+            self._juntar_estatisticas(outro.estatisticas)
+        self.baldes = self.baldes.add(outro.baldes, fill_value=0).astype('int64')
+        self.histograma_parcial = self.histograma_parcial.add(outro.histograma_parcial, fill_value=0).astype('int64')
+        return self
+
+    # --- RESULTADOS ---
+    def contagem(self):
+        return self.estatisticas['n']
+
+    def media(self):
+        return self.estatisticas['soma'] / self.estatisticas['n']
+
+    def maximo(self):
+        return self.estatisticas['maximo']
+
+    def histograma(self, grupo=TOTAL):
+        """Contagem por faixa, na mesma ordem de limites_histograma."""
+        contagens = self.histograma_parcial.xs(grupo, level=0) if not self.histograma_parcial.empty else None
+        quantidade = np.zeros(len(self.limites) - 1, dtype='int64')
+        if contagens is not None:
+            quantidade[contagens.index.to_numpy()] = contagens.to_numpy()
+        return pd.DataFrame({'inicio': self.limites[:-1], 'fim': self.limites[1:], 'quantidade': quantidade})
+
+    def quantis(self, probabilidades=(0.25, 0.5, 0.75)):
+        """Quantis aproximados de cada grupo (linhas) para cada probabilidade (colunas)."""
+        resultado = {}
+        for grupo, baldes in self.baldes.groupby(level=0):
+            baldes = baldes.droplevel(0).sort_index()
+            acumulado = baldes.cumsum().to_numpy()
+            indices = baldes.index.to_numpy()
+            linha = {}
+            for p in probabilidades:
+                posicao = np.searchsorted(acumulado, p * (acumulado[-1] - 1) + 1)
+                indice = indices[min(posicao, len(indices) - 1)]
+                # Valor representativo do balde (gama^(i-1), gama^i]
+                linha[p] = 0.0 if indice == np.iinfo(np.int32).min else 2 * self.gama ** indice / (self.gama + 1)
+            resultado[grupo] = linha
+        return pd.DataFrame.from_dict(resultado, orient='index')
+
+
+class Contagem:
+    """Frequência de cada valor de uma coluna (para a moda), juntável como o Resumo."""
+
+    def __init__(self, coluna):
+        self.coluna = coluna
+        self.frequencias = pd.Series(dtype='int64')
+
+    def atualizar(self, parte):
+        contagem = parte[self.coluna].astype(str).value_counts()
+        self.frequencias = self.frequencias.add(contagem, fill_value=0).astype('int64')
+        return self
+
+    def juntar(self, outro):
+        self.frequencias = self.frequencias.add(outro.frequencias, fill_value=0).astype('int64')
+        return self
+
+    def moda(self):
+        return self.frequencias.idxmax() if not self.frequencias.empty else ""
+
+
+def resumir(origem, estados, filtro=None, tamanho_parte=500_000):
+    """Passa por origem uma vez, atualizando todos os estados. filtro(parte) pode devolver uma máscara."""
+    for parte in ler_partes(origem, tamanho_parte):
+        if filtro is not None:
+            parte = parte[filtro(parte)]
+        for estado in estados:
+            estado.atualizar(parte)
+    return estados
+
+
+# --- AGREGAÇÃO DE UM DATAFRAME EM MEMÓRIA ---
+# Como os estados são juntáveis, o DataFrame pode ser dividido em fatias, cada
+# uma atualizando cópias vazias dos estados, e no fim juntamos tudo. O dashboard
+# agrega no próprio processo: abrir processos a partir do servidor do Streamlit
+# (várias threads) pode travar e, com poucos núcleos, mandar as fatias custa mais
+# que a agregação. Scripts fora do Streamlit podem passar um executor próprio,
+# criado uma vez e reaproveitado; cada tarefa leva a sua fatia e os seus estados.
+
+
+def _resumir_parte(parte, estados):
+    for estado in estados:
+        estado.atualizar(parte)
+    return estados
+
+
+def resumir_df(df, estados, executor=None, partes=None):
+    """Como resumir(), mas para um DataFrame em memória; com um ProcessPoolExecutor, uma fatia por processo."""
+    if executor is None or len(df) == 0:
+        return _resumir_parte(df, estados)
+
+    partes = partes or os.cpu_count() or 1
+    tamanho = -(-len(df) // partes)
+    fatias = [(inicio, min(inicio + tamanho, len(df))) for inicio in range(0, len(df), tamanho)]
+    vazios = [copy.deepcopy(estados) for _ in fatias]
+    parciais = executor.map(_resumir_parte, [df.iloc[i:f] for i, f in fatias], vazios)
+
+    for parcial in parciais:
+        for estado, outro in zip(estados, parcial):
+            estado.juntar(outro)
+    return estados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Análises da aula 3 sobre um CSV/Parquet de qualquer tamanho.")
+    parser.add_argument("origem", help="arquivo limpo (saída do limpeza_salarios.py)")
+    parser.add_argument("--tamanho-parte", type=int, default=500_000)
+    args = parser.parse_args()
+
+    por_senioridade = Resumo(grupo='senioridade')
+    geral = Resumo(limites_histograma=np.linspace(0, 800_000, 51))
+    por_cargo = Resumo(grupo='cargo')
+    cargos = Contagem('cargo')
+    resumir(args.origem, [por_senioridade, geral, por_cargo, cargos], tamanho_parte=args.tamanho_parte)
+
+    print("Salário médio por senioridade:")
+    print(por_senioridade.media().sort_values(ascending=False).round(2))
+    print("\nQuantis (boxplot) por senioridade:")
+    print(por_senioridade.quantis().round(0))
+    print("\nTop 10 cargos por salário médio:")
+    print(por_cargo.media().nlargest(10).round(2))
+    print(f"\nSalário máximo: {geral.maximo()[TOTAL]:,.0f} | registros: {geral.contagem()[TOTAL]:,}")
+    print(f"Cargo mais frequente: {cargos.moda()}")
+    print("\nHistograma:")
+    print(geral.histograma().to_string(index=False))
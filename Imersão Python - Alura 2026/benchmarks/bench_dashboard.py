@@ -0,0 +1,185 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import graficos_salarios
+import indice_bitmap
+import limpeza_salarios
+import paginacao
+
+# --- BENCHMARK DO DASHBOARD DE SALÁRIOS (A04) ---
+# Gera um CSV sintético no formato do salaries.csv original e passa pelas mesmas
+# etapas do A04 (leitura, limpeza, filtro, agregação, gráficos e tabela), medindo
+# tempo e pico de memória (tracemalloc) de cada seção. Com --apptest o script
+# inteiro também é executado pelo AppTest do Streamlit. As medições são
+# acrescentadas em --saida (JSON Lines), no mesmo formato do benchmark do app.py.
+PASTA_APP = Path(__file__).resolve().parent.parent
+ARQUIVO_APP = PASTA_APP / "A04_Imersão_Python.py"
+SAIDA_PADRAO = Path(__file__).resolve().parent / "resultados.jsonl"
+TAMANHOS = [1_000, 100_000, 1_000_000]
+
+PAISES = {'US': 'USA', 'GB': 'GBR', 'CA': 'CAN', 'DE': 'DEU', 'BR': 'BRA', 'IN': 'IND', 'FR': 'FRA', 'ES': 'ESP'}
+
+
+def gerar_salarios(quantidade, semente=42):
+    """CSV cru sintético com as colunas e códigos do salaries.csv da Imersão."""
+    rng = np.random.default_rng(semente)
+
+    def sortear(valores):
+        return np.asarray(valores, dtype=object)[rng.integers(0, len(valores), quantidade)]
+
+    usd = rng.lognormal(11.8, 0.5, quantidade).round()
+    return pd.DataFrame({
+        'work_year': rng.integers(2020, 2026, quantidade),
+        'experience_level': sortear(list(limpeza_salarios.TRADUCOES['senioridade'])),
+        'employment_type': sortear(list(limpeza_salarios.TRADUCOES['contrato'])),
+        'job_title': sortear(list(limpeza_salarios.TRADUCOES['cargo']) + ['Data Manager', 'BI Developer']),
+        'salary': usd,
+        'salary_currency': 'USD',
+        'salary_in_usd': usd,
+        'employee_residence': sortear(list(PAISES)),
+        'remote_ratio': sortear([0, 50, 100]),
+        'company_location': sortear(list(PAISES)),
+        'company_size': sortear(list(limpeza_salarios.TRADUCOES['tamanho_empresa'])),
+    })
+
+
+def commit_atual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PASTA_APP,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def medir(resultados, secao, funcao):
+    """Executa funcao() e guarda o tempo e o pico de memória alocada durante a chamada."""
+    medindo_memoria = tracemalloc.is_tracing()
+    if medindo_memoria:
+        tracemalloc.reset_peak()
+        antes = tracemalloc.get_traced_memory()[0]
+    inicio = time.perf_counter()
+    retorno = funcao()
+    segundos = time.perf_counter() - inicio
+    pico = round((tracemalloc.get_traced_memory()[1] - antes) / 1024 ** 2, 3) if medindo_memoria else None
+    resultados.append({"secao": secao, "segundos": round(segundos, 6), "pico_mb": pico})
+    return retorno
+
+
+def filtrar(df):
+    # Abertura do dashboard: todas as opções marcadas em todos os filtros
+    indice = indice_bitmap.IndiceBitmap(df)
+    selecoes = {coluna: df[coluna].unique().tolist() for coluna in indice_bitmap.COLUNAS_FILTRO}
+    mascara = indice.filtrar(selecoes)
+    filtrado = df[mascara]
+    return filtrado, indice.kpis(filtrado, selecoes), indice.posicoes(df, mascara, 'usd', decrescente=True)
+
+
+def agregar(df_filtrado):
+    agregados = {
+        "cargos": graficos_salarios.top_cargos(df_filtrado),
+        "faixas": graficos_salarios.faixas_salariais(df_filtrado),
+        "remoto": graficos_salarios.contagem_remoto(df_filtrado),
+    }
+    # Como no A04, o mapa só existe se a limpeza criou residencia_iso3 (precisa do pycountry)
+    if 'residencia_iso3' in df_filtrado.columns:
+        agregados["paises"] = graficos_salarios.media_cientistas_por_pais(df_filtrado)
+    return agregados
+
+
+def montar_figuras(agregados):
+    figuras = [
+        graficos_salarios.grafico_top_cargos(agregados["cargos"]),
+        graficos_salarios.grafico_histograma(agregados["faixas"]),
+        graficos_salarios.grafico_remoto(agregados["remoto"]),
+    ]
+    if "paises" in agregados:
+        figuras.append(graficos_salarios.grafico_paises(agregados["paises"]))
+    return [figura.to_json() for figura in figuras]
+
+
+def medir_etapas(arquivo):
+    resultados = []
+    bruto = medir(resultados, "carga",
+                  lambda: pd.read_csv(arquivo, **limpeza_salarios._opcoes_leitura()))
+    df = medir(resultados, "limpeza", lambda: limpeza_salarios.limpar(bruto))
+    del bruto
+    df_filtrado, _, posicoes = medir(resultados, "filtro", lambda: filtrar(df))
+    agregados = medir(resultados, "agregacao", lambda: agregar(df_filtrado))
+    medir(resultados, "figuras", lambda: montar_figuras(agregados))
+    # O st.dataframe converte para Arrow só a página visível (ver paginacao.py)
+    inicio, fim, _ = paginacao.janela(len(posicoes), 1)
+    medir(resultados, "tabelas", lambda: pa.Table.from_pandas(df.iloc[posicoes[inicio:fim]]))
+    return resultados, df
+
+
+def medir_apptest(arquivo_limpo):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    import dados_salarios
+
+    # Os caches (do Streamlit e o lru_cache do dados_salarios) vivem no processo
+    st.cache_data.clear()
+    dados_salarios._carregar.cache_clear()
+    resultados = []
+    os.environ["SALARIOS_CSV"] = arquivo_limpo
+    app = AppTest.from_file(str(ARQUIVO_APP), default_timeout=600)
+    medir(resultados, "script_primeira_execucao", app.run)
+    medir(resultados, "script_rerun", app.run)
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mede cada seção do A04 com bases de salários sintéticas.")
+    parser.add_argument("tamanhos", nargs="*", type=int, default=TAMANHOS)
+    parser.add_argument("--saida", default=str(SAIDA_PADRAO), help="arquivo JSON Lines (as linhas são acrescentadas)")
+    parser.add_argument("--apptest", action="store_true", help="executa também o A04 inteiro com o AppTest")
+    parser.add_argument("--sem-memoria", action="store_true",
+                        help="não usa o tracemalloc, que deixa as seções mais lentas")
+    args = parser.parse_args()
+
+    contexto = {
+        "dashboard": ARQUIVO_APP.name,
+        "commit": commit_atual(),
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "memoria": not args.sem_memoria,
+    }
+    if not args.sem_memoria:
+        tracemalloc.start()
+    with tempfile.TemporaryDirectory() as pasta, open(args.saida, "a", encoding="utf-8") as saida:
+        for tamanho in args.tamanhos:
+            arquivo = os.path.join(pasta, f"salarios-{tamanho}.csv")
+            gerar_salarios(tamanho).to_csv(arquivo, index=False)
+
+            resultados, df = medir_etapas(arquivo)
+            if args.apptest:
+                arquivo_limpo = os.path.join(pasta, f"salarios-{tamanho}-limpo.csv")
+                df.to_csv(arquivo_limpo, index=False)
+                resultados += medir_apptest(arquivo_limpo)
+
+            print(f"\n{tamanho:,} registros")
+            print(f"{'seção':<26} | {'tempo (s)':>9} | {'pico (MB)':>9}")
+            for resultado in resultados:
+                pico = "-" if resultado["pico_mb"] is None else f"{resultado['pico_mb']:.1f}"
+                print(f"{resultado['secao']:<26} | {resultado['segundos']:>9.3f} | {pico:>9}")
+                saida.write(json.dumps({**contexto, "linhas": tamanho, **resultado}, ensure_ascii=False) + "\n")
+    print(f"\nResultados acrescentados em {args.saida}")
@@ -0,0 +1,67 @@
+import hashlib
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+# --- CARREGAMENTO DOS DADOS DE SALÁRIOS ---
+# O CSV é baixado uma vez só e guardado em Parquet na pasta .cache; daí em diante
+# os reruns do Streamlit leem o arquivo local (e, dentro do mesmo processo, nem isso:
+# o DataFrame fica memorizado). Também é possível apontar para um arquivo local,
+# pelo parâmetro caminho ou pela variável de ambiente SALARIOS_CSV (por exemplo,
+# a saída do limpeza_salarios.py, em .csv ou .parquet).
+URL_SALARIOS = "https://raw.githubusercontent.com/vqrca/dashboard_salarios_dados/refs/heads/main/dados-imersao-final.csv"
+PASTA_CACHE = Path(__file__).parent / ".cache"
+# Aumente quando mudar TIPOS, para descartar os arquivos em cache antigos
+VERSAO_CACHE = 1
+
+# Colunas de texto com poucos valores distintos viram "category"
+TIPOS = {
+    'ano': 'int16',
+    'senioridade': 'category',
+    'contrato': 'category',
+    'cargo': 'category',
+    'usd': 'float64',
+    'remoto': 'category',
+    'tamanho_empresa': 'category',
+    'residencia_iso3': 'category',
+}
+
+
+def ler_csv(origem):
+    return pd.read_csv(origem, dtype=TIPOS)
+
+
+def arquivo_cache(url):
+    nome = hashlib.md5(f"{url}-{VERSAO_CACHE}".encode("utf-8")).hexdigest()[:12]
+    return PASTA_CACHE / f"salarios-{nome}.parquet"
+
+
+@lru_cache(maxsize=4)
+def _carregar(origem, versao):
+    # versao entra só na chave do cache: muda quando o arquivo de origem muda
+    if os.path.exists(origem):
+        if origem.endswith(".parquet"):
+            df = pd.read_parquet(origem)
+            return df.astype({coluna: tipo for coluna, tipo in TIPOS.items() if coluna in df.columns})
+        return ler_csv(origem)
+
+    cache = arquivo_cache(origem)
+    if cache.exists():
+        return pd.read_parquet(cache, memory_map=True)
+
+    df = ler_csv(origem)
+    cache.parent.mkdir(parents=True, exist_ok=True)
+    temporario = cache.with_suffix(".tmp")
+    df.to_parquet(temporario, index=False)
+    temporario.replace(cache)
+    return df
+
+
+def carregar_salarios(caminho=None, url=URL_SALARIOS):
+    """Devolve o DataFrame de salários, lendo da rede só na primeira vez."""
+    origem = caminho or os.environ.get("SALARIOS_CSV") or url
+    origem = str(origem)
+    versao = os.path.getmtime(origem) if os.path.exists(origem) else VERSAO_CACHE
+    return _carregar(origem, versao)
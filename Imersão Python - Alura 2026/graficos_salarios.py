@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+import agregacao_salarios
+
+# --- TABELAS E GRÁFICOS DO DASHBOARD (A04) ---
+# Cada gráfico do A04 tem duas partes: uma função que reduz o df_filtrado a uma
+# tabela pequena (top 10 cargos, 30 faixas de salário...) e outra que monta a
+# figura do Plotly a partir dessa tabela. Ficam aqui, fora do script do
+# Streamlit, para que o benchmark (benchmarks/bench_dashboard.py) importe e meça
+# exatamente as mesmas funções; o A04 só acrescenta o st.cache_data por cima.
+# O plotly.express é importado dentro de cada gráfico, e não no topo: a importação
+# é lenta e assim acontece só no primeiro gráfico, com os KPIs já na tela.
+CARGOS_CIENTISTA = ['Data Scientist', 'Cientista de Dados']
+
+
+def top_cargos(df_filtrado, quantidade=10):
+    por_cargo, = agregacao_salarios.resumir_df(df_filtrado, [agregacao_salarios.Resumo(grupo='cargo', precisao=None)])
+    return por_cargo.media().nlargest(quantidade).sort_values(ascending=True).rename_axis('cargo').rename('usd').reset_index()
+
+
+def faixas_salariais(df_filtrado, barras=30):
+    # O histograma é calculado aqui no servidor (30 barras), em vez de enviar
+    # todos os salários para o navegador como o px.histogram faria.
+    contagens, limites = np.histogram(df_filtrado['usd'], bins=barras)
+    return pd.DataFrame({'usd': (limites[:-1] + limites[1:]) / 2, 'quantidade': contagens})
+
+
+def contagem_remoto(df_filtrado):
+    remoto_contagem = df_filtrado['remoto'].value_counts().reset_index()
+    remoto_contagem.columns = ['tipo_trabalho', 'quantidade']
+    return remoto_contagem[remoto_contagem['quantidade'] > 0]
+
+
+def media_cientistas_por_pais(df_filtrado):
+    # O pipeline de limpeza (limpeza_salarios.py) pode traduzir os nomes dos cargos
+    df_ds = df_filtrado[df_filtrado['cargo'].isin(CARGOS_CIENTISTA)]
+    por_pais, = agregacao_salarios.resumir_df(df_ds, [agregacao_salarios.Resumo(grupo='residencia_iso3', precisao=None)])
+    return por_pais.media().rename_axis('residencia_iso3').rename('usd').reset_index()
+
+
+def grafico_top_cargos(top_cargos):
+    import plotly.express as px
+
+    grafico_cargos = px.bar(
+        top_cargos,
+        x='usd',
+        y='cargo',
+        orientation='h',
+        title="Top 10 cargos por salário médio",
+        labels={'usd': 'Média salarial anual (USD)', 'cargo': ''}
+    )
+    grafico_cargos.update_layout(title_x=0.1, yaxis={'categoryorder':'total ascending'})
+    return grafico_cargos
+
+
+def grafico_histograma(faixas):
+    import plotly.express as px
+
+    grafico_hist = px.bar(
+        faixas,
+        x='usd',
+        y='quantidade',
+        title="Distribuição de salários anuais",
+        labels={'usd': 'Faixa salarial (USD)', 'quantidade': ''}
+    )
+    grafico_hist.update_layout(title_x=0.1, bargap=0)
+    return grafico_hist
+
+
+def grafico_remoto(remoto_contagem):
+    import plotly.express as px
+
+    grafico = px.pie(
+        remoto_contagem,
+        names='tipo_trabalho',
+        values='quantidade',
+        title='Proporção dos tipos de trabalho',
+        hole=0.5
+    )
+    grafico.update_traces(textinfo='percent+label')
+    grafico.update_layout(title_x=0.1)
+    return grafico
+
+
+def grafico_paises(media_ds_pais):
+    import plotly.express as px
+
+    grafico = px.choropleth(media_ds_pais,
+        locations='residencia_iso3',
+        color='usd',
+        color_continuous_scale='rdylgn',
+        title='Salário médio de Cientista de Dados por país',
+        labels={'usd': 'Salário médio (USD)', 'residencia_iso3': 'País'})
+    grafico.update_layout(title_x=0.1)
+    return grafico
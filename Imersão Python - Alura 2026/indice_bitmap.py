@@ -0,0 +1,106 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# --- ÍNDICE BITMAP PARA OS FILTROS DA SIDEBAR ---
+# Para cada valor distinto de cada coluna de filtro guardamos um bitset (1 bit por
+# linha, compactado com np.packbits). Uma combinação de filtros vira OR entre os
+# valores marcados de uma coluna e AND entre as colunas, sobre arrays 8x menores
+# que as máscaras booleanas. As métricas (KPIs) de cada combinação ficam memorizadas.
+COLUNAS_FILTRO = ['ano', 'senioridade', 'contrato', 'tamanho_empresa']
+MAX_COMBINACOES = 128
+
+
+class IndiceBitmap:
+    def __init__(self, df, colunas=COLUNAS_FILTRO):
+        self.linhas = len(df)
+        self.vazio = np.zeros((self.linhas + 7) // 8, dtype=np.uint8)
+        self.bitmaps = {}
+        for coluna in colunas:
+            codigos, valores = pd.factorize(df[coluna])
+            self.bitmaps[coluna] = {
+                valor: np.packbits(codigos == i) for i, valor in enumerate(valores)
+            }
+        self.kpis_memorizados = OrderedDict()
+        # Ordem de cada coluna pela qual a tabela já foi ordenada (argsort feito uma vez)
+        self.ordens = {}
+        self.trava = threading.Lock()
+
+    def _bits(self, selecoes):
+        resultado = np.packbits(np.ones(self.linhas, dtype=bool))
+        for coluna, valores in selecoes.items():
+            da_coluna = self.vazio.copy()
+            for valor in valores:
+                np.bitwise_or(da_coluna, self.bitmaps[coluna].get(valor, self.vazio), out=da_coluna)
+            np.bitwise_and(resultado, da_coluna, out=resultado)
+        return resultado
+
+    def filtrar(self, selecoes):
+        """Máscara booleana das linhas que atendem a {coluna: [valores escolhidos]}."""
+        return np.unpackbits(self._bits(selecoes), count=self.linhas).astype(bool)
+
+    def posicoes(self, df, mascara, coluna=None, decrescente=False):
+        """Posições das linhas marcadas em mascara, na ordem de coluna (ou na ordem original)."""
+        if coluna is None:
+            return np.flatnonzero(mascara)
+        with self.trava:
+            if coluna not in self.ordens:
+                self.ordens[coluna] = np.argsort(df[coluna].to_numpy(), kind='stable')
+            ordem = self.ordens[coluna]
+        if decrescente:
+            ordem = ordem[::-1]
+        # Filtrar a ordem global mantém a ordenação: nenhum sort por combinação de filtros
+        return ordem[mascara[ordem]]
+
+    def kpis(self, filtrado, selecoes):
+        """Salário médio, máximo, total de registros e cargo mais frequente da combinação.
+
+        filtrado é o DataFrame já filtrado por selecoes (quem chama já o montou para os
+        gráficos); selecoes só identifica a combinação memorizada.
+        """
+        chave = tuple((coluna, tuple(sorted(valores))) for coluna, valores in sorted(selecoes.items()))
+        with self.trava:
+            if chave in self.kpis_memorizados:
+                self.kpis_memorizados.move_to_end(chave)
+                return self.kpis_memorizados[chave]
+
+        if filtrado.empty:
+            resultado = (0, 0, 0, "")
+        else:
+            resultado = (filtrado['usd'].mean(), filtrado['usd'].max(), filtrado.shape[0],
+                         filtrado["cargo"].mode()[0])
+
+        with self.trava:
+            self.kpis_memorizados[chave] = resultado
+            while len(self.kpis_memorizados) > MAX_COMBINACOES:
+                self.kpis_memorizados.popitem(last=False)
+        return resultado
+
+
+# Índices por DataFrame, compartilhados por todas as sessões do Streamlit. Guardamos
+# alguns (bases diferentes abertas ao mesmo tempo não se expulsam a cada rerun) e a
+# trava protege o dicionário de duas sessões mexendo nele ao mesmo tempo.
+MAX_INDICES = 4
+_indices = OrderedDict()
+_trava_indices = threading.Lock()
+
+
+def indice_para(df, colunas=COLUNAS_FILTRO):
+    """Devolve o índice do DataFrame, montando-o só na primeira vez."""
+    # Guardamos o próprio df junto para que o id não seja reaproveitado por outro objeto
+    chave = (id(df), tuple(colunas))
+    with _trava_indices:
+        if chave in _indices:
+            _indices.move_to_end(chave)
+            return _indices[chave][1]
+    # A montagem fica fora da trava: sessões com outras bases não esperam por ela
+    indice = IndiceBitmap(df, colunas)
+    with _trava_indices:
+        # Outra sessão pode ter montado o mesmo índice enquanto isso; fica o primeiro
+        _, indice = _indices.setdefault(chave, (df, indice))
+        _indices.move_to_end(chave)
+        while len(_indices) > MAX_INDICES:
+            _indices.popitem(last=False)
+    return indice
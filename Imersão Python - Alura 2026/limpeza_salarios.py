@@ -0,0 +1,215 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# --- PIPELINE DE LIMPEZA DOS SALÁRIOS ---
+# Mesma limpeza feita nas aulas 1 e 2 (renomear colunas, traduzir siglas e cargos,
+# dropna e ano como inteiro), mas em uma passada só: as colunas de código são lidas
+# como "category" e a tradução troca apenas os nomes das categorias, sem percorrer
+# linha por linha nem criar uma cópia do DataFrame a cada .replace().
+# Com tamanho_parte, o CSV é processado em pedaços e arquivos maiores que a memória
+# podem ser limpos (ver limpar_em_partes e salvar_limpo).
+URL_ORIGINAL = "https://raw.githubusercontent.com/guilhermeonrails/data-jobs/refs/heads/main/salaries.csv"
+
+COLUNAS = [
+    'ano',
+    'senioridade',
+    'contrato',
+    'cargo',
+    'salario',
+    'moeda',
+    'usd',
+    'residencia',
+    'remoto',
+    'empresa',
+    'tamanho_empresa'
+]
+
+TRADUCOES = {
+    'senioridade': {
+        'SE': 'Sênior',
+        'MI': 'Pleno',
+        'EN': 'Júnior',
+        'EX': 'Executivo'
+    },
+    'contrato': {
+        'FT': 'Tempo Integral',
+        'CT': 'Contrato',
+        'PT': 'Meio Período',
+        'FL': 'Freelancer'
+    },
+    'remoto': {
+        0: 'Presencial',
+        100: 'Remoto',
+        50: 'Híbrido'
+    },
+    'tamanho_empresa': {
+        'M': 'Médio',
+        'L': 'Grande',
+        'S': 'Pequeno'
+    },
+    'cargo': {
+        'Data Engineer': 'Engenheiro de Dados',
+        'Data Scientist': 'Cientista de Dados',
+        'Data Analyst': 'Analista de Dados',
+        'Machine Learning Engineer': 'Engenheiro de Machine Learning',
+        'Analytics Engineer': 'Engenheiro de Análise',
+        'Research Scientist': 'Cientista de Pesquisa',
+        'Applied Scientist': 'Cientista Aplicado',
+        'ML Engineer': 'Engenheiro de ML',
+        'Cloud Engineer': 'Engenheiro de Nuvem',
+        'AI Engineer': 'Engenheiro de IA',
+        'Software Engineer': 'Engenheiro de Software',
+        'Data Architect': 'Arquiteto de Dados',
+        'Solutions Engineer': 'Engenheiro de Soluções'
+    },
+}
+
+# Colunas lidas direto como "category" (posição no CSV original -> tipo)
+TIPOS_LEITURA = {
+    'senioridade': 'category',
+    'contrato': 'category',
+    'cargo': 'category',
+    'moeda': 'category',
+    'residencia': 'category',
+    'remoto': 'category',
+    'empresa': 'category',
+    'tamanho_empresa': 'category',
+}
+
+
+# Tipos de cada coluna no Parquet de saída, fixados antes do primeiro pedaço: as colunas
+# categóricas (e o residencia_iso3) vão como texto, ano como inteiro e os valores em
+# dinheiro como float, mesmo que um pedaço tenha vindo só com inteiros ou vazio.
+TIPOS_NUMERICOS_SAIDA = {'ano': 'int64', 'salario': 'float64', 'usd': 'float64'}
+
+
+def esquema_saida(colunas):
+    """Schema do Arrow para as colunas limpas, a partir de TIPOS_LEITURA e TIPOS_NUMERICOS_SAIDA."""
+    import pyarrow as pa
+
+    campos = []
+    for coluna in colunas:
+        if coluna in TIPOS_NUMERICOS_SAIDA:
+            campos.append(pa.field(coluna, pa.from_numpy_dtype(np.dtype(TIPOS_NUMERICOS_SAIDA[coluna]))))
+        elif coluna in TIPOS_LEITURA or coluna == 'residencia_iso3':
+            campos.append(pa.field(coluna, pa.string()))
+        else:
+            raise ValueError(f"Coluna sem tipo definido para o Parquet: {coluna}")
+    return pa.schema(campos)
+
+
+def recodificar(serie, mapa):
+    """Traduz uma coluna categórica mexendo só nas categorias, não nas linhas."""
+    # O read_csv guarda as categorias como texto ("100"), então comparamos como texto
+    mapa = {str(chave): valor for chave, valor in mapa.items()}
+    categorias = [mapa.get(str(c), c) for c in serie.cat.categories]
+    # Duas siglas podem virar o mesmo nome: juntamos as categorias repetidas
+    novos_codigos, novas_categorias = pd.factorize(pd.Index(categorias))
+    codigos = serie.cat.codes.to_numpy()
+    codigos = np.where(codigos >= 0, novos_codigos[codigos], -1)
+    return pd.Series(pd.Categorical.from_codes(codigos, novas_categorias), index=serie.index, name=serie.name)
+
+
+def iso3_por_categoria(residencia):
+    """Código ISO-3 do país de residência, calculado uma vez por país (precisa do pycountry).
+
+    Sem o pycountry devolve None: a coluna residencia_iso3 não é criada e o A04
+    deixa de mostrar o mapa de países (os outros gráficos continuam).
+    """
+    try:
+        import pycountry
+    except ImportError:
+        return None
+
+    def iso2_to_iso3(code):
+        try:
+            return pycountry.countries.get(alpha_2=code).alpha_3
+        except (LookupError, AttributeError):
+            # Sigla desconhecida: get() devolve None (ou LookupError nas versões mais novas)
+            return None
+
+    return residencia.map({c: iso2_to_iso3(c) for c in residencia.cat.categories}).astype('category')
+
+
+def limpar(df, traduzir_cargos=True):
+    """Aplica a limpeza das aulas a um DataFrame lido com ler()/ler_partes()."""
+    for coluna, mapa in TRADUCOES.items():
+        if coluna == 'cargo' and not traduzir_cargos:
+            continue
+        df[coluna] = recodificar(df[coluna], mapa)
+
+    df = df.dropna()
+    df['ano'] = df['ano'].astype('int64')
+
+    iso3 = iso3_por_categoria(df['residencia'])
+    if iso3 is not None:
+        df['residencia_iso3'] = iso3
+    return df
+
+
+def _opcoes_leitura():
+    # header=0 + names: renomeia as colunas já na leitura, como df.columns = [...] da aula 1
+    return dict(header=0, names=COLUNAS, dtype=TIPOS_LEITURA)
+
+
+def limpar_salarios(origem=URL_ORIGINAL, traduzir_cargos=True):
+    """Lê e limpa o CSV inteiro de uma vez."""
+    return limpar(pd.read_csv(origem, **_opcoes_leitura()), traduzir_cargos)
+
+
+def limpar_em_partes(origem=URL_ORIGINAL, tamanho_parte=100_000, traduzir_cargos=True):
+    """Gera o CSV limpo em pedaços de tamanho_parte linhas, com memória limitada."""
+    with pd.read_csv(origem, chunksize=tamanho_parte, **_opcoes_leitura()) as leitor:
+        for parte in leitor:
+            yield limpar(parte, traduzir_cargos)
+
+
+def salvar_limpo(origem, destino, tamanho_parte=100_000, traduzir_cargos=True):
+    """Limpa origem pedaço por pedaço e grava em destino (.csv ou .parquet)."""
+    if destino.endswith(".parquet"):
+        return _salvar_parquet(origem, destino, tamanho_parte, traduzir_cargos)
+
+    total = 0
+    for parte in limpar_em_partes(origem, tamanho_parte, traduzir_cargos):
+        parte.to_csv(destino, mode='w' if total == 0 else 'a', header=total == 0, index=False)
+        total += len(parte)
+    return total
+
+
+def _salvar_parquet(origem, destino, tamanho_parte, traduzir_cargos):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    escritor = None
+    total = 0
+    try:
+        for parte in limpar_em_partes(origem, tamanho_parte, traduzir_cargos):
+            if escritor is None:
+                # O schema vem dos tipos declarados, não do primeiro pedaço (que pode ter
+                # uma coluna só com inteiros onde os seguintes têm decimais)
+                escritor = pq.ParquetWriter(destino, esquema_saida(parte.columns))
+            # Cada pedaço tem as suas próprias categorias; gravamos como texto
+            # e o Parquet se encarrega de compactar os valores repetidos.
+            categoricas = parte.select_dtypes('category').columns
+            parte = parte.astype({c: object for c in categoricas})
+            parte = parte.astype({c: t for c, t in TIPOS_NUMERICOS_SAIDA.items() if c in parte.columns})
+            escritor.write_table(pa.Table.from_pandas(parte, schema=escritor.schema, preserve_index=False))
+            total += len(parte)
+    finally:
+        if escritor is not None:
+            escritor.close()
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Limpa o CSV de salários da Imersão em pedaços.")
+    parser.add_argument("destino", help="arquivo .csv ou .parquet de saída")
+    parser.add_argument("--origem", default=URL_ORIGINAL)
+    parser.add_argument("--tamanho-parte", type=int, default=100_000)
+    parser.add_argument("--manter-cargos", action="store_true", help="não traduz os nomes dos cargos")
+    args = parser.parse_args()
+
+    linhas = salvar_limpo(args.origem, args.destino, args.tamanho_parte, not args.manter_cargos)
+    print(f"{linhas:,} linhas limpas gravadas em {args.destino}")
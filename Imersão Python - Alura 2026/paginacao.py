@@ -0,0 +1,35 @@
+import numpy as np
+import streamlit as st
+
+# --- TABELA PAGINADA ---
+# O st.dataframe serializa para Arrow e envia ao navegador tudo o que recebe.
+# Com a base inteira isso cresce com o número de registros; aqui mandamos só a
+# página atual, escolhida sobre uma lista de posições já ordenada.
+# Cópia proposital da paginação de "Projetos Pessoais/tabelas.py": as duas pastas
+# são projetos independentes (cada uma roda com o seu `streamlit run`, sem pacote
+# instalado em comum). Correções em janela()/mostrar_paginada valem para as duas.
+TAMANHO_PAGINA = 100
+
+
+def janela(total, pagina, tamanho=TAMANHO_PAGINA):
+    """(início, fim, quantidade de páginas) da página pedida, que começa em 1 e é limitada ao total."""
+    paginas = max(-(-total // tamanho), 1)
+    pagina = min(max(int(pagina), 1), paginas)
+    inicio = (pagina - 1) * tamanho
+    return inicio, min(inicio + tamanho, total), paginas
+
+
+def mostrar_paginada(df, chave, posicoes=None, tamanho=TAMANHO_PAGINA):
+    """st.dataframe com uma página de df.iloc[posicoes] por vez."""
+    posicoes = np.arange(len(df)) if posicoes is None else posicoes
+    total = len(posicoes)
+    _, _, paginas = janela(total, 1, tamanho)
+    numero = 1
+    if paginas > 1:
+        # Com menos registros (outro filtro), a página guardada pode não existir mais
+        if st.session_state.get(chave, 1) > paginas:
+            st.session_state[chave] = paginas
+        numero = st.number_input(f"Página (de {paginas:,})", min_value=1, max_value=paginas, step=1, key=chave)
+    inicio, fim, _ = janela(total, numero, tamanho)
+    st.dataframe(df.iloc[posicoes[inicio:fim]], use_container_width=True)
+    st.caption(f"Registros {inicio + 1 if total else 0:,}–{fim:,} de {total:,}")
@@ -0,0 +1,115 @@
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import indice_bitmap
+
+
+@pytest.fixture
+def salarios():
+    rng = np.random.default_rng(7)
+    # 1001 linhas: o último byte do bitset fica incompleto
+    quantidade = 1001
+    return pd.DataFrame({
+        'ano': rng.integers(2020, 2026, quantidade),
+        'senioridade': pd.Categorical(rng.choice(['Júnior', 'Pleno', 'Sênior', 'Executivo'], quantidade)),
+        'contrato': pd.Categorical(rng.choice(['Tempo Integral', 'Contrato'], quantidade)),
+        'tamanho_empresa': pd.Categorical(rng.choice(['Pequeno', 'Médio', 'Grande'], quantidade)),
+        'cargo': pd.Categorical(rng.choice(['Cientista de Dados', 'Engenheiro de Dados', 'Analista'], quantidade)),
+        'usd': rng.integers(30_000, 300_000, quantidade).astype(float),
+    })
+
+
+@pytest.fixture(autouse=True)
+def sem_indices_compartilhados(monkeypatch):
+    monkeypatch.setattr(indice_bitmap, "_indices", indice_bitmap.OrderedDict())
+
+
+def mascara_direta(df, selecoes):
+    mascara = np.ones(len(df), dtype=bool)
+    for coluna, valores in selecoes.items():
+        mascara &= df[coluna].isin(valores).to_numpy()
+    return mascara
+
+
+@pytest.mark.parametrize("selecoes", [
+    {},
+    {'ano': [2021, 2024]},
+    {'ano': [2021, 2024], 'senioridade': ['Sênior'], 'contrato': ['Contrato', 'Tempo Integral']},
+    {'senioridade': ['Pleno', 'Executivo'], 'tamanho_empresa': ['Grande']},
+    {'senioridade': []},
+    {'senioridade': ['Estagiário']},
+])
+def test_filtrar_igual_a_mascara(salarios, selecoes):
+    indice = indice_bitmap.IndiceBitmap(salarios)
+    assert np.array_equal(indice.filtrar(selecoes), mascara_direta(salarios, selecoes))
+
+
+@pytest.mark.parametrize("coluna, decrescente", [(None, False), ('usd', True), ('usd', False), ('ano', True)])
+def test_posicoes_ordenadas(salarios, coluna, decrescente):
+    indice = indice_bitmap.IndiceBitmap(salarios)
+    mascara = indice.filtrar({'senioridade': ['Sênior']})
+    posicoes = indice.posicoes(salarios, mascara, coluna, decrescente)
+    assert sorted(posicoes) == np.flatnonzero(mascara).tolist()
+    if coluna is not None:
+        valores = salarios[coluna].to_numpy()[posicoes]
+        assert (np.diff(valores) <= 0).all() if decrescente else (np.diff(valores) >= 0).all()
+
+
+def test_kpis(salarios):
+    indice = indice_bitmap.IndiceBitmap(salarios)
+    selecoes = {'ano': [2022], 'senioridade': ['Pleno', 'Sênior']}
+    filtrado = salarios[indice.filtrar(selecoes)]
+    media, maximo, total, cargo = indice.kpis(filtrado, selecoes)
+    assert (media, maximo, total) == (filtrado['usd'].mean(), filtrado['usd'].max(), len(filtrado))
+    assert cargo == filtrado['cargo'].mode()[0]
+    # A ordem dos valores marcados não muda a combinação memorizada
+    assert indice.kpis(None, {'senioridade': ['Sênior', 'Pleno'], 'ano': [2022]}) == (media, maximo, total, cargo)
+    assert indice.kpis(salarios.iloc[0:0], {'senioridade': []}) == (0, 0, 0, "")
+
+
+def test_kpis_memorizados_sao_limitados(salarios, monkeypatch):
+    monkeypatch.setattr(indice_bitmap, "MAX_COMBINACOES", 3)
+    indice = indice_bitmap.IndiceBitmap(salarios)
+    for ano in range(2020, 2026):
+        indice.kpis(salarios[salarios['ano'] == ano], {'ano': [ano]})
+    assert list(indice.kpis_memorizados) == [(('ano', (ano,)),) for ano in [2023, 2024, 2025]]
+
+
+def test_indice_para_reaproveita_e_limita(salarios):
+    indice = indice_bitmap.indice_para(salarios)
+    assert indice_bitmap.indice_para(salarios) is indice
+
+    outros = [salarios.copy() for _ in range(indice_bitmap.MAX_INDICES)]
+    for df in outros:
+        indice_bitmap.indice_para(df)
+    assert len(indice_bitmap._indices) == indice_bitmap.MAX_INDICES
+    # O mais antigo saiu; os recentes continuam lá
+    assert indice_bitmap.indice_para(salarios) is not indice
+    assert indice_bitmap.indice_para(outros[-1]) is indice_bitmap.indice_para(outros[-1])
+
+
+def test_indice_para_com_varias_sessoes(salarios):
+    bases = [salarios, salarios.copy()]
+    barreira = threading.Barrier(8)
+    encontrados = [None] * 8
+
+    def sessao(numero):
+        barreira.wait()
+        encontrados[numero] = indice_bitmap.indice_para(bases[numero % 2])
+
+    threads = [threading.Thread(target=sessao, args=(numero,)) for numero in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Cada base fica com um único índice, mesmo montado ao mesmo tempo por várias sessões
+    assert len({id(indice) for indice in encontrados[0::2]}) == 1
+    assert len({id(indice) for indice in encontrados[1::2]}) == 1
+    assert encontrados[0] is not encontrados[1]
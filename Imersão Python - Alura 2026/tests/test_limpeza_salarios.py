@@ -0,0 +1,112 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+import pytest
+
+import limpeza_salarios
+
+COLUNAS_ORIGINAIS = ['work_year', 'experience_level', 'employment_type', 'job_title', 'salary', 'salary_currency',
+                     'salary_in_usd', 'employee_residence', 'remote_ratio', 'company_location', 'company_size']
+REGISTROS = [
+    [2024, 'SE', 'FT', 'Data Scientist', 150000, 'USD', 150000, 'US', 100, 'US', 'M'],
+    [2024, 'MI', 'CT', 'Data Engineer', 90000, 'EUR', 97000, 'DE', 0, 'DE', 'L'],
+    [2023, 'EN', 'PT', 'BI Developer', 50000, 'BRL', 10000, 'BR', 50, 'BR', 'S'],
+    [2023, 'EX', 'FL', 'Data Analyst', None, 'USD', 120000, 'US', 100, 'US', 'M'],
+    [2022, 'SE', 'FT', 'Data Scientist', 130000, 'GBP', 160000, 'GB', 0, 'GB', 'L'],
+]
+
+
+@pytest.fixture
+def csv_cru(tmp_path):
+    caminho = tmp_path / "salaries.csv"
+    pd.DataFrame(REGISTROS, columns=COLUNAS_ORIGINAIS).to_csv(caminho, index=False)
+    return str(caminho)
+
+
+@pytest.fixture
+def sem_pycountry(monkeypatch):
+    # None em sys.modules faz o import falhar com ImportError
+    monkeypatch.setitem(sys.modules, "pycountry", None)
+
+
+def test_recodificar_junta_categorias_repetidas():
+    serie = pd.Series(['a', 'b', None, 'c', 'a'], dtype='category')
+    traduzida = limpeza_salarios.recodificar(serie, {'a': 'X', 'b': 'X'})
+    assert traduzida.tolist()[:2] == ['X', 'X']
+    assert pd.isna(traduzida[2])
+    assert traduzida.tolist()[3:] == ['c', 'X']
+    assert list(traduzida.cat.categories) == ['X', 'c']
+
+
+def test_limpar(csv_cru, sem_pycountry):
+    df = limpeza_salarios.limpar_salarios(csv_cru)
+    assert list(df.columns) == limpeza_salarios.COLUNAS
+    # A linha sem salário sai no dropna
+    assert len(df) == 4
+    assert df['ano'].dtype == 'int64'
+    assert df['senioridade'].tolist() == ['Sênior', 'Pleno', 'Júnior', 'Sênior']
+    assert df['contrato'].tolist() == ['Tempo Integral', 'Contrato', 'Meio Período', 'Tempo Integral']
+    # remoto vem do CSV como texto ("100") e é traduzido do mesmo jeito
+    assert df['remoto'].tolist() == ['Remoto', 'Presencial', 'Híbrido', 'Presencial']
+    assert df['tamanho_empresa'].tolist() == ['Médio', 'Grande', 'Pequeno', 'Grande']
+    # Cargo sem tradução fica como está
+    assert df['cargo'].tolist() == ['Cientista de Dados', 'Engenheiro de Dados', 'BI Developer', 'Cientista de Dados']
+
+
+def test_manter_cargos(csv_cru, sem_pycountry):
+    df = limpeza_salarios.limpar_salarios(csv_cru, traduzir_cargos=False)
+    assert df['cargo'].tolist() == ['Data Scientist', 'Data Engineer', 'BI Developer', 'Data Scientist']
+
+
+def test_sem_pycountry_nao_cria_iso3(csv_cru, sem_pycountry):
+    assert 'residencia_iso3' not in limpeza_salarios.limpar_salarios(csv_cru).columns
+
+
+def test_iso3(csv_cru):
+    pytest.importorskip("pycountry")
+    df = limpeza_salarios.limpar_salarios(csv_cru)
+    assert df['residencia_iso3'].tolist() == ['USA', 'DEU', 'BRA', 'GBR']
+
+
+def test_em_partes_igual_de_uma_vez(csv_cru):
+    inteiro = limpeza_salarios.limpar_salarios(csv_cru)
+    partes = pd.concat(list(limpeza_salarios.limpar_em_partes(csv_cru, tamanho_parte=2)))
+    # Cada pedaço tem as suas categorias: comparamos os valores
+    pd.testing.assert_frame_equal(partes.astype(str), inteiro.astype(str))
+
+
+def test_salvar_csv(csv_cru, tmp_path, sem_pycountry):
+    destino = str(tmp_path / "limpo.csv")
+    assert limpeza_salarios.salvar_limpo(csv_cru, destino, tamanho_parte=2) == 4
+    salvo = pd.read_csv(destino)
+    assert list(salvo.columns) == limpeza_salarios.COLUNAS
+    assert salvo['usd'].tolist() == [150000, 97000, 10000, 160000]
+
+
+def test_salvar_parquet_com_schema_fixo(tmp_path, sem_pycountry):
+    import pyarrow.parquet as pq
+
+    # O 1º pedaço só tem inteiros em usd; o 2º tem decimais, que não podem ser truncados
+    registros = REGISTROS[:2] + [REGISTROS[2][:6] + [12345.67] + REGISTROS[2][7:]]
+    origem = tmp_path / "salaries.csv"
+    pd.DataFrame(registros, columns=COLUNAS_ORIGINAIS).to_csv(origem, index=False)
+    destino = str(tmp_path / "limpo.parquet")
+
+    assert limpeza_salarios.salvar_limpo(str(origem), destino, tamanho_parte=2) == 3
+    tabela = pq.read_table(destino)
+    assert tabela.schema == limpeza_salarios.esquema_saida(limpeza_salarios.COLUNAS)
+    assert tabela.column('usd').to_pylist() == [150000.0, 97000.0, 12345.67]
+    assert tabela.column('remoto').to_pylist() == ['Remoto', 'Presencial', 'Híbrido']
+
+
+def test_esquema_saida():
+    esquema = limpeza_salarios.esquema_saida(limpeza_salarios.COLUNAS + ['residencia_iso3'])
+    assert str(esquema.field('ano').type) == 'int64'
+    assert str(esquema.field('usd').type) == 'double'
+    assert str(esquema.field('cargo').type) == 'string'
+    assert str(esquema.field('residencia_iso3').type) == 'string'
+    with pytest.raises(ValueError):
+        limpeza_salarios.esquema_saida(['desconhecida'])
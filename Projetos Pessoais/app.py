@@ -1,67 +1,258 @@
+import os
+import time
+
 import streamlit as st
 import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
-import plotly.express as px
+
+import atualizacao
+import busca
+import cubo
+import filtros
+import fontes
+import graficos
+import medicao
+import moeda
+import normalizacao
+import recorrencia
+import snapshot
+import tabelas
 
 # --- CONFIGURAÇÃO DA PÁGINA ---
 st.set_page_config(layout="wide", page_title="Controle Financeiro Real-Time")
 
+# Instrumentação opcional (ver medicao.py): DEBUG_DASHBOARD=1 ou ?debug=1 na URL
+medicao.iniciar(os.environ.get(medicao.VARIAVEL_AMBIENTE) == "1" or st.query_params.get("debug") == "1")
+
+
+# --- CONEXÃO COM A PLANILHA ---
+# A autenticação fica em cache de recurso: só é refeita quando o app reinicia.
+# gspread e google-auth são importados aqui dentro, e não no topo do arquivo:
+# quando há snapshot local ele é servido antes (ver atualizador_compartilhado) e
+# essas bibliotecas só carregam quando a planilha é de fato lida.
+CAMINHOS_CREDENCIAIS = ["Projetos Pessoais/credentials.json", "credentials.json"]
+
+
+def credenciais_planilha(scope):
+    from google.oauth2.service_account import Credentials
+
+    # Escolhemos a origem da credencial antes, sem tentar cada uma até dar erro
+    if st.secrets.load_if_toml_exists() and "gcp_service_account" in st.secrets:
+        return Credentials.from_service_account_info(st.secrets["gcp_service_account"], scopes=scope)
+    for caminho in CAMINHOS_CREDENCIAIS:
+        if os.path.exists(caminho):
+            return Credentials.from_service_account_file(caminho, scopes=scope)
+    raise FileNotFoundError(f"Credenciais do Google não encontradas (st.secrets ou {', '.join(CAMINHOS_CREDENCIAIS)})")
+
+
+@st.cache_resource
+def conectar_planilha():
+    import gspread
 
-# --- FUNÇÃO PARA CARREGAR DADOS ---
-@st.cache_data(ttl=60)
-def load_data():
     scope = ["https://www.googleapis.com/auth/spreadsheets",
              "https://www.googleapis.com/auth/drive"]
 
-    try:
-        creds_info = st.secrets["gcp_service_account"]
-        creds = Credentials.from_service_account_info(creds_info, scopes=scope)
-    except Exception:
-        try:
-            creds = Credentials.from_service_account_file("Projetos Pessoais/credentials.json", scopes=scope)
-        except:
-            creds = Credentials.from_service_account_file("credentials.json", scopes=scope)
-
-    client = gspread.authorize(creds)
+    client = gspread.authorize(credenciais_planilha(scope))
     spreadsheet = client.open("Controle Financeiro Mensal com Gráficos")
-    sheet = spreadsheet.worksheet("Controle de Gastos")
-
-    data = sheet.get_all_records()
-    df = pd.DataFrame(data)
-
-    if 'Valor' in df.columns:
-        df['Valor'] = (
-            df['Valor']
-            .astype(str)
-            .str.replace('R$', '', regex=False)
-            .str.replace(' ', '', regex=False)
-            .str.replace('.', '', regex=False)
-            .str.replace(',', '.', regex=False)
-            .str.strip()
-        )
-        df['Valor'] = pd.to_numeric(df['Valor'], errors='coerce').fillna(0)
-
-    if 'Data' in df.columns:
-        df['Data'] = pd.to_datetime(df['Data'], dayfirst=True, errors='coerce')
-        df = df.dropna(subset=['Data']).sort_values('Data')
-        df['Mes_Ano'] = df['Data'].dt.strftime('%Y-%m')
-        df['Mes_Ano_Exibicao'] = df['Data'].dt.strftime('%m/%Y')
-        # --- ALTERAÇÃO 1: Adicionando coluna de Ano ---
-        df['Ano'] = df['Data'].dt.year.astype(str)
+    return spreadsheet.worksheet("Controle de Gastos")
 
+
+# --- FUNÇÃO PARA CARREGAR DADOS ---
+# A origem dos lançamentos é escolhida pela variável de ambiente FONTE_LEDGER:
+#   "planilha" (padrão, sincronização incremental), "planilha:completa",
+#   "csv:caminho/arquivo.csv" ou "sqlite:caminho/arquivo.db".
+# As fontes locais permitem testar o dashboard sem rede (veja gerador.py).
+def obter_fonte():
+    return fontes.fonte_da_configuracao(os.environ.get("FONTE_LEDGER"), conectar_planilha)
+
+
+def ler_fonte(atual=None):
+    """Lê e normaliza a fonte. Se os dados crus não mudaram desde `atual`, devolve o próprio `atual`."""
+    fonte = obter_fonte()
+    with medicao.secao("fonte.ler"):
+        bruto = fonte.ler()
+        lido_em = time.time()
+    versao_fonte = normalizacao.versao_fonte(bruto)
+    if atual is not None and atual.attrs.get("versao_fonte") == versao_fonte:
+        # Nada mudou na fonte: sem normalizar de novo nem regravar o snapshot
+        medicao.contar("fonte.sem_mudancas")
+        atual.attrs["lido_em"] = lido_em
+        return atual
+    with medicao.secao("normalizar", linhas=len(bruto)):
+        df = normalizacao.normalizar(bruto)
+    df.attrs["versao_fonte"] = versao_fonte
+    df.attrs["lido_em"] = lido_em
+    with medicao.secao("snapshot.salvar", linhas=len(df)):
+        snapshot.salvar(df, fonte.nome)
+    df.attrs["versao"] = normalizacao.versao(df)
     return df
 
 
+# Um atualizador por processo, compartilhado por todas as sessões (ver atualizacao.py):
+# relê a fonte em segundo plano antes de os dados ficarem velhos e troca o DataFrame
+# de uma vez; os reruns sempre recebem a última cópia pronta, sem esperar pela rede.
+# Na primeira carga servimos o snapshot local na hora e conferimos a fonte logo em seguida.
+@st.cache_resource(on_release=lambda atualizador: atualizador.parar())
+def atualizador_compartilhado():
+    with medicao.secao("snapshot.carregar"):
+        df = snapshot.carregar(obter_fonte().nome)
+    if df is not None:
+        medicao.contar("snapshot.servido")
+        df.attrs["versao"] = normalizacao.versao(df)
+    # Sem snapshot, a primeira sessão lê a fonte direto (não há cópia antiga para servir)
+    return atualizacao.AtualizadorLedger(ler_fonte).iniciar(df, atualizar_agora=df is not None)
+
+
+def load_data():
+    # Todas as sessões leem o mesmo DataFrame. A cópia rasa não duplica nenhuma coluna:
+    # com o copy-on-write do pandas, só o que um rerun alterasse seria copiado, e o
+    # ledger compartilhado nunca muda.
+    return atualizador_compartilhado().obter().copy(deep=False)
+
+
+# O cubo de agregados é compartilhado pelo processo e só soma as linhas novas
+# quando os dados mudam (ver cubo.py).
+@st.cache_resource
+def cubo_compartilhado():
+    return cubo.CuboMensal()
+
+
+# DataFrames filtrados por combinação da sidebar, compartilhados entre os reruns
+@st.cache_resource
+def cache_filtros():
+    return filtros.CacheLRU()
+
+
+# Índice de busca por texto, compartilhado pelo processo; como o cubo, só indexa
+# as linhas novas quando os dados mudam (ver busca.py)
+@st.cache_resource
+def indice_compartilhado():
+    return busca.IndiceBusca()
+
+
+# Detector de gastos recorrentes (ver recorrencia.py): olha o histórico inteiro e é
+# refeito só quando os dados mudam, e só quando alguma seção que o usa está aberta
+@st.cache_resource
+def detector_compartilhado():
+    return recorrencia.DetectorRecorrencia()
+
+
+def deteccao_de(df):
+    """Resultado do detector para a versão de df (ver recorrencia.Deteccao)."""
+    with medicao.secao("recorrencia.detectar"):
+        deteccao, calculada = detector_compartilhado().atualizar(df)
+    if calculada:
+        medicao.contar("recorrencia.deteccoes")
+    return deteccao
+
+
+# --- SEÇÕES COM RERUN PRÓPRIO (FRAGMENTOS) ---
+# Os widgets de dentro de um fragmento (ordenação, página da tabela) reexecutam
+# só a função do fragmento, sem recalcular gráficos e métricas do resto da página.
+# Os contadores fragmento.* do painel de depuração mostram esses reruns parciais.
+@st.fragment
+def secao_fatura(cubo_mensal, mes_visual):
+    medicao.contar("fragmento.fatura")
+    with medicao.secao("cartao.lancamentos"):
+        df_fatura_atual = cubo_mensal.lancamentos_fatura(mes_visual)
+
+        if not df_fatura_atual.empty:
+            st.markdown(f"**Lançamentos da Fatura de {mes_visual}:**")
+
+            # Só a página visível é formatada e estilizada (ver tabelas.mostrar_paginada)
+            colunas_fatura = ['Data', 'Categoria', 'Valor', 'Parcelas', 'Descrição (Opcional)']
+            tabelas.mostrar_paginada(df_fatura_atual, "pagina_fatura",
+                                     lambda janela: tabelas.preparar_lancamentos(janela, colunas_fatura))
+
+
+@st.fragment
+def secao_busca(df):
+    medicao.contar("fragmento.busca")
+    texto = st.text_input("🔎 Buscar lançamentos", key="texto_busca",
+                          placeholder="Descrição ou categoria, ex.: farmacia, merc uber")
+    if not texto.strip():
+        return
+
+    with medicao.secao("busca"):
+        # O índice só é montado na primeira busca (e atualizado quando os dados mudam)
+        indice = indice_compartilhado()
+        medicao.contar(f"busca.{indice.atualizar(df)}")
+        # As posições valem para as linhas devolvidas junto (o índice pode ser atualizado por outra sessão)
+        linhas, posicoes = indice.buscar(texto)
+
+        if len(posicoes):
+            st.caption(f"{len(posicoes):,} lançamento(s) em todo o histórico, dos mais recentes aos mais antigos")
+            tabelas.mostrar_paginada(linhas, "pagina_busca", tabelas.preparar_lancamentos, posicoes)
+        else:
+            st.info(f"Nenhum lançamento encontrado para \"{texto}\".")
+
+
+@st.fragment
+def secao_lista(df_mes, ordem_mes, Receitas_total, saidas_total_abs, deteccao):
+    medicao.contar("fragmento.lista")
+    col_rec, col_desp = st.columns(2)
+    col_rec.markdown(f"**Total Receitas:** <span style='color:#2ecc71'>R$ {Receitas_total:,.2f}</span>",
+                     unsafe_allow_html=True)
+    col_desp.markdown(
+        f"**Total Despesas:** <span style='color:#e74c3c'>R$ {saidas_total_abs:,.2f}</span>",
+        unsafe_allow_html=True)
+
+    st.divider()
+
+    ordem = st.radio(
+        "Ordenar por data:",
+        ["Mais recentes", "Mais antigas"],
+        horizontal=True
+    )
+
+    with medicao.secao("lista", linhas=len(df_mes)):
+        # A ordem por data vem pronta do recorte; "Mais recentes" é a mesma ordem ao contrário
+        posicoes = ordem_mes if ordem == "Mais antigas" else ordem_mes[::-1]
+        colunas_lista = [c for c in df_mes.columns if c not in normalizacao.COLUNAS_DERIVADAS]
+        # A sugestão do detector aparece ao lado da Recorrência da planilha (só na página visível).
+        # deteccao é da mesma versão de df_mes, mesmo quando o fragmento reroda sozinho.
+        sugerida = recorrencia.COLUNA_SUGESTAO
+        if 'Recorrência' in colunas_lista:
+            colunas_lista.insert(colunas_lista.index('Recorrência') + 1, sugerida)
+        else:
+            colunas_lista.append(sugerida)
+        tabelas.mostrar_paginada(
+            df_mes, "pagina_lista",
+            lambda janela: tabelas.preparar_lancamentos(janela.assign(**{sugerida: deteccao.rotulos_de(janela)}),
+                                                        colunas_lista),
+            posicoes)
+
+
 # --- INTERFACE DO DASHBOARD ---
 try:
-    df = load_data()
+    medicao.contar("load_data.chamadas")
+    with medicao.secao("load_data"):
+        df = load_data()
+    medicao.registrar_linhas("ledger", len(df))
 
     if df.empty:
         st.warning("Aguardando dados válidos na planilha.")
     else:
         st.title("📊 Meu Dashboard Financeiro")
 
+        # Se a fonte está falhando, seguimos com a última cópia e avisamos a idade dela
+        atualizador = atualizador_compartilhado()
+        if atualizador.erro:
+            idade = atualizador.idade()
+            st.sidebar.warning(f"Não foi possível atualizar os dados ({atualizador.falhas_seguidas} tentativa(s)). "
+                               f"Exibindo a cópia de {idade / 60:,.0f} min atrás.")
+
+        # Valores que não puderam ser lidos como reais ficam fora das contas (ver moeda.py)
+        invalidos = df.attrs.get("valores_invalidos")
+        if invalidos:
+            st.warning(f"{invalidos['total']} lançamento(s) com Valor inválido foram ignorados.")
+            with st.expander("Ver linhas com Valor inválido"):
+                st.dataframe(pd.DataFrame(invalidos["exemplos"], columns=["Linha", "Valor"]), hide_index=True)
+
+        cubo_mensal = cubo_compartilhado()
+        with medicao.secao("cubo.atualizar"):
+            modo_cubo = cubo_mensal.atualizar(df)
+        medicao.contar(f"cubo.{modo_cubo}")
+
         # --- SIDEBAR (FILTROS) ---
         st.sidebar.header("Configurações de Filtro")
 
@@ -91,319 +282,206 @@ try:
         cat_escolhidas = st.sidebar.multiselect("Filtrar Categorias", lista_cat, key="selecao_categorias")
 
         # --- PREPARAÇÃO DOS DADOS (LÓGICA DE FILTRO ADICIONADA) ---
-        df_mes_base = df[df['Mes_Ano'] == mes_selecionado]
-        df_mes = df_mes_base[df_mes_base["Categoria"].isin(cat_escolhidas)]
-
-        # Criamos uma máscara para identificar o que é investimento
-        is_invest = df_mes['Categoria'].str.contains("Investimento", case=False, na=False)
-
-        # Receitas: (Outros > 0) OU (Investimento < 0 [Resgate])
-        df_mes_Receitas = df_mes[((df_mes['Valor'] > 0) & (~is_invest)) | ((df_mes['Valor'] < 0) & (is_invest))]
-
-        # Saídas: (Outros < 0) OU (Investimento > 0 [Aplicação])
-        df_mes_saidas = df_mes[((df_mes['Valor'] < 0) & (~is_invest)) | ((df_mes['Valor'] > 0) & (is_invest))]
+        # Os recortes ficam memorizados por combinação de filtros (ver filtros.py)
+        chave = filtros.chave_filtros(df.attrs.get("versao", id(df)), ano_selecionado, mes_selecionado, cat_escolhidas,
+                                      ver_tudo)
+        with medicao.secao("filtros"):
+            recorte = cache_filtros().obter(
+                chave, lambda: filtros.recortar(df, ano_selecionado, mes_selecionado, cat_escolhidas, ver_tudo))
+        df_mes = recorte["df_mes"]
+        df_para_evolucao = recorte["df_para_evolucao"]
+        df_invest = recorte["df_invest"]
+        medicao.registrar_linhas("df_mes", len(df_mes))
+        medicao.registrar_linhas("df_para_evolucao", len(df_para_evolucao))
+        medicao.registrar_linhas("df_invest", len(df_invest))
 
         data_referencia = df['Data'].min().replace(day=1)
 
-        # --- LÓGICA DE FILTRAGEM POR PERÍODO ---
         if ver_tudo:
-            # Filtra os dados apenas para o ano que está selecionado no seletor
-            df_para_evolucao = df[(df['Ano'] == ano_selecionado) & (df["Categoria"].isin(cat_escolhidas))]
-            df_para_investimentos = df[df['Ano'] == ano_selecionado]
             texto_periodo = f"Histórico de {ano_selecionado}"
             # Intervalo de 30 dias para não poluir o eixo X em uma visão anual
             intervalo_ms = 30 * 24 * 60 * 60 * 1000
         else:
-            # Mantém a visão apenas do mês selecionado
-            df_para_evolucao = df_mes
-            df_para_investimentos = df_mes
             texto_periodo = mes_visual
             intervalo_ms = 5 * 24 * 60 * 60 * 1000
 
         # --- MÉTRICAS DO MÊS ---
-        # Somamos os valores absolutos para as métricas de exibição
-        Receitas_total = df_mes_Receitas['Valor'].abs().sum()
-        saidas_total_abs = df_mes_saidas['Valor'].abs().sum()
-        saldo_mensal = Receitas_total - saidas_total_abs
-
-        data_limite = df_mes_base['Data'].max()
-
-        # Para o saldo acumulado, precisamos garantir que o investimento positivo subtraia e o negativo some
-        df_acum_temp = df[df['Data'] <= data_limite].copy()
-        is_invest_acum = df_acum_temp['Categoria'].str.contains("Investimento", case=False, na=False)
-        # Invertemos o sinal do investimento para o cálculo do saldo:
-        df_acum_temp.loc[is_invest_acum, 'Valor'] = -df_acum_temp.loc[is_invest_acum, 'Valor']
-        saldo_acumulado = df_acum_temp['Valor'].sum()
-
-        m1, m2, m3, m4 = st.columns(4)
-        m1.metric("Receitas", f"R$ {Receitas_total:,.2f}")
-        m2.metric("Despesas", f"R$ {saidas_total_abs:,.2f}")
-        m3.metric("Saldo Mensal", f"R$ {saldo_mensal:,.2f}", delta=f"{saldo_mensal:,.2f}")
-        m4.metric("Saldo Acumulado", f"R$ {saldo_acumulado:,.2f}", delta=f"{saldo_acumulado:,.2f}")
-
-        st.divider()
-
-        # --- GRÁFICO 1: EVOLUÇÃO FINANCEIRA ---
-        st.subheader("📈 Evolução Financeira Detalhada")
-
-        df_para_evolucao = df_para_evolucao.copy()
+        with medicao.secao("metricas"):
+            # Somamos os valores absolutos para as métricas de exibição (consulta no cubo)
+            Receitas_total, saidas_total_abs = cubo_mensal.totais_mes(mes_selecionado, cat_escolhidas)
+            saldo_mensal = Receitas_total - saidas_total_abs
 
+            # O saldo acumulado vem da soma corrida por mês, já com o sinal do investimento invertido
+            saldo_acumulado = cubo_mensal.saldo_acumulado(mes_selecionado)
 
-        # Ajuste do status no gráfico para refletir a nova lógica
-        def definir_status(row):
-            if "Investimento" in str(row['Categoria']):
-                return 'Receitas' if row['Valor'] < 0 else 'Despesas'
-            return 'Receitas' if row['Valor'] > 0 else 'Despesas'
+            m1, m2, m3, m4 = st.columns(4)
+            m1.metric("Receitas", f"R$ {Receitas_total:,.2f}")
+            m2.metric("Despesas", f"R$ {saidas_total_abs:,.2f}")
+            m3.metric("Saldo Mensal", f"R$ {saldo_mensal:,.2f}", delta=f"{saldo_mensal:,.2f}")
+            m4.metric("Saldo Acumulado", f"R$ {saldo_acumulado:,.2f}", delta=f"{saldo_acumulado:,.2f}")
 
+        # --- BUSCA POR TEXTO ---
+        # Em todo o histórico, sem os filtros da sidebar; digitar reexecuta só o fragmento
+        secao_busca(df)
 
-        df_para_evolucao['Status'] = df_para_evolucao.apply(definir_status, axis=1)
-
-        df_plot = df_para_evolucao.groupby(['Data', 'Status', 'Categoria'])['Valor'].sum().reset_index()
-        df_plot['Valor_Grafico'] = df_plot['Valor'].abs()
+        st.divider()
 
-        fig_evolucao = px.line(df_plot, x='Data', y='Valor_Grafico', color='Status', markers=True,
-                               color_discrete_map={"Receitas": "#2ecc71", "Despesas": "#e74c3c"},
-                               category_orders={"Status": ["Receitas", "Despesas"]},
-                               template="plotly_dark", custom_data=['Categoria', 'Valor'],
-                               labels={"Valor_Grafico": "Valor (R$)", "Data": "Data"})
+        # --- SEÇÕES EM ABAS ---
+        # Cada aba só é calculada quando está aberta: trocar de aba faz um rerun que
+        # monta apenas a aba escolhida (as métricas acima são consultas rápidas no cubo).
+        aba_evolucao, aba_invest, aba_cartao, aba_analises = st.tabs(
+            ["📈 Evolução", "💰 Investimentos", "💳 Cartão de Crédito", "🎯 Análises Mensais"],
+            key="aba_dashboard", on_change="rerun")
 
-        fig_evolucao.update_xaxes(tickformat="%d/%m/%Y", dtick=intervalo_ms, tick0=data_referencia, tickmode="linear")
-        fig_evolucao.update_layout(hovermode="closest",
-                                   legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
-        fig_evolucao.update_traces(
-            hovertemplate="<b>Data:</b> %{x|%d/%m/%Y}<br><b>Valor Real:</b> R$ %{customdata[1]:,.2f}<br><b>Categoria:</b> %{customdata[0]}<extra></extra>")
-        st.plotly_chart(fig_evolucao, use_container_width=True)
+        # --- GRÁFICO 1: EVOLUÇÃO FINANCEIRA ---
+        if aba_evolucao.open:
+            with aba_evolucao:
+                st.subheader("📈 Evolução Financeira Detalhada")
+
+                with medicao.secao("grafico.evolucao", linhas=len(df_para_evolucao)):
+                    # O Status (Receitas/Despesas) já vem calculado no recorte (ver regras.definir_status).
+                    # Em períodos longos os pontos são agrupados por semana/mês (ver graficos.py).
+                    df_plot = graficos.reduzir_por_tempo(df_para_evolucao, [recorte["status_evolucao"], 'Categoria'],
+                                                         linha='Status')
+                    fig_evolucao = graficos.figura_evolucao(df_plot, intervalo_ms, data_referencia)
+                    st.plotly_chart(fig_evolucao, use_container_width=True)
 
         # --- SEÇÃO: EVOLUÇÃO DE INVESTIMENTOS ---
-        st.divider()
-        st.subheader(f"💰 Evolução de Investimentos ({texto_periodo})")
-
-        total_invest_acumulado = df[df["Categoria"].str.contains("Investimento", case=False, na=False)]["Valor"].sum()
-        cor_valor = "#2ecc71" if total_invest_acumulado >= 0 else "#e74c3c"
-        st.write(
-            f'<p style="font-size:16px; font-weight:bold;">Total Investido: <span style="color:{cor_valor};">R$ {total_invest_acumulado:,.2f}</span></p>',
-            unsafe_allow_html=True)
-
-        df_invest = df_para_investimentos[
-            df_para_investimentos["Categoria"].str.contains("Investimento", case=False, na=False)]
-
-        if not df_invest.empty:
-            df_invest_plot = df_invest.groupby(['Data', 'Categoria'])['Valor'].sum().reset_index()
-            fig_invest = px.line(df_invest_plot, x='Data', y='Valor', color='Categoria', markers=True,
-                                 template="plotly_dark", color_discrete_sequence=px.colors.sequential.Greens_r,
-                                 labels={"Valor": "Valor (R$)", "Data": "Data"})
-
-            fig_invest.update_xaxes(tickformat="%d/%m/%Y", dtick=intervalo_ms, tick0=data_referencia, tickmode="linear")
-            fig_invest.update_traces(
-                hovertemplate="<b>Data:</b> %{x|%d/%m/%Y}<br><b>Movimentação:</b> R$ %{y:,.2f}<extra></extra>")
-            st.plotly_chart(fig_invest, use_container_width=True)
-
-            total_inv_periodo = df_invest["Valor"].sum()
-            st.info(f"💸 Saldo de movimentações em investimentos em {texto_periodo}: **R$ {total_inv_periodo:,.2f}**")
-        else:
-            st.info(f"Nenhum registro de 'Investimento' encontrado.")
+        if aba_invest.open:
+            with aba_invest:
+                st.subheader(f"💰 Evolução de Investimentos ({texto_periodo})")
+
+                with medicao.secao("grafico.investimentos", linhas=len(df_invest)):
+                    total_invest_acumulado = cubo_mensal.total_investido()
+                    cor_valor = "#2ecc71" if total_invest_acumulado >= 0 else "#e74c3c"
+                    st.write(
+                        f'<p style="font-size:16px; font-weight:bold;">Total Investido: <span style="color:{cor_valor};">R$ {total_invest_acumulado:,.2f}</span></p>',
+                        unsafe_allow_html=True)
+
+                    if not df_invest.empty:
+                        df_invest_plot = graficos.reduzir_por_tempo(df_invest, ['Categoria'], linha='Categoria')
+                        fig_invest = graficos.figura_investimentos(df_invest_plot, intervalo_ms, data_referencia)
+                        st.plotly_chart(fig_invest, use_container_width=True)
+
+                        total_inv_periodo = moeda.para_reais(df_invest["Centavos"].sum())
+                        st.info(f"💸 Saldo de movimentações em investimentos em {texto_periodo}: **R$ {total_inv_periodo:,.2f}**")
+                    else:
+                        st.info(f"Nenhum registro de 'Investimento' encontrado.")
 
         # --- NOVA SEÇÃO: ÁREA DO CARTÃO DE CRÉDITO ---
-        st.divider()
-        st.subheader("💳 Área do Cartão de Crédito")
-
-
-        # LOGICA DE FECHAMENTO (DIA 03)
-        # Se o dia for <= 2, pertence à fatura do mês anterior.
-        # Se o dia for > 2, pertence à fatura do mês atual.
-        def calcular_fatura(row):
-            dt = row['Data']
-            if dt.day <= 2:
-                fatura_dt = dt - pd.DateOffset(months=1)
-            else:
-                fatura_dt = dt
-            return fatura_dt.strftime('%m/%Y')
-
-
-        df_cartao_base = df[df['Forma de Pagamento'].str.contains("Cartão de Crédito", case=False, na=False)].copy()
-
-        if not df_cartao_base.empty:
-            df_cartao_base['Mes_Fatura'] = df_cartao_base.apply(calcular_fatura, axis=1)
-
-            # Gráfico de Visão de Faturas
-            df_faturas = df_cartao_base.groupby('Mes_Fatura')['Valor'].sum().abs().reset_index()
-            df_faturas['Data_Ref'] = pd.to_datetime(df_faturas['Mes_Fatura'], format='%m/%Y')
-            df_faturas = df_faturas.sort_values('Data_Ref')
-
-            # --- AJUSTE SOLICITADO: VALOR TOTAL DA FATURA ATUAL ABAIXO DO TÍTULO ---
-            valor_fatura_atual = df_faturas.loc[df_faturas['Mes_Fatura'] == mes_visual, 'Valor'].sum()
-            st.metric(f"Total da Fatura ({mes_visual})", f"R$ {valor_fatura_atual:,.2f}")
-            # ----------------------------------------------------------------------
-
-            fig_cartao = px.bar(
-                df_faturas,
-                x='Mes_Fatura',
-                y='Valor',
-                title="Visão por Fatura",
-                color_discrete_sequence=["#9b59b6"],
-                template="plotly_dark",
-                labels={"Valor": "Valor da Fatura (R$)", "Mes_Fatura": "Mês da Fatura"}
-            )
-
-            # --- AJUSTE SOLICITADO ANTERIORMENTE ---
-            fig_cartao.update_traces(
-                hovertemplate="<b>Fatura:</b> %{x}<br><b>Valor Total:</b> R$ %{y:,.2f}<extra></extra>"
-            )
-            # ------------------------------
-
-            st.plotly_chart(fig_cartao, use_container_width=True)
-
-            # Tabela de lançamentos que pertencem à fatura do mês visualizado
-            df_fatura_atual = df_cartao_base[df_cartao_base['Mes_Fatura'] == mes_visual].copy()
-
-            if not df_fatura_atual.empty:
-                st.markdown(f"**Lançamentos da Fatura de {mes_visual}:**")
-
-                df_fatura_lista = df_fatura_atual[
-                    ['Data', 'Categoria', 'Valor', 'Parcelas', 'Descrição (Opcional)']].copy()
-                df_fatura_lista['Data'] = df_fatura_lista['Data'].dt.strftime('%d/%m/%Y')
-
-
-                def color_valor_custom(val):
-                    color = '#2ecc71' if val > 0 else '#e74c3c'
-                    return f'color: {color}; font-weight: bold'
-
-
-                fatura_styled = (
-                    df_fatura_lista.style
-                    .map(color_valor_custom, subset=['Valor'])
-                    .format({"Valor": "R$ {:,.2f}"})
-                )
-                st.dataframe(fatura_styled, use_container_width=True, hide_index=True)
+        if aba_cartao.open:
+            with aba_cartao:
+                st.subheader("💳 Área do Cartão de Crédito")
+
+                with medicao.secao("cartao"):
+                    # LOGICA DE FECHAMENTO (DIA 03)
+                    # Se o dia for <= 2, pertence à fatura do mês anterior.
+                    # Se o dia for > 2, pertence à fatura do mês atual.
+                    # Compras parceladas entram uma parcela por fatura; fechamento e vencimento
+                    # de cada cartão ficam em faturas.CARTOES. Tudo já fica pronto no cubo.
+                    if cubo_mensal.tem_cartao():
+                        # Gráfico de Visão de Faturas
+                        df_faturas = cubo_mensal.faturas()
+
+                        # --- AJUSTE SOLICITADO: VALOR TOTAL DA FATURA ATUAL ABAIXO DO TÍTULO ---
+                        fatura_mes = df_faturas[df_faturas['Mes_Fatura'] == mes_visual]
+                        valor_fatura_atual = moeda.para_reais(fatura_mes['Centavos'].abs().sum())
+                        vencimentos = ", ".join(fatura_mes['Vencimento'].dt.strftime('%d/%m/%Y').unique())
+                        st.metric(f"Total da Fatura ({mes_visual})", f"R$ {valor_fatura_atual:,.2f}",
+                                  help=f"Vencimento: {vencimentos}" if vencimentos else None)
+                        # ----------------------------------------------------------------------
+
+                        futuras = df_faturas[df_faturas['Situação'] == 'Futura']
+                        if not futuras.empty:
+                            comprometido = moeda.para_reais(futuras['Centavos'].abs().sum())
+                            st.caption(f"Parcelas já comprometidas em {futuras['Mes_Fatura'].nunique()} fatura(s) futura(s): "
+                                       f"R$ {comprometido:,.2f}")
+
+                        fig_cartao = graficos.figura_faturas(df_faturas)
+                        st.plotly_chart(fig_cartao, use_container_width=True)
+
+                        # Tabela de lançamentos que pertencem à fatura do mês visualizado (fragmento)
+                        secao_fatura(cubo_mensal, mes_visual)
 
         # --- SEÇÃO: ANÁLISES MENSAIS ---
-        st.divider()
-        st.header("🎯 Análises Mensais")
-
-        c1, c2 = st.columns(2)
-        with c1:
-            st.subheader("Distribuição de Gastos")
-            df_pizza = df_mes_saidas.copy()
-            df_pizza['Valor'] = df_pizza['Valor'].abs()
-            if not df_pizza.empty:
-                fig_pizza = px.pie(
-                    df_pizza,
-                    values="Valor",
-                    names="Categoria",
-                    hole=0.4,
-                    color_discrete_sequence=px.colors.qualitative.Plotly
-                )
-                fig_pizza.update_traces(
-                    hovertemplate="<b>Categoria:</b> %{label}<br><b>Valor:</b> R$ %{value:,.2f}<br><b>Percentual:</b> %{percent}<extra></extra>")
-                st.plotly_chart(fig_pizza, use_container_width=True)
-        with c2:
-            st.subheader("Balanço Mensal")
-            df_balanco = pd.DataFrame({
-                'Status': ['Receitas', 'Despesas'],
-                'Total': [Receitas_total, saidas_total_abs]
-            })
-            fig_bar = px.bar(df_balanco, x='Status', y='Total', color='Status',
-                             color_discrete_map={"Receitas": "#2ecc71", "Despesas": "#e74c3c"},
-                             labels={"Total": "Valor (R$)"})
-            fig_bar.update_traces(hovertemplate="<b>Status:</b> %{x}<br><b>Total:</b> R$ %{y:,.2f}<extra></extra>")
-            st.plotly_chart(fig_bar, use_container_width=True)
-
-        # --- NOVO GRÁFICO: RECORRÊNCIA DOS GASTOS ---
-        st.subheader("🔄 Recorrência dos Gastos")
-        if not df_mes_saidas.empty:
-            df_rec = df_mes_saidas.copy()
-            df_rec['Valor_Abs'] = df_rec['Valor'].abs()
-
-            df_rec_plot = df_rec[df_rec['Recorrência'] != 'Receitas'].groupby("Recorrência")[
-                "Valor_Abs"].sum().reset_index()
-
-            fig_recorrencia = px.bar(
-                df_rec_plot,
-                x="Recorrência",
-                y="Valor_Abs",
-                color="Recorrência",
-                template="plotly_dark",
-                color_discrete_map={
-                    "Fixos": "#5DADE2",
-                    "Recorrentes": "#F4D03F",
-                    "Não Recorrentes": "#e74c3c"
-                },
-                category_orders={"Recorrência": ["Fixos", "Recorrentes", "Não Recorrentes"]},
-                labels={"Valor_Abs": "Total (R$)"}
-            )
-
-            fig_recorrencia.update_traces(
-                hovertemplate="<b>Recorrência:</b> %{x}<br><b>Total:</b> R$ %{y:,.2f}<extra></extra>"
-            )
-            st.plotly_chart(fig_recorrencia, use_container_width=True)
-
-        # --- RESUMO POR CATEGORIA ---
-        st.markdown("### 📋 Resumo de Gastos por Categoria")
-        if not df_mes_saidas.empty:
-            resumo_cat = (
-                df_mes_saidas.groupby("Categoria")["Valor"]
-                .sum()
-                .abs()
-                .reset_index()
-                .sort_values(by="Valor", ascending=False)
-            )
-
-            total_gastos = resumo_cat["Valor"].sum()
-            linha_total = pd.DataFrame({"Categoria": ["TOTAL"], "Valor": [total_gastos]})
-            resumo_final = pd.concat([resumo_cat, linha_total], ignore_index=True)
-
-
-            def highlight_total(row):
-                return ['background-color: #990000; color: white; font-weight: bold' if row.Categoria == 'TOTAL' else ''
-                        for _ in row]
-
-
-            resumo_styled = (
-                resumo_final.style
-                .apply(highlight_total, axis=1)
-                .format({"Valor": "R$ {:,.2f}"})
-            )
-
-            st.dataframe(resumo_styled, use_container_width=True, hide_index=True)
-        else:
-            st.info("Sem gastos registrados para este mês.")
+        if aba_analises.open:
+            with aba_analises:
+                st.header("🎯 Análises Mensais")
+
+                with medicao.secao("analises_mensais"):
+                    tem_gastos = cubo_mensal.tem_despesas(mes_selecionado, cat_escolhidas)
+                    c1, c2 = st.columns(2)
+                    with c1:
+                        st.subheader("Distribuição de Gastos")
+                        df_pizza = cubo_mensal.gastos_por_categoria(mes_selecionado, cat_escolhidas)
+                        if tem_gastos:
+                            fig_pizza = graficos.figura_pizza(df_pizza)
+                            st.plotly_chart(fig_pizza, use_container_width=True)
+                    with c2:
+                        st.subheader("Balanço Mensal")
+                        fig_bar = graficos.figura_balanco(Receitas_total, saidas_total_abs)
+                        st.plotly_chart(fig_bar, use_container_width=True)
+
+                # --- NOVO GRÁFICO: RECORRÊNCIA DOS GASTOS ---
+                st.subheader("🔄 Recorrência dos Gastos")
+                with medicao.secao("grafico.recorrencia"):
+                    if tem_gastos:
+                        df_rec_plot = cubo_mensal.gastos_por_recorrencia(mes_selecionado, cat_escolhidas)
+
+                        # Barras: rótulos da planilha; losangos: o que o detector sugere para o mesmo mês
+                        deteccao = deteccao_de(df)
+                        df_sugestao = deteccao.gastos_por_sugestao(mes_selecionado, cat_escolhidas)
+                        fig_recorrencia = graficos.figura_recorrencia(df_rec_plot, df_sugestao)
+                        st.plotly_chart(fig_recorrencia, use_container_width=True)
+
+                        series = deteccao.series
+                        with st.expander(f"Cobranças recorrentes detectadas no histórico ({len(series)})"):
+                            if series.empty:
+                                st.info("Nenhuma cobrança com valor e intervalo regulares foi encontrada.")
+                            else:
+                                st.dataframe(
+                                    series.style.format({"Valor Típico": "R$ {:,.2f}", "Último": "{:%d/%m/%Y}",
+                                                         "Próximo Previsto": "{:%d/%m/%Y}"}),
+                                    use_container_width=True, hide_index=True)
+
+                # --- RESUMO POR CATEGORIA ---
+                st.markdown("### 📋 Resumo de Gastos por Categoria")
+                with medicao.secao("resumo_categoria"):
+                    if tem_gastos:
+                        resumo_cat = df_pizza
+
+                        # Cada categoria já é uma soma exata em centavos; o round só tira o resíduo do float
+                        total_gastos = round(resumo_cat["Valor"].sum(), 2)
+                        linha_total = pd.DataFrame({"Categoria": ["TOTAL"], "Valor": [total_gastos]})
+                        resumo_final = pd.concat([resumo_cat, linha_total], ignore_index=True)
+
+                        resumo_styled = tabelas.estilo_resumo(resumo_final)
+
+                        st.dataframe(resumo_styled, use_container_width=True, hide_index=True)
+                    else:
+                        st.info("Sem gastos registrados para este mês.")
 
         # --- LISTA DE LANÇAMENTOS COM FILTRO DE ORDENAÇÃO ---
-        with st.expander(f"🔍 Lista de lançamentos - {mes_visual}"):
-
-            col_rec, col_desp = st.columns(2)
-            col_rec.markdown(f"**Total Receitas:** <span style='color:#2ecc71'>R$ {Receitas_total:,.2f}</span>",
-                             unsafe_allow_html=True)
-            col_desp.markdown(
-                f"**Total Despesas:** <span style='color:#e74c3c'>R$ {saidas_total_abs:,.2f}</span>",
-                unsafe_allow_html=True)
-
-            st.divider()
-
-            ordem = st.radio(
-                "Ordenar por data:",
-                ["Mais recentes", "Mais antigas"],
-                horizontal=True
-            )
-
-            df_lista = df_mes.iloc[:, :-3].copy()
-            ascendente = True if ordem == "Mais antigas" else False
-            df_lista = df_lista.sort_values("Data", ascending=ascendente)
-            df_lista['Data'] = df_lista['Data'].dt.strftime('%d/%m/%Y')
-
-
-            def color_valor_custom(val):
-                color = '#2ecc71' if val > 0 else '#e74c3c'
-                return f'color: {color}; font-weight: bold'
-
-
-            lista_styled = (
-                df_lista.style
-                .map(color_valor_custom, subset=['Valor'])
-                .format({"Valor": "R$ {:,.2f}"})
-            )
-
-            st.dataframe(lista_styled, use_container_width=True, hide_index=True)
+        # Fechado, o expander não monta a lista; aberto, a ordenação e a paginação
+        # rodam só dentro do fragmento (ver secao_lista).
+        lista = st.expander(f"🔍 Lista de lançamentos - {mes_visual}", key="lista_aberta", on_change="rerun")
+        if lista.open:
+            with lista:
+                secao_lista(df_mes, recorte["ordem_mes"], Receitas_total, saidas_total_abs, deteccao_de(df))
 
 except Exception as e:
-    st.error(f"Erro crítico no processamento: {e}")
\ No newline at end of file
+    st.error(f"Erro crítico no processamento: {e}")
+
+# --- PAINEL DE DEPURAÇÃO (só aparece com a instrumentação ligada) ---
+resumo_medicao = medicao.finalizar()
+if resumo_medicao:
+    with st.sidebar.expander("🛠️ Depuração"):
+        st.caption(f"Rerun em {resumo_medicao['total_ms']:,.1f} ms")
+        st.dataframe(pd.DataFrame(resumo_medicao["secoes"]), hide_index=True)
+        st.dataframe(pd.Series(resumo_medicao["linhas"], name="linhas"))
+        contagem = resumo_medicao["contadores"]
+        idade_dados = atualizador_compartilhado().idade()
+        contagem["dados.idade_s"] = round(idade_dados) if idade_dados is not None else None
+        contagem["filtros.acertos"] = cache_filtros().acertos
+        contagem["filtros.falhas"] = cache_filtros().falhas
+        st.dataframe(pd.Series(contagem, name="quantidade"))
\ No newline at end of file
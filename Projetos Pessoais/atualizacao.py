@@ -0,0 +1,131 @@
+import logging
+import random
+import threading
+import time
+
+import medicao
+
+# --- ATUALIZAÇÃO EM SEGUNDO PLANO (STALE-WHILE-REVALIDATE) ---
+# Uma única thread por processo relê a fonte de dados a cada INTERVALO segundos,
+# antes de os dados "vencerem", e troca o DataFrame servido de uma vez só quando
+# a leitura termina. Enquanto isso as sessões continuam recebendo a cópia
+# anterior: nenhum rerun espera pela rede. Se a fonte falhar (API fora do ar,
+# cota excedida), a próxima tentativa espera cada vez mais (backoff exponencial
+# com um pouco de aleatoriedade), até MAX_ESPERA_ERRO, e a cópia antiga segue valendo.
+# Sem nenhuma sessão pedindo os dados por OCIOSO segundos, a thread para de
+# consultar a fonte (e a cota da API); o próximo rerun recebe a cópia que existe
+# e acorda a thread para uma leitura imediata.
+INTERVALO = 45
+ESPERA_ERRO_INICIAL = 5
+MAX_ESPERA_ERRO = 300
+OCIOSO = 600
+
+log = logging.getLogger("dashboard")
+
+
+class AtualizadorLedger:
+    """Serve a última cópia do ledger e a renova em segundo plano.
+
+    ler(atual) devolve o DataFrame novo, ou o próprio `atual` se a fonte não
+    mudou. df.attrs["lido_em"], quando existe, diz quando os dados foram lidos da
+    fonte (um snapshot carregado do disco traz a data em que foi gravado).
+    """
+
+    def __init__(self, ler, intervalo=INTERVALO, ocioso=OCIOSO):
+        self.ler = ler
+        self.intervalo = intervalo
+        self.ocioso = ocioso
+        self.ultimo_acesso = time.monotonic()
+        self.parado_por_ociosidade = False
+        self.df = None
+        self.atualizado_em = None
+        self.erro = None
+        self.falhas_seguidas = 0
+        self.trava = threading.Lock()
+        self.parar_evento = threading.Event()
+        self.agora_evento = threading.Event()
+        self.thread = None
+
+    # --- LEITURA ---
+    def obter(self):
+        """DataFrame mais recente. Só espera pela fonte se ainda não houver nenhum."""
+        self.ultimo_acesso = time.monotonic()
+        if self.parado_por_ociosidade:
+            self.parado_por_ociosidade = False
+            self.agora_evento.set()
+        df = self.df
+        if df is not None:
+            return df
+        with self.trava:
+            # Outra sessão pode ter terminado a primeira carga enquanto esperávamos
+            if self.df is None:
+                self._trocar(self.ler(None))
+            return self.df
+
+    def _trocar(self, df):
+        # Uma atribuição só: quem leu self.df antes continua com o DataFrame antigo, inteiro
+        self.df = df
+        self.atualizado_em = df.attrs.get("lido_em") or time.time()
+        self.erro = None
+        self.falhas_seguidas = 0
+
+    def idade(self):
+        """Idade, em segundos, da cópia servida: desde a última leitura bem-sucedida da fonte (None antes da primeira)."""
+        return None if self.atualizado_em is None else time.time() - self.atualizado_em
+
+    # --- THREAD ---
+    def iniciar(self, df_inicial=None, atualizar_agora=False):
+        """Começa a servir df_inicial (ex.: o snapshot local) e liga a thread de atualização."""
+        if df_inicial is not None:
+            self._trocar(df_inicial)
+        if atualizar_agora:
+            self.agora_evento.set()
+        self.thread = threading.Thread(target=self._laco, name="atualizador-ledger", daemon=True)
+        self.thread.start()
+        return self
+
+    def atualizar_agora(self):
+        self.agora_evento.set()
+
+    def parar(self):
+        self.parar_evento.set()
+        self.agora_evento.set()
+
+    def _espera(self):
+        if self.falhas_seguidas == 0:
+            return self.intervalo
+        espera = min(ESPERA_ERRO_INICIAL * 2 ** (self.falhas_seguidas - 1), MAX_ESPERA_ERRO)
+        return espera * random.uniform(0.8, 1.2)
+
+    def _laco(self):
+        while not self.parar_evento.is_set():
+            if time.monotonic() - self.ultimo_acesso > self.ocioso:
+                # Ninguém está olhando: esperamos um obter() (ou parar()) sem consultar a fonte.
+                # A marca vem antes da segunda conferência: um obter() no meio do caminho
+                # ou vê a marca e nos acorda, ou já atualizou ultimo_acesso e não dormimos.
+                self.parado_por_ociosidade = True
+                if time.monotonic() - self.ultimo_acesso > self.ocioso:
+                    medicao.contar("atualizacao.ociosa")
+                    self.agora_evento.wait()
+                self.parado_por_ociosidade = False
+            else:
+                self.agora_evento.wait(self._espera())
+            self.agora_evento.clear()
+            if self.parar_evento.is_set():
+                break
+            try:
+                df = self.ler(self.df)
+            except Exception as erro:
+                self.falhas_seguidas += 1
+                self.erro = f"{type(erro).__name__}: {erro}"
+                medicao.contar("atualizacao.erros")
+                log.warning("atualização do ledger falhou (%s seguidas): %s", self.falhas_seguidas, self.erro)
+                continue
+            with self.trava:
+                if self.df is not None and df.attrs.get("versao") == self.df.attrs.get("versao"):
+                    # Nada mudou: mantemos o mesmo objeto (e os caches que dependem dele),
+                    # só com a hora e a versão crua da leitura nova
+                    self.df.attrs.update(df.attrs)
+                    df = self.df
+                self._trocar(df)
+            medicao.contar("atualizacao.sucessos")
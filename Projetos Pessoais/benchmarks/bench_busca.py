@@ -0,0 +1,63 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+
+import busca
+import gerador
+import normalizacao
+
+# --- BENCHMARK DA BUSCA POR TEXTO ---
+# Compara a busca com str.contains (normalizar descrição + categoria de todas as
+# linhas e procurar cada palavra no início de uma palavra do texto) com o índice
+# invertido do busca.py, conferindo se as duas devolvem as mesmas linhas.
+REPETICOES = 20
+CONSULTAS = ["farmacia", "Merc", "SAÚDE far", "uber transp", "inv tes", "a"]
+
+
+def buscar_varrendo(df, texto):
+    # Acentos tirados como no busca.py: forma NFD sem as marcas 'Mn' (regex do Arrow)
+    textos = (df['Descrição (Opcional)'].astype(str) + " " + df['Categoria'].astype(str)).str.lower()
+    textos = textos.str.normalize('NFD').str.replace(r'\p{Mn}', '', regex=True)
+    mascara = np.ones(len(df), dtype=bool)
+    for palavra in busca.palavras(texto):
+        mascara &= textos.str.contains(r'(?:^|\W)' + palavra, regex=True).to_numpy()
+    return np.flatnonzero(mascara)
+
+
+def medir(funcao, repeticoes=REPETICOES):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        retorno = funcao()
+    return (time.perf_counter() - inicio) / repeticoes, retorno
+
+
+if __name__ == "__main__":
+    tamanhos = [int(t) for t in sys.argv[1:]] or [100_000, 1_000_000]
+    for tamanho in tamanhos:
+        df = normalizacao.normalizar(gerador.gerar_lancamentos(tamanho))
+        df.attrs["versao"] = normalizacao.versao(df)
+
+        indice = busca.IndiceBusca()
+        montagem, _ = medir(lambda: indice.atualizar(df), 1)
+
+        # Um mês novo de lançamentos: só as linhas novas são indexadas
+        novos = normalizacao.normalizar(gerador.gerar_lancamentos(tamanho // 60 or 1, inicio="2030-01-01", anos=1,
+                                                                  semente=7))
+        maior = pd.concat([df, novos], ignore_index=True)
+        maior.attrs["versao"] = normalizacao.versao(maior)
+        atualizacao, modo = medir(lambda: indice.atualizar(maior), 1)
+        assert modo == "incremental"
+
+        print(f"\n{tamanho:,} lançamentos: índice montado em {montagem * 1000:.0f} ms, "
+              f"+{len(novos):,} linhas indexadas em {atualizacao * 1000:.0f} ms")
+        print(f"{'consulta':<14} | {'resultados':>10} | {'str.contains (ms)':>17} | {'índice (ms)':>11}")
+        for consulta in CONSULTAS:
+            t_varredura, esperado = medir(lambda: buscar_varrendo(maior, consulta), 2)
+            t_indice, (_, posicoes) = medir(lambda: indice.buscar(consulta))
+            assert np.array_equal(np.sort(posicoes), esperado), consulta
+            print(f"{consulta:<14} | {len(posicoes):>10,} | {t_varredura * 1000:>17.1f} | {t_indice * 1000:>11.2f}")
@@ -0,0 +1,187 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+
+import cubo
+import filtros
+import fontes
+import gerador
+import graficos
+import normalizacao
+import tabelas
+
+# --- BENCHMARK DO DASHBOARD FINANCEIRO (app.py) ---
+# Roda as mesmas etapas do app.py, fora do Streamlit, sobre ledgers sintéticos
+# (gerador.py) e mede tempo e pico de memória (tracemalloc) de cada seção. O
+# tracemalloc deixa tudo mais lento; --sem-memoria mede só os tempos.
+# Com --apptest o app.py inteiro também é executado pelo AppTest do Streamlit.
+# Cada medição vira uma linha JSON em --saida, junto com o commit atual, para
+# comparar os resultados entre versões.
+PASTA_APP = Path(__file__).resolve().parent.parent
+SAIDA_PADRAO = Path(__file__).resolve().parent / "resultados.jsonl"
+TAMANHOS = [1_000, 100_000, 1_000_000]
+
+
+def commit_atual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PASTA_APP,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def medir(resultados, secao, funcao):
+    """Executa funcao() e guarda o tempo e o pico de memória alocada durante a chamada."""
+    medindo_memoria = tracemalloc.is_tracing()
+    if medindo_memoria:
+        tracemalloc.reset_peak()
+        antes = tracemalloc.get_traced_memory()[0]
+    inicio = time.perf_counter()
+    retorno = funcao()
+    segundos = time.perf_counter() - inicio
+    pico = round((tracemalloc.get_traced_memory()[1] - antes) / 1024 ** 2, 3) if medindo_memoria else None
+    resultados.append({"secao": secao, "segundos": round(segundos, 6), "pico_mb": pico})
+    return retorno
+
+
+def agregar(cubo_mensal, recorte, mes, categorias):
+    # Tudo o que o app.py consulta no cubo e reduz para os gráficos
+    return {
+        "totais": cubo_mensal.totais_mes(mes, categorias),
+        "saldo": cubo_mensal.saldo_acumulado(mes),
+        "evolucao": graficos.reduzir_por_tempo(recorte["df_para_evolucao"], [recorte["status_evolucao"], 'Categoria'],
+                                               linha='Status'),
+        "investimentos": graficos.reduzir_por_tempo(recorte["df_invest"], ['Categoria'], linha='Categoria'),
+        "faturas": cubo_mensal.faturas(),
+        "pizza": cubo_mensal.gastos_por_categoria(mes, categorias),
+        "recorrencia": cubo_mensal.gastos_por_recorrencia(mes, categorias),
+    }
+
+
+def montar_figuras(agregados, data_referencia):
+    # __wrapped__ ignora o st.cache_data: queremos medir a montagem, não o cache
+    intervalo_ms = 5 * 24 * 60 * 60 * 1000
+    receitas, despesas = agregados["totais"]
+    figuras = [
+        graficos.figura_evolucao.__wrapped__(agregados["evolucao"], intervalo_ms, data_referencia),
+        graficos.figura_balanco.__wrapped__(receitas, despesas),
+    ]
+    if not agregados["investimentos"].empty:
+        figuras.append(graficos.figura_investimentos.__wrapped__(agregados["investimentos"], intervalo_ms,
+                                                                 data_referencia))
+    if not agregados["faturas"].empty:
+        figuras.append(graficos.figura_faturas.__wrapped__(agregados["faturas"]))
+    if not agregados["pizza"].empty:
+        figuras.append(graficos.figura_pizza.__wrapped__(agregados["pizza"]))
+        figuras.append(graficos.figura_recorrencia.__wrapped__(agregados["recorrencia"]))
+    # O Streamlit serializa cada figura para JSON antes de enviar ao navegador
+    return [figura.to_json() for figura in figuras]
+
+
+def estilizar_tabelas(recorte, cubo_mensal, mes_visual, pizza):
+    # Como no app.py: só a primeira página de cada lista é formatada e estilizada
+    df_mes = recorte["df_mes"]
+    colunas_lista = [c for c in df_mes.columns if c not in normalizacao.COLUNAS_DERIVADAS]
+    lista = tabelas.pagina(df_mes, recorte["ordem_mes"][::-1], 1)
+    tabelas_html = [tabelas.preparar_lancamentos(lista, colunas_lista).to_html()]
+
+    fatura = cubo_mensal.lancamentos_fatura(mes_visual)
+    if not fatura.empty:
+        fatura = tabelas.pagina(fatura, np.arange(len(fatura)), 1)
+        colunas_fatura = ['Data', 'Categoria', 'Valor', 'Parcelas', 'Descrição (Opcional)']
+        tabelas_html.append(tabelas.preparar_lancamentos(fatura, colunas_fatura).to_html())
+
+    if not pizza.empty:
+        total = pd.DataFrame({"Categoria": ["TOTAL"], "Valor": [pizza["Valor"].sum()]})
+        tabelas_html.append(tabelas.estilo_resumo(pd.concat([pizza, total], ignore_index=True)).to_html())
+    return tabelas_html
+
+
+def medir_etapas(arquivo):
+    resultados = []
+    bruto = medir(resultados, "carga", lambda: fontes.FonteCSV(arquivo).ler())
+    df = medir(resultados, "limpeza", lambda: normalizacao.normalizar(bruto))
+    del bruto
+
+    # Mesmos filtros da abertura do dashboard: ano e mês mais recentes, todas as categorias
+    # (o df sai da normalização ordenado por data)
+    ultimo = df.iloc[-1]
+    ano, mes, mes_visual = ultimo['Ano'], ultimo['Mes_Ano'], ultimo['Mes_Ano_Exibicao']
+    categorias = sorted(c for c in df["Categoria"].unique().tolist() if c)
+    recorte = medir(resultados, "filtro", lambda: filtros.recortar(df, ano, mes, categorias, False))
+
+    cubo_mensal = cubo.CuboMensal()
+    agregados = medir(resultados, "agregacao",
+                      lambda: (cubo_mensal.atualizar(df), agregar(cubo_mensal, recorte, mes, categorias))[1])
+    data_referencia = df['Data'].min().replace(day=1)
+    medir(resultados, "figuras", lambda: montar_figuras(agregados, data_referencia))
+    medir(resultados, "tabelas",
+          lambda: estilizar_tabelas(recorte, cubo_mensal, mes_visual, agregados["pizza"]))
+    return resultados
+
+
+def medir_apptest(arquivo):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    # Os caches do Streamlit vivem no processo: sem limpar, o app reaproveitaria o ledger anterior
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    resultados = []
+    os.environ["FONTE_LEDGER"] = f"csv:{arquivo}"
+    app = AppTest.from_file(str(PASTA_APP / "app.py"), default_timeout=600)
+    medir(resultados, "script_primeira_execucao", app.run)
+    medir(resultados, "script_rerun", app.run)
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mede cada seção do app.py com ledgers sintéticos.")
+    parser.add_argument("tamanhos", nargs="*", type=int, default=TAMANHOS)
+    parser.add_argument("--saida", default=str(SAIDA_PADRAO), help="arquivo JSON Lines (as linhas são acrescentadas)")
+    parser.add_argument("--apptest", action="store_true", help="executa também o app.py inteiro com o AppTest")
+    parser.add_argument("--sem-memoria", action="store_true",
+                        help="não usa o tracemalloc, que deixa as seções mais lentas")
+    args = parser.parse_args()
+
+    contexto = {
+        "dashboard": "app.py",
+        "commit": commit_atual(),
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "memoria": not args.sem_memoria,
+    }
+    if not args.sem_memoria:
+        tracemalloc.start()
+    with tempfile.TemporaryDirectory() as pasta, open(args.saida, "a", encoding="utf-8") as saida:
+        for tamanho in args.tamanhos:
+            arquivo = os.path.join(pasta, f"ledger-{tamanho}.csv")
+            gerador.gerar_lancamentos(tamanho).to_csv(arquivo, index=False)
+
+            resultados = medir_etapas(arquivo)
+            if args.apptest:
+                resultados += medir_apptest(arquivo)
+
+            print(f"\n{tamanho:,} lançamentos")
+            print(f"{'seção':<26} | {'tempo (s)':>9} | {'pico (MB)':>9}")
+            for resultado in resultados:
+                pico = "-" if resultado["pico_mb"] is None else f"{resultado['pico_mb']:.1f}"
+                print(f"{resultado['secao']:<26} | {resultado['segundos']:>9.3f} | {pico:>9}")
+                saida.write(json.dumps({**contexto, "linhas": tamanho, **resultado}, ensure_ascii=False) + "\n")
+    print(f"\nResultados acrescentados em {args.saida}")
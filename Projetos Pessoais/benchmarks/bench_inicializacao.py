@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# --- BENCHMARK DE INICIALIZAÇÃO (COLD START) ---
+# Simula reinícios do container: cada execução é um processo Python novo, rodado
+# com -X importtime, que abre o dashboard uma vez pelo AppTest e mede:
+#   - primeira página: tempo do primeiro rerun completo do script;
+#   - métricas: quando as métricas do topo ficaram prontas (só app.py, via medicao.py);
+#   - importações: o relatório do -X importtime das bibliotecas que o script
+#     importou (o streamlit e o próprio AppTest ficam de fora), por pacote.
+# A primeira execução não tem snapshot local e lê a fonte; as seguintes servem o
+# snapshot, como num reinício de verdade. Com --app dá para medir outra versão do
+# app.py (ex.: um git worktree de um commit anterior) ou o dashboard da Imersão:
+#   SALARIOS_CSV=salarios.csv python bench_inicializacao.py --app "../Imersão Python - Alura 2026/A04_Imersão_Python.py"
+PASTA_APP = Path(__file__).resolve().parent.parent
+MARCADOR = "--- início do app ---"
+# Bibliotecas que o app.py só deveria importar quando realmente precisar delas
+PESADAS = ["gspread", "google.oauth2", "plotly.express", "pyarrow.parquet"]
+
+
+def executar_filho(app):
+    """Roda dentro do processo novo: abre o app uma vez e devolve os tempos em JSON no stdout."""
+    from streamlit.testing.v1 import AppTest
+
+    pasta = str(Path(app).resolve().parent)
+    sys.path.insert(0, pasta)
+    marcas = {}
+    if (Path(pasta) / "medicao.py").exists():
+        # Guardamos o instante em que o rerun começa a ser medido e o resumo das seções
+        import medicao
+        iniciar, finalizar = medicao.iniciar, medicao.finalizar
+
+        def iniciar_marcando(ativa):
+            marcas["iniciar"] = time.perf_counter()
+            return iniciar(ativa)
+
+        def finalizar_guardando():
+            marcas["resumo"] = finalizar()
+            return marcas["resumo"]
+
+        medicao.iniciar, medicao.finalizar = iniciar_marcando, finalizar_guardando
+
+    print(MARCADOR, file=sys.stderr, flush=True)
+    inicio = time.perf_counter()
+    sessao = AppTest.from_file(str(app), default_timeout=600)
+    sessao.run()
+    segundos = time.perf_counter() - inicio
+    if sessao.exception:
+        raise RuntimeError(sessao.exception[0].value)
+
+    metricas = None
+    resumo = marcas.get("resumo")
+    if resumo:
+        secao = next((s for s in resumo["secoes"] if s["secao"] == "metricas"), None)
+        if secao:
+            metricas = marcas["iniciar"] - inicio + (secao["inicio_ms"] + secao["duracao_ms"]) / 1000
+    print(json.dumps({"primeira_pagina_s": segundos, "metricas_s": metricas,
+                      "carregadas": [m for m in PESADAS if m in sys.modules]}))
+
+
+def ler_importtime(stderr):
+    """Tempo acumulado (ms) por pacote das importações feitas depois do MARCADOR, e de cada módulo."""
+    por_pacote, por_modulo = defaultdict(float), {}
+    depois = False
+    for linha in stderr.splitlines():
+        if linha.strip() == MARCADOR:
+            depois = True
+            continue
+        if not depois or not linha.startswith("import time:") or "imported package" in linha:
+            continue
+        _, acumulado, nome = linha[len("import time:"):].split("|")
+        modulo = nome.strip()
+        por_modulo[modulo] = int(acumulado) / 1000
+        # Só as linhas sem recuo são importações de primeiro nível (as outras já estão somadas nelas)
+        if not nome[1:].startswith(" "):
+            por_pacote[modulo.split(".")[0]] += int(acumulado) / 1000
+    return por_pacote, por_modulo
+
+
+def medir(app, execucoes, arquivo_snapshot=None):
+    resultados = []
+    for _ in range(execucoes):
+        com_snapshot = arquivo_snapshot.exists() if arquivo_snapshot else None
+        processo = subprocess.run(
+            [sys.executable, "-X", "importtime", __file__, "--filho", "--app", str(app)],
+            capture_output=True, text=True, env={**os.environ, "DEBUG_DASHBOARD": "1"})
+        if processo.returncode:
+            raise RuntimeError(processo.stderr[-2000:])
+        tempos = json.loads(processo.stdout.strip().splitlines()[-1])
+        tempos["importacoes"], tempos["modulos"] = ler_importtime(processo.stderr)
+        tempos["snapshot"] = com_snapshot
+        resultados.append(tempos)
+    return resultados
+
+
+def relatorio(resultados, maiores):
+    print(f"{'execução':>8} | {'snapshot':>8} | {'1ª página (s)':>13} | {'métricas (s)':>12} | importadas")
+    for numero, r in enumerate(resultados, 1):
+        metricas = f"{r['metricas_s']:.2f}" if r["metricas_s"] is not None else "-"
+        com_snapshot = {True: "sim", False: "não", None: "-"}[r["snapshot"]]
+        print(f"{numero:>8} | {com_snapshot:>8} | {r['primeira_pagina_s']:>13.2f} | "
+              f"{metricas:>12} | {', '.join(r['carregadas']) or '-'}")
+
+    # A primeira execução pode ter lido a fonte (sem snapshot); a mediana é dos reinícios seguintes
+    reinicios = resultados[1:] or resultados
+    print(f"\nmediana das execuções 2 em diante: 1ª página "
+          f"{statistics.median(r['primeira_pagina_s'] for r in reinicios):.2f} s", end="")
+    if all(r["metricas_s"] is not None for r in reinicios):
+        print(f", métricas {statistics.median(r['metricas_s'] for r in reinicios):.2f} s", end="")
+    print()
+
+    # Relatório -X importtime da última execução: o que o script importou, por pacote
+    ultima = reinicios[-1]
+    print(f"\nimportações feitas pelo app (-X importtime, acumulado em ms, {maiores} maiores):")
+    for pacote, ms in sorted(ultima["importacoes"].items(), key=lambda item: -item[1])[:maiores]:
+        print(f"  {pacote:<28} {ms:>9.1f}")
+    print(f"  {'total':<28} {sum(ultima['importacoes'].values()):>9.1f}")
+    for modulo in PESADAS:
+        ms = ultima["modulos"].get(modulo)
+        print(f"  {modulo:<28} {'não importado' if ms is None else f'{ms:.1f} ms':>13}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mede o cold start do dashboard com -X importtime.")
+    parser.add_argument("linhas", nargs="?", type=int, default=20_000)
+    parser.add_argument("--execucoes", type=int, default=4)
+    parser.add_argument("--maiores", type=int, default=12)
+    parser.add_argument("--app", default=str(PASTA_APP / "app.py"))
+    parser.add_argument("--filho", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    # O AppTest resolve caminhos relativos a partir de quem o chama, não da pasta atual
+    args.app = str(Path(args.app).resolve())
+
+    if args.filho:
+        executar_filho(args.app)
+        sys.exit()
+
+    import fontes
+    import gerador
+    import snapshot
+
+    with tempfile.TemporaryDirectory() as pasta:
+        # O ledger de teste só é gerado se nenhuma fonte foi configurada; nesse caso
+        # o snapshot dele também é nosso e é apagado no fim
+        temporario = "FONTE_LEDGER" not in os.environ
+        if temporario:
+            arquivo = os.path.join(pasta, "ledger.csv")
+            gerador.gerar_lancamentos(args.linhas).to_csv(arquivo, index=False)
+            os.environ["FONTE_LEDGER"] = f"csv:{arquivo}"
+        # O snapshot fica na pasta .cache ao lado do app medido (que pode ser outra cópia do
+        # projeto). Só o app.py usa o snapshot do ledger; o dashboard da Imersão tem o cache dele.
+        pasta_medida = Path(args.app).resolve().parent
+        nome = fontes.fonte_da_configuracao(os.environ["FONTE_LEDGER"], None).nome
+        arquivos = [pasta_medida / caminho.relative_to(PASTA_APP) for caminho in snapshot.caminhos(nome)]
+        usa_snapshot = (pasta_medida / "snapshot.py").exists()
+        try:
+            resultados = medir(args.app, args.execucoes, arquivos[0] if usa_snapshot else None)
+        finally:
+            if temporario:
+                for caminho in arquivos:
+                    caminho.unlink(missing_ok=True)
+
+    print(f"{args.app} | {os.environ['FONTE_LEDGER']}\n")
+    relatorio(resultados, args.maiores)
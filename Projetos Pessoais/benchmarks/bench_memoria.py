@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import gerador
+import normalizacao
+
+if __name__ == "__main__":
+    tamanhos = [int(t) for t in sys.argv[1:]] or [100_000, 1_000_000]
+
+    print(f"{'linhas':>10} | {'cru (MB)':>9} | {'tipado (MB)':>11} | {'redução':>7}")
+    for tamanho in tamanhos:
+        depois = normalizacao.normalizar(gerador.gerar_lancamentos(tamanho))
+        # "Antes": o formato antigo, com as colunas de texto como object e sem as marcações
+        categoricas = depois.select_dtypes('category').columns
+        antes = depois.drop(columns=['is_invest', 'is_cartao', 'Centavos', 'Centavos_Saldo']).astype({c: object for c in categoricas})
+
+        mb_antes = normalizacao.uso_memoria(antes)
+        mb_depois = normalizacao.uso_memoria(depois)
+        print(f"{tamanho:>10,} | {mb_antes:>9.1f} | {mb_depois:>11.1f} | {mb_antes / mb_depois:>6.1f}x")
@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import gerador
+import normalizacao
+import paralelo
+import regras
+
+# --- BENCHMARK DA AGREGAÇÃO COM PARCIAIS ---
+# Compara o groupby no processo atual (o que o dashboard usa) com um pool de
+# processos persistente, criado uma vez por número de processos e aquecido antes
+# de medir, como um script de lote que agrega várias vezes faria.
+REPETICOES = 3
+
+if __name__ == "__main__":
+    tamanho = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    df = normalizacao.normalizar(gerador.gerar_lancamentos(tamanho))
+    df['Status'] = regras.definir_status(df)
+    df['Mes_Fatura'] = regras.calcular_fatura(df['Data'])
+
+    agrupamentos = {
+        'Data/Status/Categoria': ['Data', 'Status', 'Categoria'],
+        'Mes_Fatura': 'Mes_Fatura',
+        'Categoria': 'Categoria',
+    }
+    pools = {processos: ProcessPoolExecutor(processos) for processos in [2, 4, 8]}
+    for executor in pools.values():
+        paralelo.agregar(df.head(1000), 'Categoria', 'Valor', executor)
+
+    print(f"{tamanho:,} lançamentos | {os.cpu_count()} núcleos disponíveis")
+    print(f"{'agrupamento':<22} | {'processos':>9} | {'tempo (s)':>9} | {'ganho':>6}")
+    for nome, chaves in agrupamentos.items():
+        referencia = df.groupby(chaves, observed=True)['Valor'].sum()
+        base = None
+        for processos, executor in [(1, None)] + list(pools.items()):
+            inicio = time.perf_counter()
+            for _ in range(REPETICOES):
+                resultado = paralelo.agregar(df, chaves, 'Valor', executor, partes=processos)
+            tempo = (time.perf_counter() - inicio) / REPETICOES
+            base = base or tempo
+            assert (resultado['sum'].sort_index() - referencia.sort_index()).abs().max() < 1e-6
+            print(f"{nome:<22} | {processos:>9} | {tempo:>9.3f} | {base / tempo:>5.1f}x")
+    for executor in pools.values():
+        executor.shutdown()
@@ -0,0 +1,80 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+
+import gerador
+import normalizacao
+import recorrencia
+
+# --- BENCHMARK DO DETECTOR DE RECORRÊNCIA ---
+# Mistura ao ledger sintético algumas cobranças com periodicidade conhecida
+# (assinatura mensal de valor fixo, conta mensal de valor variável, academia
+# semanal com atraso de um dia, imposto anual) e um gasto de texto repetido em
+# datas aleatórias, que não deve ser detectado. Mede o detectar() do histórico
+# inteiro e confere o que foi encontrado.
+# (descrição, categoria, primeira data, passo em dias ou "M" para mensal, ocorrências, valor, variação, atraso)
+SERIES = [
+    ('Netflix Assinatura', 'Assinaturas', '2020-01-05', 'M', 60, 39.90, 0.0, 0),
+    ('Conta de Luz', 'Moradia', '2020-01-10', 'M', 60, 180.0, 0.10, 0),
+    ('Academia', 'Saúde', '2020-01-03', 7, 250, 25.0, 0.0, 1),
+    ('IPVA', 'Transporte', '2020-02-15', 365, 5, 1500.0, 0.05, 0),
+]
+ESPERADO = {'Netflix Assinatura': ('Mensal', 'Fixos'), 'Conta de Luz': ('Mensal', 'Recorrentes'),
+            'Academia': ('Semanal', 'Fixos'), 'IPVA': ('Anual', 'Recorrentes')}
+RUIDO = ('Cinema Shopping', 'Lazer', 40, 50.0)
+
+
+def lancamento(data, valor, categoria, descricao, forma='Cartão de Crédito'):
+    return {'Data': data.strftime('%d/%m/%Y'), 'Valor': gerador.formatar_brl(np.array([-round(valor * 100)]))[0],
+            'Categoria': categoria, 'Forma de Pagamento': forma, 'Parcelas': '1',
+            'Recorrência': 'Não Recorrentes', 'Descrição (Opcional)': descricao}
+
+
+def com_series(bruto, semente=1):
+    rng = np.random.default_rng(semente)
+    linhas = []
+    for descricao, categoria, inicio, passo, ocorrencias, valor, variacao, atraso in SERIES:
+        for i in range(ocorrencias):
+            if passo == 'M':
+                data = pd.Timestamp(inicio) + pd.DateOffset(months=i)
+            else:
+                data = pd.Timestamp(inicio) + pd.Timedelta(days=passo * i + int(rng.integers(-atraso, atraso + 1)))
+            linhas.append(lancamento(data, valor * (1 + rng.uniform(-variacao, variacao)), categoria, descricao))
+    descricao, categoria, vezes, valor = RUIDO
+    for dia in rng.integers(0, 5 * 365, vezes):
+        linhas.append(lancamento(pd.Timestamp('2020-01-01') + pd.Timedelta(days=int(dia)), valor, categoria,
+                                 descricao, 'Pix'))
+    return pd.concat([bruto, pd.DataFrame(linhas)], ignore_index=True)
+
+
+if __name__ == "__main__":
+    tamanhos = [int(t) for t in sys.argv[1:]] or [100_000, 1_000_000]
+    for tamanho in tamanhos:
+        df = normalizacao.normalizar(com_series(gerador.gerar_lancamentos(tamanho)))
+        df.attrs["versao"] = normalizacao.versao(df)
+
+        inicio = time.perf_counter()
+        rotulos, series = recorrencia.detectar(df)
+        segundos = time.perf_counter() - inicio
+        detector = recorrencia.DetectorRecorrencia()
+        inicio = time.perf_counter()
+        detector.atualizar(df)
+        atualizacao = time.perf_counter() - inicio
+
+        encontradas = {linha['Descrição']: (linha['Periodicidade'], linha['Sugestão']) for _, linha in series.iterrows()}
+        faltando = {d for d, esperado in ESPERADO.items() if encontradas.get(d) != esperado}
+        extras = set(encontradas) - set(ESPERADO)
+        contagem = pd.Series(rotulos).value_counts()
+
+        print(f"\n{len(df):,} lançamentos: detectar {segundos * 1000:.0f} ms, "
+              f"atualizar (com a tabela do gráfico) {atualizacao * 1000:.0f} ms")
+        print("  " + ", ".join(f"{rotulo}: {contagem.get(rotulo, 0):,}" for rotulo in recorrencia.ROTULOS))
+        print(f"  séries injetadas encontradas: {len(ESPERADO) - len(faltando)}/{len(ESPERADO)}"
+              f"{' (faltando: ' + ', '.join(sorted(faltando)) + ')' if faltando else ''}; "
+              f"outras séries: {len(extras)}{' (' + ', '.join(sorted(extras)) + ')' if extras else ''}")
+        assert RUIDO[0] not in encontradas
@@ -0,0 +1,51 @@
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import gerador
+import normalizacao
+import regras
+
+
+# --- VERSÕES ANTIGAS (linha a linha), copiadas do app.py para comparação ---
+def definir_status_linha(row):
+    if "Investimento" in str(row['Categoria']):
+        return 'Receitas' if row['Valor'] < 0 else 'Despesas'
+    return 'Receitas' if row['Valor'] > 0 else 'Despesas'
+
+
+def calcular_fatura_linha(row):
+    dt = row['Data']
+    if dt.day <= 2:
+        fatura_dt = dt - pd.DateOffset(months=1)
+    else:
+        fatura_dt = dt
+    return fatura_dt.strftime('%m/%Y')
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return time.perf_counter() - inicio, resultado
+
+
+if __name__ == "__main__":
+    tamanhos = [int(t) for t in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+
+    print(f"{'linhas':>10} | {'regra':<15} | {'apply (s)':>10} | {'vetorizado (s)':>14} | {'ganho':>7}")
+    for tamanho in tamanhos:
+        df = normalizacao.normalizar(gerador.gerar_lancamentos(tamanho))
+
+        t_antigo, antigo = cronometrar(lambda: df.apply(definir_status_linha, axis=1))
+        t_novo, novo = cronometrar(lambda: regras.definir_status(df))
+        assert (antigo == novo).all()
+        print(f"{tamanho:>10,} | {'definir_status':<15} | {t_antigo:>10.3f} | {t_novo:>14.4f} | {t_antigo / t_novo:>6.0f}x")
+
+        t_antigo, antigo = cronometrar(lambda: df.apply(calcular_fatura_linha, axis=1))
+        t_novo, novo = cronometrar(lambda: regras.calcular_fatura(df['Data']))
+        assert (antigo == novo).all()
+        print(f"{tamanho:>10,} | {'calcular_fatura':<15} | {t_antigo:>10.3f} | {t_novo:>14.4f} | {t_antigo / t_novo:>6.0f}x")
@@ -0,0 +1,51 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+
+import gerador
+import normalizacao
+import saldo
+
+# --- BENCHMARK DO SALDO ACUMULADO ---
+# Compara o cálculo original do app.py (filtrar todo o histórico e somar Valor em
+# float a cada rerun) com a consulta na soma corrida em centavos (saldo.py).
+REPETICOES = 200
+
+
+def saldo_antigo(df, mes):
+    df_acum = df[df['Mes_Ano'] <= mes]
+    return df_acum['Valor'].where(~df_acum['is_invest'], -df_acum['Valor']).sum()
+
+
+def medir(funcao):
+    inicio = time.perf_counter()
+    for _ in range(REPETICOES):
+        retorno = funcao()
+    return (time.perf_counter() - inicio) / REPETICOES, retorno
+
+
+if __name__ == "__main__":
+    tamanhos = [int(t) for t in sys.argv[1:]] or [100_000, 1_000_000]
+    for tamanho in tamanhos:
+        df = normalizacao.normalizar(gerador.gerar_lancamentos(tamanho))
+        df['Mes_Ano'] = df['Mes_Ano'].astype(str)
+        mes = df['Mes_Ano'].iloc[len(df) // 2]
+
+        inicio = time.perf_counter()
+        corrido = saldo.SaldoCorrido()
+        corrido.adicionar(df['Data'], df['Centavos_Saldo'])
+        montagem = time.perf_counter() - inicio
+
+        t_antigo, antigo = medir(lambda: saldo_antigo(df, mes))
+        t_novo, novo = medir(lambda: corrido.ate_fim_do_mes(mes))
+        exato = df.loc[df['Data'] <= pd.Period(mes, 'M').end_time, 'Centavos_Saldo'].sum()
+        assert novo == exato
+
+        print(f"\n{tamanho:,} lançamentos (saldo até {mes})")
+        print(f"montagem da soma corrida: {montagem * 1000:.1f} ms (uma vez por carga)")
+        print(f"filtro + soma em float:   {t_antigo * 1000:.3f} ms -> R$ {antigo:.6f}")
+        print(f"busca binária:            {t_novo * 1000:.3f} ms -> R$ {novo / 100:.2f}")
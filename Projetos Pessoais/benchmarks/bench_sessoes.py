@@ -0,0 +1,75 @@
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pyarrow as pa
+
+import gerador
+
+# --- BENCHMARK DE MEMÓRIA POR SESSÃO ---
+# Abre várias sessões do app.py no mesmo processo (uma AppTest por sessão, todas
+# mantidas vivas, como várias pessoas com o dashboard aberto) e mede, a cada
+# sessão nova:
+#   - retida: quanto a memória do processo cresceu depois do rerun;
+#   - pico: quanto o rerun alocou no pior momento (o que N reruns simultâneos somam).
+# A memória do Python/NumPy vem do tracemalloc e a dos buffers do Arrow, do pool do
+# pyarrow. Com --app dá para medir outra cópia do app.py (ex.: uma versão anterior
+# em um git worktree) e comparar.
+PASTA_APP = Path(__file__).resolve().parent.parent
+
+
+def memoria_mb():
+    return (tracemalloc.get_traced_memory()[0] + pa.total_allocated_bytes()) / 1024 ** 2
+
+
+def medir_sessoes(app, sessoes):
+    from streamlit.testing.v1 import AppTest
+
+    abertas, resultados = [], []
+    for numero in range(1, sessoes + 1):
+        gc.collect()
+        antes = memoria_mb()
+        tracemalloc.reset_peak()
+        inicio = time.perf_counter()
+        sessao = AppTest.from_file(str(app), default_timeout=600)
+        sessao.run()
+        segundos = time.perf_counter() - inicio
+        if sessao.exception:
+            raise RuntimeError(sessao.exception[0].value)
+        pico = tracemalloc.get_traced_memory()[1] / 1024 ** 2 - (antes - pa.total_allocated_bytes() / 1024 ** 2)
+        abertas.append(sessao)
+        gc.collect()
+        resultados.append({"sessao": numero, "segundos": segundos, "retida_mb": memoria_mb() - antes, "pico_mb": pico})
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mede a memória de cada sessão extra do app.py.")
+    parser.add_argument("linhas", nargs="?", type=int, default=200_000)
+    parser.add_argument("--sessoes", type=int, default=5)
+    parser.add_argument("--app", default=str(PASTA_APP / "app.py"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo = os.path.join(pasta, "ledger.csv")
+        gerador.gerar_lancamentos(args.linhas).to_csv(arquivo, index=False)
+        os.environ["FONTE_LEDGER"] = f"csv:{arquivo}"
+
+        tracemalloc.start()
+        resultados = medir_sessoes(args.app, args.sessoes)
+
+    print(f"{args.linhas:,} lançamentos | {args.app}")
+    print(f"{'sessão':>6} | {'tempo (s)':>9} | {'retida (MB)':>11} | {'pico (MB)':>9}")
+    for r in resultados:
+        print(f"{r['sessao']:>6} | {r['segundos']:>9.2f} | {r['retida_mb']:>11.1f} | {r['pico_mb']:>9.1f}")
+    extras = resultados[1:]
+    if extras:
+        print(f"média por sessão extra: retida {sum(r['retida_mb'] for r in extras) / len(extras):.1f} MB, "
+              f"pico {sum(r['pico_mb'] for r in extras) / len(extras):.1f} MB")
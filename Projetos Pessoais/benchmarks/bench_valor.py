@@ -0,0 +1,52 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+
+import gerador
+import moeda
+
+
+def cadeia_antiga(valores):
+    # Como o normalizacao.normalizar fazia antes do moeda.converter_brl
+    texto = (
+        valores
+        .astype(str)
+        .str.replace('R$', '', regex=False)
+        .str.replace(' ', '', regex=False)
+        .str.replace('.', '', regex=False)
+        .str.replace(',', '.', regex=False)
+        .str.strip()
+    )
+    return pd.to_numeric(texto, errors='coerce').fillna(0)
+
+
+def medir(funcao, valores, repeticoes=3):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao(valores)
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+if __name__ == "__main__":
+    tamanho = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    valores = gerador.gerar_lancamentos(tamanho)['Valor']
+
+    t_antigo, antigo = medir(cadeia_antiga, valores)
+    t_novo, (centavos, invalidos) = medir(moeda.converter_brl, valores)
+
+    # Mesmos valores, mas agora em centavos exatos
+    assert not invalidos.any()
+    assert np.array_equal(np.round(antigo.to_numpy() * 100).astype(np.int64), centavos)
+
+    print(f"{tamanho:,} valores")
+    print(f"cadeia de .str.replace: {t_antigo:.3f}s")
+    print(f"moeda.converter_brl:    {t_novo:.3f}s ({t_antigo / t_novo:.1f}x)")
+    print(f"soma antiga (float):    {antigo.sum():.6f}")
+    print(f"soma exata (centavos):  {centavos.sum() / 100:.2f}")
@@ -0,0 +1,172 @@
+import re
+import threading
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+import normalizacao
+
+# --- BUSCA POR TEXTO NOS LANÇAMENTOS ---
+# Índice invertido em memória sobre a descrição e a categoria, montado uma vez
+# por carga e atualizado só com as linhas novas (mesma regra do cubo.py).
+# Os textos são normalizados como no exercício A09/E026.py (forma NFD, sem as
+# marcas de acento 'Mn') e em minúsculas: "farmacia" encontra "Farmácia".
+# Os textos se repetem muito ("Mercado", "Uber"...), então o índice aponta para
+# cada par (descrição, categoria) distinto, tokenizado uma vez só, e cada par
+# aponta para as suas linhas. Cada palavra buscada casa com as palavras do índice
+# que começam com ela ("merc" -> "mercado"); os candidatos vêm da interseção dos
+# trigramas do prefixo, sem percorrer o vocabulário nem as linhas.
+COLUNAS_BUSCA = ['Descrição (Opcional)', 'Categoria']
+COLUNAS_RESULTADO = ['Data', 'Categoria', 'Valor', 'Forma de Pagamento', 'Descrição (Opcional)']
+# Início de palavra nos trigramas: "  me" gera "  m" e " me", que só aparecem em palavras que começam com "me"
+INICIO = "  "
+
+
+def normalizar_texto(texto):
+    """Minúsculas e sem acentos (NFD sem as marcas 'Mn'), como em A09/E026.py."""
+    nfd_form = unicodedata.normalize('NFD', texto)
+    return "".join(c for c in nfd_form if unicodedata.category(c) != 'Mn').lower()
+
+
+def palavras(texto):
+    return re.findall(r'\w+', normalizar_texto(texto))
+
+
+def trigramas(palavra):
+    marcada = INICIO + palavra
+    return {marcada[i:i + 3] for i in range(len(marcada) - 2)}
+
+
+def codificar(serie):
+    """(código por linha, textos distintos); valores ausentes viram o texto vazio."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos, distintos = serie.cat.codes.to_numpy(), serie.cat.categories.astype(str).tolist()
+    else:
+        codigos, distintos = pd.factorize(serie.astype(str))
+        distintos = list(distintos)
+    codigos = np.where(codigos < 0, len(distintos), codigos)
+    return codigos, distintos + [""]
+
+
+class IndiceBusca:
+    def __init__(self):
+        self.trava = threading.Lock()
+        self._limpar()
+
+    def _limpar(self):
+        self.versao = None
+        self.hashes = np.array([], dtype=np.uint64)
+        self.linhas = None
+        # Par (descrição, categoria) -> número do par, e o par de cada linha indexada
+        self.pares = {}
+        self.par_da_linha = np.array([], dtype=np.int64)
+        # Vocabulário: palavra -> número; para cada palavra, os pares em que ela aparece
+        self.vocabulario = {}
+        self.palavras = []
+        self.pares_da_palavra = []
+        self.por_trigrama = {}
+        # Linhas agrupadas por par: ordem[inicio[p]:inicio[p + 1]] são as linhas do par p
+        self.ordem = np.array([], dtype=np.int64)
+        self.inicio = np.zeros(1, dtype=np.int64)
+
+    # --- ATUALIZAÇÃO ---
+    def atualizar(self, df):
+        """Deixa o índice em dia com df. Devolve "atual", "incremental" ou "completa"."""
+        versao = df.attrs.get("versao") or normalizacao.versao(df)
+        with self.trava:
+            if versao == self.versao:
+                return "atual"
+
+            hashes = normalizacao.hashes_linhas(df)
+            novas = None if self.linhas is None else normalizacao.linhas_novas(hashes, self.hashes)
+            if novas is None:
+                modo = "completa"
+                self._limpar()
+                self._indexar(df)
+            else:
+                modo = "incremental"
+                if novas.any():
+                    self._indexar(df[novas])
+
+            self.hashes = np.sort(hashes)
+            self.versao = versao
+            return modo
+
+    def _indexar(self, df):
+        # Pares distintos do lote: os códigos das duas colunas viram um único inteiro
+        (cod_desc, descricoes), (cod_cat, categorias) = (codificar(df[c]) for c in COLUNAS_BUSCA)
+        locais, distintos = pd.factorize(cod_desc * len(categorias) + cod_cat)
+
+        # Só os pares nunca vistos são tokenizados
+        numeros = np.empty(len(distintos), dtype=np.int64)
+        for posicao, combinado in enumerate(distintos):
+            par = (descricoes[combinado // len(categorias)], categorias[combinado % len(categorias)])
+            numero = self.pares.get(par)
+            if numero is None:
+                numero = self.pares[par] = len(self.pares)
+                for palavra in set(palavras(" ".join(par))):
+                    self._registrar(palavra).add(numero)
+            numeros[posicao] = numero
+
+        linhas = df[[c for c in COLUNAS_RESULTADO if c in df.columns]]
+        if self.linhas is None:
+            self.linhas = linhas.reset_index(drop=True)
+        else:
+            # Categorias diferentes nos dois lados fazem o concat devolver texto: voltamos para category
+            categoricas = [c for c in self.linhas.columns if isinstance(self.linhas[c].dtype, pd.CategoricalDtype)]
+            self.linhas = pd.concat([self.linhas, linhas], ignore_index=True)
+            for coluna in categoricas:
+                self.linhas[coluna] = self.linhas[coluna].astype('category')
+        self.par_da_linha = np.concatenate([self.par_da_linha, numeros[locais]])
+
+        # Listas de linhas por par (agrupamento estável: dentro do par, na ordem de chegada)
+        self.ordem = np.argsort(self.par_da_linha, kind='stable')
+        self.inicio = np.searchsorted(self.par_da_linha[self.ordem], np.arange(len(self.pares) + 1))
+
+    def _registrar(self, palavra):
+        numero = self.vocabulario.get(palavra)
+        if numero is None:
+            numero = self.vocabulario[palavra] = len(self.palavras)
+            self.palavras.append(palavra)
+            self.pares_da_palavra.append(set())
+            for trigrama in trigramas(palavra):
+                self.por_trigrama.setdefault(trigrama, set()).add(numero)
+        return self.pares_da_palavra[numero]
+
+    # --- CONSULTA ---
+    def _pares_com_prefixo(self, prefixo):
+        candidatas = None
+        for trigrama in trigramas(prefixo):
+            palavras_trigrama = self.por_trigrama.get(trigrama, set())
+            candidatas = palavras_trigrama if candidatas is None else candidatas & palavras_trigrama
+            if not candidatas:
+                return set()
+        pares = set()
+        for numero in candidatas:
+            # Os trigramas não garantem a ordem das letras ("abab" x "abaxbab"): conferimos o prefixo
+            if self.palavras[numero].startswith(prefixo):
+                pares |= self.pares_da_palavra[numero]
+        return pares
+
+    def buscar(self, texto):
+        """(linhas, posições) dos lançamentos com todas as palavras do texto, dos mais recentes aos mais antigos.
+
+        As posições valem para o DataFrame `linhas` devolvido junto, lido sob a trava:
+        uma atualização posterior cria outro DataFrame e não mexe neste.
+        """
+        vazio = np.array([], dtype=np.int64)
+        termos = palavras(texto)
+        with self.trava:
+            linhas = self.linhas
+            if not termos or linhas is None:
+                return linhas, vazio
+            pares = None
+            for termo in termos:
+                encontrados = self._pares_com_prefixo(termo)
+                pares = encontrados if pares is None else pares & encontrados
+                if not pares:
+                    return linhas, vazio
+            posicoes = np.concatenate([self.ordem[self.inicio[par]:self.inicio[par + 1]] for par in pares])
+            datas = linhas['Data'].to_numpy()[posicoes]
+        return linhas, posicoes[np.argsort(datas, kind='stable')[::-1]]
@@ -0,0 +1,159 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+import faturas
+import moeda
+import normalizacao
+import paralelo
+import regras
+import saldo
+
+# --- CUBO DE AGREGADOS MENSAIS ---
+# Em vez de varrer o DataFrame inteiro a cada clique, somamos os lançamentos uma
+# única vez por (mês, categoria, forma de pagamento, recorrência, status).
+# As métricas, o resumo por categoria, a recorrência e as faturas passam a ser
+# consultas nessa tabela pequena. Quando chegam linhas novas, só elas são somadas.
+# As somas são feitas em centavos inteiros (exatas) e só viram reais na saída.
+DIMENSOES = ['Mes_Ano', 'Categoria', 'Forma de Pagamento', 'Recorrência', 'Status']
+# Colunas do lançamento original mostradas na tabela de cada fatura
+COLUNAS_FATURA = ['Data', 'Categoria', 'Descrição (Opcional)']
+
+
+class CuboMensal:
+    def __init__(self):
+        self.versao = None
+        self.hashes = np.array([], dtype=np.uint64)
+        self.tabela = None
+        self.saldo = saldo.SaldoCorrido()
+        self.investido = 0
+        self.parcelas = None
+        self.soma_faturas = pd.Series(dtype='int64')
+        self.trava = threading.Lock()
+
+    # --- ATUALIZAÇÃO ---
+    def atualizar(self, df):
+        """Deixa o cubo em dia com df. Devolve "atual", "incremental" ou "completa"."""
+        versao = df.attrs.get("versao") or normalizacao.versao(df)
+        with self.trava:
+            if versao == self.versao:
+                return "atual"
+
+            hashes = normalizacao.hashes_linhas(df)
+            modo = "completa"
+            if self.tabela is not None:
+                # Só é incremental se todas as linhas antigas continuam lá, sem edições
+                novas = normalizacao.linhas_novas(hashes, self.hashes)
+                if novas is not None:
+                    if novas.any():
+                        self._somar(df[novas])
+                    modo = "incremental"
+
+            if modo == "completa":
+                self.tabela, self.parcelas = None, None
+                self.saldo = saldo.SaldoCorrido()
+                self.investido = 0
+                self.soma_faturas = pd.Series(dtype='int64')
+                self._somar(df)
+
+            self.hashes = np.sort(hashes)
+            self.versao = versao
+            return modo
+
+    def _somar(self, df):
+        valor = df['Centavos'] if 'Centavos' in df.columns else (df['Valor'] * 100).round().astype('int64')
+        is_invest = regras.mascara_investimento(df)
+        # Receitas: (Outros > 0) OU (Investimento < 0 [Resgate])
+        # Saídas: (Outros < 0) OU (Investimento > 0 [Aplicação])
+        receita = ((valor > 0) & ~is_invest) | ((valor < 0) & is_invest)
+        saida = ((valor < 0) & ~is_invest) | ((valor > 0) & is_invest)
+
+        parte = pd.DataFrame({
+            'Mes_Ano': df['Mes_Ano'].astype(str),
+            'Categoria': df['Categoria'].astype(str),
+            'Forma de Pagamento': df['Forma de Pagamento'].astype(str),
+            'Recorrência': df['Recorrência'].astype(str),
+            'Status': np.select([receita, saida], ['Receitas', 'Despesas'], ''),
+            'Centavos': valor,
+            'Centavos_Abs': valor.abs(),
+            'Lancamentos': 1,
+        })
+        agregado = parte.groupby(DIMENSOES, sort=False).sum()
+        if self.tabela is None:
+            self.tabela = agregado
+        else:
+            self.tabela = pd.concat([self.tabela, agregado]).groupby(level=DIMENSOES, sort=False).sum()
+        # Para o saldo, o investimento positivo subtrai e o negativo soma
+        valor_saldo = df['Centavos_Saldo'] if 'Centavos_Saldo' in df.columns else valor.where(~is_invest, -valor)
+        self.saldo.adicionar(df['Data'], valor_saldo)
+        self.investido += int(valor[is_invest].sum())
+
+        # Cada compra no cartão vira uma linha por parcela, na fatura em que ela cai (ver faturas.py)
+        mascara_cartao = regras.mascara_cartao(df)
+        cartao = df[mascara_cartao]
+        parcelas = faturas.expandir(cartao, valor[mascara_cartao])
+        origem = cartao.loc[parcelas['Linha'], [c for c in COLUNAS_FATURA if c in cartao.columns]]
+        parcelas = pd.concat([parcelas.reset_index(drop=True), origem.reset_index(drop=True)], axis=1)
+        if self.parcelas is not None:
+            parcelas = pd.concat([self.parcelas, parcelas], ignore_index=True)
+            parcelas['Cartao'] = parcelas['Cartao'].astype('category')
+            parcelas['Parcela'] = parcelas['Parcela'].astype('category')
+        # Ordenadas por fatura: os lançamentos de uma fatura são uma fatia contígua
+        self.parcelas = parcelas.sort_values(['Mes_Fatura', 'Data'], kind='stable', ignore_index=True)
+        self.soma_faturas = paralelo.agregar(self.parcelas, ['Cartao', 'Mes_Fatura'], 'Centavos')['sum']
+
+    # --- CONSULTAS ---
+    def _mes(self, mes, categorias):
+        try:
+            tabela = self.tabela.xs(mes, level='Mes_Ano')
+        except KeyError:
+            return self.tabela.iloc[0:0].droplevel('Mes_Ano')
+        return tabela[tabela.index.get_level_values('Categoria').isin(categorias)]
+
+    def _despesas(self, mes, categorias):
+        tabela = self._mes(mes, categorias)
+        return tabela[tabela.index.get_level_values('Status') == 'Despesas']
+
+    def totais_mes(self, mes, categorias):
+        """(receitas, despesas) do mês, em valores absolutos."""
+        por_status = self._mes(mes, categorias).groupby(level='Status')['Centavos_Abs'].sum()
+        return (moeda.para_reais(int(por_status.get('Receitas', 0))),
+                moeda.para_reais(int(por_status.get('Despesas', 0))))
+
+    def saldo_acumulado(self, mes):
+        """Saldo de todo o histórico até o fim do mês informado (busca binária na soma corrida)."""
+        return moeda.para_reais(self.saldo.ate_fim_do_mes(mes))
+
+    def total_investido(self):
+        """Soma de todas as movimentações em investimentos do histórico."""
+        return moeda.para_reais(self.investido)
+
+    def tem_despesas(self, mes, categorias):
+        return self._despesas(mes, categorias)['Lancamentos'].sum() > 0
+
+    def gastos_por_categoria(self, mes, categorias):
+        resumo = self._despesas(mes, categorias).groupby(level='Categoria')['Centavos'].sum().abs()
+        resumo = moeda.para_reais(resumo).rename('Valor')
+        return resumo.rename_axis('Categoria').reset_index().sort_values(by='Valor', ascending=False)
+
+    def gastos_por_recorrencia(self, mes, categorias):
+        despesas = self._despesas(mes, categorias)
+        despesas = despesas[despesas.index.get_level_values('Recorrência') != 'Receitas']
+        por_recorrencia = despesas.groupby(level='Recorrência')['Centavos_Abs'].sum()
+        return moeda.para_reais(por_recorrencia).rename('Valor_Abs').reset_index()
+
+    def tem_cartao(self):
+        return self.parcelas is not None and not self.parcelas.empty
+
+    def faturas(self, hoje=None):
+        """Total de cada fatura por cartão, das mais antigas às futuras já comprometidas."""
+        return faturas.tabela_faturas(self.soma_faturas, hoje)
+
+    def lancamentos_fatura(self, mes_fatura):
+        """Parcelas que caem na fatura '%m/%Y', com o valor da parcela em Valor."""
+        meses = self.parcelas['Mes_Fatura'].to_numpy()
+        mes = faturas.mes_do_rotulo(mes_fatura)
+        inicio, fim = np.searchsorted(meses, [mes, mes + 1])
+        fatia = self.parcelas.iloc[inicio:fim].rename(columns={'Parcela': 'Parcelas'})
+        return fatia.assign(Valor=moeda.para_reais(fatia['Centavos']))
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+import moeda
+import regras
+
+# --- MOTOR DE FATURAS DO CARTÃO ---
+# Cada compra parcelada vira uma linha por parcela, já no mês da fatura em que
+# ela cai: a 1ª parcela na fatura da data da compra (regra do dia de fechamento),
+# a 2ª na seguinte e assim por diante. A expansão é feita de uma vez com
+# np.repeat, sem laço por compra, e o total por fatura sai de um único groupby,
+# incluindo as faturas futuras que já têm parcelas comprometidas.
+#
+# Parcelas na planilha:
+#   "10" (ou "10x") -> Valor é o total da compra, dividido em 10 faturas;
+#   "3/10"         -> Valor já é a 3ª parcela de 10, e entra só na fatura da data;
+#   vazio/inválido -> à vista.
+DIA_VENCIMENTO = 10
+# Limite de segurança para um texto estranho não gerar milhares de linhas
+MAX_PARCELAS = 48
+# Fechamento e vencimento por cartão (valor da coluna "Forma de Pagamento").
+# Cartões que não estão aqui usam DIA_FECHAMENTO e DIA_VENCIMENTO.
+CARTOES = {
+    "Cartão de Crédito": {"fechamento": regras.DIA_FECHAMENTO, "vencimento": DIA_VENCIMENTO},
+}
+PADRAO_PARCELAS = r'^\s*(\d+)\s*(?:x|/\s*(\d+))?\s*$'
+
+
+def configuracao(cartao, cartoes=CARTOES):
+    dias = cartoes.get(cartao, {})
+    return dias.get("fechamento", regras.DIA_FECHAMENTO), dias.get("vencimento", DIA_VENCIMENTO)
+
+
+def ler_parcelas(serie):
+    """(quantidade de faturas, rótulo da 1ª parcela, total de parcelas) de cada linha."""
+    if pd.api.types.is_numeric_dtype(serie.dtype):
+        quantidade = np.nan_to_num(serie.to_numpy(dtype=float, na_value=np.nan), nan=1).astype(np.int64)
+        quantidade = np.clip(quantidade, 1, MAX_PARCELAS)
+        return quantidade, np.ones(len(serie), dtype=np.int64), quantidade
+
+    # Poucos textos distintos ("1", "3", "2/10"...): interpretamos cada um uma vez
+    codigos, distintos = pd.factorize(serie.astype(str))
+    partes = pd.Series(distintos, dtype=object).str.extract(PADRAO_PARCELAS)
+    numero = pd.to_numeric(partes[0], errors='coerce').fillna(1).astype(np.int64).to_numpy()
+    de = pd.to_numeric(partes[1], errors='coerce').to_numpy()
+    ja_parcelado = ~np.isnan(de)
+
+    quantidade = np.where(ja_parcelado, 1, np.clip(numero, 1, MAX_PARCELAS))
+    primeira = np.where(ja_parcelado, np.maximum(numero, 1), 1)
+    total = np.where(ja_parcelado, np.nan_to_num(de, nan=1), quantidade).astype(np.int64)
+    # codigos == -1 (valor ausente) pega a entrada acrescentada no fim: à vista.
+    # Ela também cobre a coluna toda vazia, quando não há nenhum distinto.
+    return tuple(np.append(valores, 1).astype(np.int64)[codigos] for valores in (quantidade, primeira, total))
+
+
+def expandir(cartao, centavos, cartoes=CARTOES):
+    """Uma linha por parcela: Linha (índice da compra), Cartao, Mes_Fatura (inteiro), Parcela e Centavos."""
+    formas = cartao['Forma de Pagamento'].astype(str)
+    codigos, nomes = pd.factorize(formas)
+    fechamento = np.array([configuracao(nome, cartoes)[0] for nome in nomes], dtype=np.int64)[codigos]
+    mes_compra = regras.mes_fatura(cartao['Data'], fechamento)
+
+    if 'Parcelas' in cartao.columns:
+        quantidade, primeira, total = ler_parcelas(cartao['Parcelas'])
+    else:
+        quantidade = primeira = total = np.ones(len(cartao), dtype=np.int64)
+
+    # Divisão exata em centavos: a diferença do arredondamento fica na 1ª parcela, como nos bancos
+    centavos = np.asarray(centavos, dtype=np.int64)
+    absoluto = np.abs(centavos)
+    base = absoluto // quantidade
+    resto = absoluto - base * quantidade
+
+    compra = np.repeat(np.arange(len(cartao)), quantidade)
+    inicio = np.repeat(np.cumsum(quantidade) - quantidade, quantidade)
+    ordem = np.arange(len(compra)) - inicio  # 0 para a 1ª parcela da compra, 1 para a 2ª...
+    valor = base[compra] + np.where(ordem == 0, resto[compra], 0)
+
+    # Rótulo "2/10" formatado uma vez por combinação distinta, não por parcela
+    de = total[compra]
+    fator = int(de.max()) + 1 if len(de) else 1
+    codigos_rotulo, pares = pd.factorize((primeira[compra] + ordem) * fator + de)
+    rotulos = [f"{par // fator}/{par % fator}" for par in pares]
+    return pd.DataFrame({
+        'Linha': cartao.index.to_numpy()[compra],
+        'Cartao': pd.Categorical.from_codes(codigos[compra], nomes),
+        'Mes_Fatura': mes_compra[compra] + ordem,
+        'Parcela': pd.Categorical.from_codes(codigos_rotulo, rotulos),
+        'Centavos': np.sign(centavos)[compra] * valor,
+    })
+
+
+def mes_do_rotulo(rotulo):
+    """'11/2024' -> mês inteiro usado em Mes_Fatura."""
+    mes, ano = rotulo.split('/')
+    return int(ano) * 12 + int(mes) - 1
+
+
+def tabela_faturas(soma, hoje=None, cartoes=CARTOES):
+    """Tabela de faturas (passadas e futuras) a partir da soma em centavos por (Cartao, Mes_Fatura)."""
+    tabela = soma.rename('Centavos').reset_index()
+    meses = tabela['Mes_Fatura'].to_numpy(dtype=np.int64)
+    vencimento = np.array([configuracao(c, cartoes)[1] for c in tabela['Cartao'].astype(str)], dtype=np.int64)
+    fechamento = np.array([configuracao(c, cartoes)[0] for c in tabela['Cartao'].astype(str)], dtype=np.int64)
+
+    # A fatura do mês M fecha no mês M + 1; o vencimento vem depois do fechamento
+    mes_vencimento = meses + 1 + (vencimento <= fechamento)
+    tabela['Vencimento'] = ((mes_vencimento - 1970 * 12).astype('datetime64[M]').astype('datetime64[D]')
+                            + (vencimento - 1).astype('timedelta64[D]'))
+
+    # Fatura em aberto hoje, pela mesma regra de fechamento de cada cartão
+    hoje = pd.Timestamp.today() if hoje is None else pd.Timestamp(hoje)
+    mes_atual = hoje.year * 12 + hoje.month - 1 - (hoje.day < fechamento)
+    tabela['Situação'] = np.select([meses < mes_atual, meses == mes_atual], ['Fechada', 'Em aberto'], 'Futura')
+    tabela['Valor'] = moeda.para_reais(tabela['Centavos'].abs())
+    tabela['Data_Ref'] = (meses - 1970 * 12).astype('datetime64[M]').astype('datetime64[ns]')
+    tabela['Mes_Fatura'] = regras.rotular_meses(meses)
+    return tabela.sort_values(['Data_Ref', 'Cartao']).reset_index(drop=True)
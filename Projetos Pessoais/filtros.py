@@ -0,0 +1,102 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+import regras
+
+# --- MEMORIZAÇÃO DOS FILTROS DA SIDEBAR ---
+# Cada clique na sidebar roda o script inteiro de novo. Guardamos os DataFrames
+# derivados de cada combinação de filtros (e versão dos dados), assim voltar para
+# um mês já visto não refaz as máscaras. O cache é limitado: quando enche,
+# descartamos a combinação usada há mais tempo (LRU).
+CAPACIDADE_PADRAO = 32
+
+
+class CacheLRU:
+    def __init__(self, capacidade=CAPACIDADE_PADRAO):
+        self.capacidade = capacidade
+        self.itens = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+        self.trava = threading.Lock()
+
+    def obter(self, chave, calcular):
+        with self.trava:
+            if chave in self.itens:
+                self.itens.move_to_end(chave)
+                self.acertos += 1
+                return self.itens[chave]
+
+        # Calculamos fora da trava para não segurar as outras sessões
+        valor = calcular()
+        with self.trava:
+            self.falhas += 1
+            self.itens[chave] = valor
+            self.itens.move_to_end(chave)
+            while len(self.itens) > self.capacidade:
+                self.itens.popitem(last=False)
+        return valor
+
+
+def chave_filtros(versao, ano, mes, categorias, ver_tudo):
+    # A ordem em que as categorias foram marcadas não muda o resultado
+    return versao, ano, mes, tuple(sorted(categorias)), bool(ver_tudo)
+
+
+def fatia(df, coluna, valor):
+    """Linhas com df[coluna] == valor, sem copiar quando elas são contíguas.
+
+    O ledger sai da normalização ordenado por data, então Ano e Mes_Ano (categóricas
+    em ordem) formam blocos contíguos: uma busca binária nos códigos acha o bloco e o
+    iloc devolve uma fatia que compartilha a memória do ledger (copy-on-write do pandas).
+    """
+    serie = df[coluna]
+    if isinstance(serie.dtype, pd.CategoricalDtype) and valor in serie.cat.categories:
+        codigos = serie.cat.codes.to_numpy()
+        if len(codigos) < 2 or (codigos[1:] >= codigos[:-1]).all():
+            # Código no mesmo tipo dos códigos (int8): senão o NumPy converteria o array inteiro
+            codigo = codigos.dtype.type(serie.cat.categories.get_loc(valor))
+            inicio = np.searchsorted(codigos, codigo, side='left')
+            fim = np.searchsorted(codigos, codigo, side='right')
+            return df.iloc[inicio:fim]
+    return df[serie == valor]
+
+
+def das_categorias(df, categorias):
+    """Filtro de categorias; com todas marcadas, devolve o próprio df em vez de uma cópia."""
+    serie = df["Categoria"]
+    if isinstance(serie.dtype, pd.CategoricalDtype) and np.isin(serie.cat.categories, categorias).all():
+        return df
+    return df[serie.isin(categorias)]
+
+
+def recortar(df, ano, mes, categorias, ver_tudo):
+    """Monta os DataFrames derivados usados pelas seções do dashboard (sem alterar df)."""
+    df_mes_base = fatia(df, 'Mes_Ano', mes)
+    df_mes = das_categorias(df_mes_base, categorias)
+
+    # --- LÓGICA DE FILTRAGEM POR PERÍODO ---
+    if ver_tudo:
+        # Filtra os dados apenas para o ano que está selecionado no seletor
+        do_ano = fatia(df, 'Ano', ano)
+        df_para_evolucao = das_categorias(do_ano, categorias)
+        df_para_investimentos = do_ano
+    else:
+        # Mantém a visão apenas do mês selecionado
+        df_para_evolucao = df_mes
+        df_para_investimentos = df_mes
+
+    # O Status fica numa Series à parte: acrescentar a coluna obrigaria a copiar o recorte
+    status_evolucao = regras.definir_status(df_para_evolucao)
+    df_invest = df_para_investimentos[regras.mascara_investimento(df_para_investimentos)]
+
+    return {
+        "df_mes": df_mes,
+        # Ordem por data calculada uma vez por recorte; a lista só lê a página pedida dela
+        "ordem_mes": np.argsort(df_mes['Data'].to_numpy(), kind='stable'),
+        "df_para_evolucao": df_para_evolucao,
+        "status_evolucao": status_evolucao,
+        "df_invest": df_invest,
+    }
@@ -0,0 +1,82 @@
+import hashlib
+import sqlite3
+
+import pandas as pd
+
+# --- FONTES DE DADOS DO LEDGER ---
+# Todas as fontes devolvem o mesmo formato: um DataFrame "cru", com as colunas
+# da planilha e os valores como texto (ex.: "R$ 1.234,56" e "05/03/2025").
+# A limpeza e a tipagem ficam por conta de normalizacao.normalizar().
+COLUNAS = ['Data', 'Valor', 'Categoria', 'Forma de Pagamento', 'Parcelas', 'Recorrência',
+           'Descrição (Opcional)']
+
+
+def identificador(caminho):
+    # Usado para separar o snapshot local de cada arquivo de origem
+    return hashlib.md5(str(caminho).encode("utf-8")).hexdigest()[:10]
+
+
+class FontePlanilha:
+    """Planilha "Controle de Gastos" no Google Sheets."""
+    nome = "planilha"
+
+    def __init__(self, conectar, incremental=True):
+        # conectar é uma função que devolve a worksheet já autenticada
+        self.conectar = conectar
+        self.incremental = incremental
+
+    def ler(self):
+        # sincronizacao usa o gspread; importado só aqui para as fontes locais
+        # (e o início do app) não pagarem a importação da biblioteca do Google
+        import sincronizacao
+
+        sheet = self.conectar()
+        if self.incremental:
+            cabecalho, linhas, _ = sincronizacao.sincronizar(sheet)
+            data = sincronizacao.para_registros(cabecalho, linhas)
+        else:
+            data = sheet.get_all_records()
+        return pd.DataFrame(data)
+
+
+class FonteCSV:
+    """Arquivo CSV local com as mesmas colunas da planilha."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.nome = "csv-" + identificador(caminho)
+
+    def ler(self):
+        return pd.read_csv(self.caminho, dtype=str, keep_default_na=False)
+
+
+class FonteSQLite:
+    """Banco SQLite local; cada linha da tabela é um lançamento."""
+
+    def __init__(self, caminho, tabela="lancamentos"):
+        self.caminho = caminho
+        self.tabela = tabela
+        self.nome = "sqlite-" + identificador(caminho)
+
+    def ler(self):
+        with sqlite3.connect(self.caminho) as conexao:
+            return pd.read_sql_query(f'SELECT * FROM "{self.tabela}"', conexao)
+
+
+def salvar_sqlite(df, caminho, tabela="lancamentos"):
+    with sqlite3.connect(caminho) as conexao:
+        df.to_sql(tabela, conexao, if_exists="replace", index=False)
+
+
+def fonte_da_configuracao(texto, conectar_planilha):
+    """Monta a fonte a partir de um texto como "planilha", "csv:dados.csv" ou "sqlite:dados.db"."""
+    tipo, _, caminho = (texto or "planilha").partition(":")
+    tipo = tipo.strip().lower()
+
+    if tipo == "planilha":
+        return FontePlanilha(conectar_planilha, incremental=caminho != "completa")
+    if tipo == "csv":
+        return FonteCSV(caminho)
+    if tipo == "sqlite":
+        return FonteSQLite(caminho)
+    raise ValueError(f"Fonte de dados desconhecida: {texto}")
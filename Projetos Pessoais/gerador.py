@@ -0,0 +1,87 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import fontes
+
+# --- GERADOR DE LEDGER SINTÉTICO ---
+# Produz lançamentos no mesmo formato da planilha (valores em texto, datas dd/mm/aaaa)
+# para medir e otimizar o dashboard com volumes grandes, sem depender da rede.
+DESPESAS = {
+    'Alimentação': (15, 400), 'Moradia': (800, 3500), 'Transporte': (10, 300), 'Lazer': (20, 600),
+    'Saúde': (30, 900), 'Educação': (50, 1500), 'Assinaturas': (15, 80), 'Compras': (20, 2500),
+}
+RECEITAS = {'Salário': (3000, 12000), 'Freelance': (200, 4000)}
+INVESTIMENTOS = {'Investimento - Tesouro': (100, 5000), 'Investimento - Ações': (100, 5000)}
+FORMAS_PAGAMENTO = ['Pix', 'Cartão de Crédito', 'Cartão de Débito', 'Dinheiro', 'Boleto']
+RECORRENCIAS = ['Fixos', 'Recorrentes', 'Não Recorrentes']
+DESCRICOES = ['', '', '', 'Mercado', 'Aluguel', 'Uber', 'Cinema', 'Farmácia', 'Curso', 'Netflix', 'Loja']
+
+
+def formatar_brl(centavos):
+    # 123456 -> "R$ 1.234,56"; -500 -> "-R$ 5,00"
+    reais = pd.Series(np.abs(centavos) // 100).map('{:,}'.format).str.replace(',', '.', regex=False)
+    resto = pd.Series(np.abs(centavos) % 100).astype(str).str.zfill(2)
+    sinal = pd.Series(np.where(centavos < 0, '-', ''))
+    return sinal + 'R$ ' + reais + ',' + resto
+
+
+def gerar_lancamentos(quantidade, inicio="2020-01-01", anos=5, semente=42):
+    """Gera `quantidade` lançamentos aleatórios (mas reprodutíveis) com o schema da planilha."""
+    rng = np.random.default_rng(semente)
+
+    categorias = list(DESPESAS) + list(RECEITAS) + list(INVESTIMENTOS)
+    faixas = {**DESPESAS, **RECEITAS, **INVESTIMENTOS}
+    pesos = np.array([8, 3, 6, 4, 2, 1, 2, 4] + [1, 0.5] + [0.7, 0.7])
+    escolha = rng.choice(len(categorias), size=quantidade, p=pesos / pesos.sum())
+    categoria = np.array(categorias, dtype=object)[escolha]
+
+    minimos = np.array([faixas[c][0] for c in categorias])[escolha]
+    maximos = np.array([faixas[c][1] for c in categorias])[escolha]
+    centavos = (rng.uniform(minimos, maximos) * 100).astype(np.int64)
+
+    is_receita = np.isin(categoria, list(RECEITAS))
+    is_invest = np.isin(categoria, list(INVESTIMENTOS))
+    # Despesas são negativas; investimentos são aplicações (+) e, às vezes, resgates (-)
+    sinal = np.where(is_receita, 1, -1)
+    sinal = np.where(is_invest, np.where(rng.random(quantidade) < 0.8, 1, -1), sinal)
+    centavos = centavos * sinal
+
+    dias = rng.integers(0, 365 * anos, size=quantidade)
+    datas = pd.Timestamp(inicio) + pd.to_timedelta(np.sort(dias), unit="D")
+
+    forma = np.array(FORMAS_PAGAMENTO, dtype=object)[rng.integers(0, len(FORMAS_PAGAMENTO), quantidade)]
+    forma = np.where(is_receita | is_invest, 'Pix', forma)
+    no_cartao = forma == 'Cartão de Crédito'
+    parcelas = np.where(no_cartao & (rng.random(quantidade) < 0.3), rng.integers(2, 13, quantidade), 1)
+
+    recorrencia = np.array(RECORRENCIAS, dtype=object)[rng.integers(0, len(RECORRENCIAS), quantidade)]
+    recorrencia = np.where(is_receita, 'Receitas', recorrencia)
+
+    descricao = np.array(DESCRICOES, dtype=object)[rng.integers(0, len(DESCRICOES), quantidade)]
+
+    return pd.DataFrame({
+        'Data': datas.strftime('%d/%m/%Y'),
+        'Valor': formatar_brl(centavos).to_numpy(),
+        'Categoria': categoria,
+        'Forma de Pagamento': forma,
+        'Parcelas': parcelas.astype(str),
+        'Recorrência': recorrencia,
+        'Descrição (Opcional)': descricao,
+    }, columns=fontes.COLUNAS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera um ledger sintético para testes locais.")
+    parser.add_argument("quantidade", type=int, help="número de lançamentos")
+    parser.add_argument("saida", help="arquivo .csv ou .db/.sqlite de destino")
+    parser.add_argument("--semente", type=int, default=42)
+    args = parser.parse_args()
+
+    df = gerar_lancamentos(args.quantidade, semente=args.semente)
+    if args.saida.endswith((".db", ".sqlite")):
+        fontes.salvar_sqlite(df, args.saida)
+    else:
+        df.to_csv(args.saida, index=False)
+    print(f"{len(df):,} lançamentos gravados em {args.saida}")
@@ -0,0 +1,157 @@
+import pandas as pd
+import streamlit as st
+
+import paralelo
+
+# --- GRÁFICOS DO DASHBOARD ---
+# Cada figura é montada a partir de uma tabela já agregada e fica em cache,
+# indexada pelo hash dessa tabela: se os dados do gráfico não mudaram, o Plotly
+# não é chamado de novo. Antes de montar as linhas do tempo, reduzimos a
+# quantidade de pontos para que o tamanho enviado ao navegador seja limitado.
+# O plotly.express é importado dentro de cada figura: a importação é lenta e só
+# acontece quando o primeiro gráfico é montado, depois das métricas já na tela.
+MAX_PONTOS_POR_LINHA = 400
+# Do mais detalhado para o mais agrupado
+FREQUENCIAS = ['D', 'W', 'M', 'Q']
+ENTRADAS_CACHE = 64
+
+
+def reduzir_por_tempo(df, chaves, valor='Valor', max_pontos=MAX_PONTOS_POR_LINHA, linha=None):
+    """Agrupa df por ['Data'] + chaves, juntando datas em semanas/meses se houver pontos demais por linha."""
+    for frequencia in FREQUENCIAS:
+        datas = df['Data'] if frequencia == 'D' else df['Data'].dt.to_period(frequencia).dt.start_time
+        agregado = paralelo.agregar(df, [datas] + chaves, valor)['sum'].rename(valor).reset_index()
+        if linha and not agregado.empty:
+            pontos = agregado.groupby(linha, observed=True).size().max()
+        else:
+            pontos = len(agregado)
+        if pontos <= max_pontos:
+            break
+    return agregado
+
+
+@st.cache_data(max_entries=ENTRADAS_CACHE)
+def figura_evolucao(df_plot, intervalo_ms, data_referencia):
+    import plotly.express as px
+
+    df_plot = df_plot.copy()
+    df_plot['Valor_Grafico'] = df_plot['Valor'].abs()
+
+    fig_evolucao = px.line(df_plot, x='Data', y='Valor_Grafico', color='Status', markers=True,
+                           color_discrete_map={"Receitas": "#2ecc71", "Despesas": "#e74c3c"},
+                           category_orders={"Status": ["Receitas", "Despesas"]},
+                           template="plotly_dark", custom_data=['Categoria', 'Valor'],
+                           labels={"Valor_Grafico": "Valor (R$)", "Data": "Data"})
+
+    fig_evolucao.update_xaxes(tickformat="%d/%m/%Y", dtick=intervalo_ms, tick0=data_referencia, tickmode="linear")
+    fig_evolucao.update_layout(hovermode="closest",
+                               legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1))
+    fig_evolucao.update_traces(
+        hovertemplate="<b>Data:</b> %{x|%d/%m/%Y}<br><b>Valor Real:</b> R$ %{customdata[1]:,.2f}<br><b>Categoria:</b> %{customdata[0]}<extra></extra>")
+    return fig_evolucao
+
+
+@st.cache_data(max_entries=ENTRADAS_CACHE)
+def figura_investimentos(df_invest_plot, intervalo_ms, data_referencia):
+    import plotly.express as px
+
+    fig_invest = px.line(df_invest_plot, x='Data', y='Valor', color='Categoria', markers=True,
+                         template="plotly_dark", color_discrete_sequence=px.colors.sequential.Greens_r,
+                         labels={"Valor": "Valor (R$)", "Data": "Data"})
+
+    fig_invest.update_xaxes(tickformat="%d/%m/%Y", dtick=intervalo_ms, tick0=data_referencia, tickmode="linear")
+    fig_invest.update_traces(
+        hovertemplate="<b>Data:</b> %{x|%d/%m/%Y}<br><b>Movimentação:</b> R$ %{y:,.2f}<extra></extra>")
+    return fig_invest
+
+
+@st.cache_data(max_entries=ENTRADAS_CACHE)
+def figura_faturas(df_faturas):
+    import plotly.express as px
+
+    # Uma cor por cartão; as faturas futuras (só parcelas já comprometidas) ficam hachuradas
+    fig_cartao = px.bar(
+        df_faturas,
+        x='Mes_Fatura',
+        y='Valor',
+        color='Cartao',
+        pattern_shape='Situação',
+        pattern_shape_map={'Fechada': '', 'Em aberto': '.', 'Futura': '/'},
+        custom_data=['Cartao', 'Vencimento', 'Situação'],
+        title="Visão por Fatura",
+        color_discrete_sequence=["#9b59b6", "#3498db", "#1abc9c", "#e67e22"],
+        template="plotly_dark",
+        labels={"Valor": "Valor da Fatura (R$)", "Mes_Fatura": "Mês da Fatura", "Cartao": "Cartão"}
+    )
+
+    fig_cartao.update_traces(
+        hovertemplate="<b>Fatura:</b> %{x} (%{customdata[2]})<br><b>Cartão:</b> %{customdata[0]}<br>"
+                      "<b>Vencimento:</b> %{customdata[1]|%d/%m/%Y}<br><b>Valor Total:</b> R$ %{y:,.2f}<extra></extra>"
+    )
+    # Várias séries (cartão x situação) no mesmo eixo: mantém os meses em ordem cronológica
+    fig_cartao.update_xaxes(categoryorder='array', categoryarray=df_faturas['Mes_Fatura'].unique())
+    return fig_cartao
+
+
+@st.cache_data(max_entries=ENTRADAS_CACHE)
+def figura_pizza(df_pizza):
+    import plotly.express as px
+
+    fig_pizza = px.pie(
+        df_pizza,
+        values="Valor",
+        names="Categoria",
+        hole=0.4,
+        color_discrete_sequence=px.colors.qualitative.Plotly
+    )
+    fig_pizza.update_traces(
+        hovertemplate="<b>Categoria:</b> %{label}<br><b>Valor:</b> R$ %{value:,.2f}<br><b>Percentual:</b> %{percent}<extra></extra>")
+    return fig_pizza
+
+
+@st.cache_data(max_entries=ENTRADAS_CACHE)
+def figura_balanco(receitas, despesas):
+    import plotly.express as px
+
+    df_balanco = pd.DataFrame({
+        'Status': ['Receitas', 'Despesas'],
+        'Total': [receitas, despesas]
+    })
+    fig_bar = px.bar(df_balanco, x='Status', y='Total', color='Status',
+                     color_discrete_map={"Receitas": "#2ecc71", "Despesas": "#e74c3c"},
+                     labels={"Total": "Valor (R$)"})
+    fig_bar.update_traces(hovertemplate="<b>Status:</b> %{x}<br><b>Total:</b> R$ %{y:,.2f}<extra></extra>")
+    return fig_bar
+
+
+@st.cache_data(max_entries=ENTRADAS_CACHE)
+def figura_recorrencia(df_rec_plot, df_sugestao=None):
+    import plotly.express as px
+
+    fig_recorrencia = px.bar(
+        df_rec_plot,
+        x="Recorrência",
+        y="Valor_Abs",
+        color="Recorrência",
+        template="plotly_dark",
+        color_discrete_map={
+            "Fixos": "#5DADE2",
+            "Recorrentes": "#F4D03F",
+            "Não Recorrentes": "#e74c3c"
+        },
+        category_orders={"Recorrência": ["Fixos", "Recorrentes", "Não Recorrentes"]},
+        labels={"Valor_Abs": "Total (R$)"}
+    )
+
+    fig_recorrencia.update_traces(
+        hovertemplate="<b>Recorrência:</b> %{x}<br><b>Total:</b> R$ %{y:,.2f}<extra></extra>"
+    )
+
+    # Sobreposição: o total de cada rótulo segundo o detector automático (ver recorrencia.py)
+    if df_sugestao is not None and not df_sugestao.empty:
+        fig_recorrencia.add_scatter(
+            x=df_sugestao["Recorrência"], y=df_sugestao["Valor_Abs"], mode="markers", name="Sugerido pelo detector",
+            marker=dict(symbol="diamond", size=14, color="white", line=dict(width=2, color="#17202A")),
+            hovertemplate="<b>Sugerido:</b> %{x}<br><b>Total:</b> R$ %{y:,.2f}<extra></extra>"
+        )
+    return fig_recorrencia
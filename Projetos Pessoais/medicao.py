@@ -0,0 +1,100 @@
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+# --- INSTRUMENTAÇÃO DO DASHBOARD (OPCIONAL) ---
+# Cada rerun do Streamlit roda em uma thread; guardamos a medição do rerun atual
+# em uma variável por thread. As seções do app ficam dentro de medicao.secao(...),
+# que devolve um contexto vazio quando a instrumentação está desligada, então o
+# custo nesse caso é só uma consulta de atributo por seção.
+# Para ligar: variável de ambiente DEBUG_DASHBOARD=1 ou ?debug=1 na URL.
+VARIAVEL_AMBIENTE = "DEBUG_DASHBOARD"
+
+log = logging.getLogger("dashboard")
+_local = threading.local()
+_NULO = nullcontext()
+
+# Contadores do processo inteiro (todas as sessões), por exemplo acertos/falhas do load_data
+contadores = Counter()
+_trava_contadores = threading.Lock()
+
+
+class Medicao:
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.secoes = []
+        self.linhas = {}
+
+    @contextmanager
+    def _secao(self, nome, linhas):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            fim = time.perf_counter()
+            self.secoes.append({
+                "secao": nome,
+                "inicio_ms": round((inicio - self.inicio) * 1000, 2),
+                "duracao_ms": round((fim - inicio) * 1000, 2),
+            })
+            if linhas is not None:
+                self.linhas[nome] = linhas
+
+    def resumo(self):
+        return {
+            "total_ms": round((time.perf_counter() - self.inicio) * 1000, 2),
+            "secoes": self.secoes,
+            "linhas": self.linhas,
+            "contadores": dict(contadores),
+        }
+
+
+def _configurar_log():
+    # Uma linha JSON por rerun no stderr, se ninguém configurou o logging antes
+    if not log.handlers:
+        saida = logging.StreamHandler()
+        saida.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        log.addHandler(saida)
+        log.setLevel(logging.INFO)
+
+
+def iniciar(ativa):
+    """Começa a medição do rerun atual (ou desliga, se ativa for False)."""
+    if ativa:
+        _configurar_log()
+    _local.atual = Medicao() if ativa else None
+    return _local.atual
+
+
+def secao(nome, linhas=None):
+    """Contexto que mede o tempo de uma seção; linhas é o número de linhas processadas nela."""
+    medicao = getattr(_local, "atual", None)
+    if medicao is None:
+        return _NULO
+    return medicao._secao(nome, linhas)
+
+
+def registrar_linhas(etapa, linhas):
+    medicao = getattr(_local, "atual", None)
+    if medicao is not None:
+        medicao.linhas[etapa] = linhas
+
+
+def contar(nome, quantidade=1):
+    # Contadores são baratos e sempre ligados: são só inteiros compartilhados
+    with _trava_contadores:
+        contadores[nome] += quantidade
+
+
+def finalizar():
+    """Encerra a medição do rerun, escreve uma linha JSON no log e devolve o resumo."""
+    medicao = getattr(_local, "atual", None)
+    if medicao is None:
+        return None
+    _local.atual = None
+    resumo = medicao.resumo()
+    log.info(json.dumps(resumo, ensure_ascii=False))
+    return resumo
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# --- CONVERSÃO DE VALORES EM REAIS ---
+# Os valores chegam da planilha como texto ("R$ 1.234,56", "-R$ 5,00", "(12,30)").
+# Eles se repetem muito (assinaturas, aluguel...), então a coluna é codificada como
+# dicionário do Arrow e só os textos distintos passam por uma única expressão
+# regular; os códigos de cada linha levam o resultado de volta. O resultado é em
+# centavos inteiros, sem erro de arredondamento nas somas, e as linhas que não
+# seguem o formato são apontadas em vez de virarem zero.
+# Espaços (inclusive o não separável) são ignorados em qualquer posição, como na
+# antiga cadeia de .str.replace: "1 000,00" continua valendo 1000 reais.
+ESPACOS = '[ \u00a0]'
+# Sinal antes do número: "-" (antes ou depois do "R$") ou parênteses; o ponto só
+# separa milhares ("1.234", não "12.5") e a vírgula tem no máximo 2 casas ("5," vale 5)
+FORMATO = (r'^(?P<abre>\()?(?P<menos>-)?(?:R\$)?(?P<menos_depois>-)?'
+           r'(?P<inteiro>\d{1,3}(?:\.\d{3})+|\d*)(?:,(?P<casas>\d{0,2}))?(?P<fecha>\))?$')
+# Acima disso o valor não cabe com folga em int64 (e não é um lançamento real)
+MAX_DIGITOS = 15
+
+
+def _converter_numeros(numeros):
+    # Células numéricas (a API da planilha já converte "50" em 50) entram direto
+    numeros = np.asarray(numeros, dtype=float)
+    invalidos = ~np.isfinite(numeros)
+    centavos = np.zeros(len(numeros), dtype=np.int64)
+    centavos[~invalidos] = np.round(numeros[~invalidos] * 100)
+    return centavos, invalidos
+
+
+def _arrow(textos):
+    # Colunas str do pandas 3 já são Arrow; lidas de arquivos grandes vêm em vários pedaços
+    arrow = pa.array(textos, type=pa.large_string(), from_pandas=True)
+    if isinstance(arrow, pa.ChunkedArray):
+        arrow = arrow.combine_chunks()
+    return arrow
+
+
+def _converter_distintos(distintos):
+    """(centavos, inválidos) de cada texto distinto (um array do Arrow sem nulos)."""
+    partes = pc.extract_regex(pc.replace_substring_regex(distintos, ESPACOS, ''), FORMATO)
+    casou = partes.is_valid().to_numpy(zero_copy_only=False)
+    grupo = {nome: partes.field(nome).fill_null('') for nome in
+             ['abre', 'menos', 'menos_depois', 'inteiro', 'casas', 'fecha']}
+
+    inteiro = pc.replace_substring(grupo['inteiro'], '.', '')
+    n_digitos = (pc.utf8_length(inteiro).to_numpy(zero_copy_only=False)
+                 + pc.utf8_length(grupo['casas']).to_numpy(zero_copy_only=False))
+    abre, fecha, menos, menos_depois = (pc.not_equal(grupo[nome], '').to_numpy(zero_copy_only=False)
+                                        for nome in ['abre', 'fecha', 'menos', 'menos_depois'])
+    invalidos = ~casou | (n_digitos == 0) | (n_digitos > MAX_DIGITOS)
+    invalidos |= (abre != fecha) | (abre & (menos | menos_depois)) | (menos & menos_depois)
+
+    # Inválidos viram "0" antes da conversão, para o cast do Arrow não falhar
+    validos = pa.array(~invalidos)
+    reais = pc.if_else(pc.and_(validos, pc.not_equal(inteiro, '')), inteiro, '0')
+    casas = pc.if_else(validos, pc.utf8_rpad(grupo['casas'], 2, '0'), '00')
+    centavos = (pc.cast(reais, pa.int64()).to_numpy(zero_copy_only=False) * 100
+                + pc.cast(casas, pa.int64()).to_numpy(zero_copy_only=False))
+    centavos = np.where(abre | menos | menos_depois, -centavos, centavos)
+    centavos[invalidos] = 0
+    return centavos, invalidos
+
+
+def _converter_textos(textos):
+    # Cada texto distinto é convertido uma vez; valores ausentes são inválidos e ficam em 0
+    codificado = pc.dictionary_encode(_arrow(textos))
+    centavos, invalidos = _converter_distintos(codificado.dictionary)
+    nulos = codificado.is_null().to_numpy(zero_copy_only=False)
+    if len(centavos) == 0:
+        return np.zeros(len(nulos), dtype=np.int64), np.ones(len(nulos), dtype=bool)
+    indices = np.where(nulos, 0, codificado.indices.to_numpy(zero_copy_only=False)).astype(np.int64)
+    centavos, invalidos = centavos[indices], invalidos[indices] | nulos
+    centavos[nulos] = 0
+    return centavos, invalidos
+
+
+def converter_brl(valores):
+    """Converte uma coluna de valores em reais para (centavos int64, máscara das linhas inválidas)."""
+    valores = pd.Series(valores)
+    if pd.api.types.is_bool_dtype(valores.dtype):
+        return np.zeros(len(valores), dtype=np.int64), np.ones(len(valores), dtype=bool)
+    if pd.api.types.is_numeric_dtype(valores.dtype):
+        return _converter_numeros(valores.to_numpy(dtype=float, na_value=np.nan))
+    if pd.api.types.infer_dtype(valores, skipna=True) in ('string', 'empty'):
+        return _converter_textos(valores)
+
+    # Coluna misturada: números e textos são convertidos separadamente; o resto
+    # (booleanos de caixas de seleção, datas...) fica inválido
+    objetos = valores.to_numpy(dtype=object)
+    eh_numero = np.fromiter((isinstance(v, (int, float, np.number)) and not isinstance(v, (bool, np.bool_))
+                             for v in objetos), dtype=bool, count=len(objetos))
+    eh_texto = np.fromiter((isinstance(v, str) or v is None for v in objetos), dtype=bool, count=len(objetos))
+    centavos = np.zeros(len(objetos), dtype=np.int64)
+    invalidos = ~(eh_numero | eh_texto)
+    centavos[eh_numero], invalidos[eh_numero] = _converter_numeros(objetos[eh_numero].astype(float))
+    centavos[eh_texto], invalidos[eh_texto] = _converter_textos(objetos[eh_texto])
+    return centavos, invalidos
+
+
+def para_reais(centavos):
+    """Centavos inteiros (número, array ou Series) em reais, só para exibição."""
+    return centavos / 100
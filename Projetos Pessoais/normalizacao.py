@@ -0,0 +1,150 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+import moeda
+import regras
+
+# --- COLUNAS DA PLANILHA ---
+# Colunas com poucos valores distintos viram "category": ocupam menos memória
+# e são gravadas de forma compacta no snapshot local.
+COLUNAS_CATEGORICAS = ['Categoria', 'Forma de Pagamento', 'Recorrência']
+# Outras colunas de texto também viram "category" quando repetem bastante
+PROPORCAO_MAXIMA_DISTINTOS = 0.5
+# Colunas calculadas aqui; não fazem parte dos registros da planilha
+COLUNAS_DERIVADAS = ['Mes_Ano', 'Mes_Ano_Exibicao', 'Ano', 'is_invest', 'is_cartao', 'Centavos', 'Centavos_Saldo']
+# Quantos valores inválidos guardamos como exemplo em df.attrs["valores_invalidos"]
+MAX_EXEMPLOS_INVALIDOS = 20
+
+
+def eh_texto(serie):
+    # object no pandas 2, "str" no pandas 3
+    return pd.api.types.is_object_dtype(serie.dtype) or (
+        pd.api.types.is_string_dtype(serie.dtype) and not isinstance(serie.dtype, pd.CategoricalDtype))
+
+
+def em_branco(serie):
+    """Células ausentes ou só com espaços (linhas espaçadoras da planilha)."""
+    branco = serie.isna()
+    if eh_texto(serie):
+        branco |= serie.str.strip().eq('').fillna(False).astype(bool)
+    return branco
+
+
+def normalizar(df):
+    """Limpa os registros crus da planilha e devolve o DataFrame tipado usado no dashboard."""
+    # Linhas sem Data ou sem Valor (espaçadoras, ainda em preenchimento) saem antes de
+    # validar o Valor: não são lançamentos e não devem aparecer como valores inválidos
+    colunas = [c for c in ('Data', 'Valor') if c in df.columns]
+    if colunas:
+        vazias = np.logical_or.reduce([em_branco(df[c]).to_numpy() for c in colunas])
+        if vazias.any():
+            df = df.loc[~vazias]
+
+    invalidos = None
+    if 'Valor' in df.columns:
+        # Conversão em uma passada, direto para centavos (ver moeda.py). Os valores que
+        # não são reais válidos saem do DataFrame e ficam registrados, em vez de virar 0.
+        centavos, mascara = moeda.converter_brl(df['Valor'])
+        if mascara.any():
+            # +2: cabeçalho e numeração a partir de 1, como na planilha
+            exemplos = df.loc[mascara, 'Valor'].head(MAX_EXEMPLOS_INVALIDOS).astype(str)
+            invalidos = {
+                "total": int(mascara.sum()),
+                "exemplos": list(zip((exemplos.index + 2).tolist(), exemplos.tolist())),
+            }
+        # Centavos (int64) é a coluna usada em todas as somas; Valor fica para exibição
+        df['Valor'] = moeda.para_reais(centavos)
+        df['Centavos'] = centavos
+        df = df.loc[~mascara]
+
+    # As demais colunas de texto podem vir misturadas (ex.: Parcelas com 3 e ""),
+    # então fixamos tudo como texto para ter sempre o mesmo schema.
+    for coluna in df.columns:
+        if coluna not in ('Valor', 'Centavos', 'Data') and eh_texto(df[coluna]):
+            df[coluna] = df[coluna].astype(str)
+
+    if 'Data' in df.columns:
+        df['Data'] = pd.to_datetime(df['Data'], dayfirst=True, errors='coerce')
+        df = df.dropna(subset=['Data']).sort_values('Data', kind='stable').reset_index(drop=True)
+        # Formatamos o texto uma vez por mês distinto, não uma vez por linha
+        meses = df['Data'].dt.to_period('M')
+        codigos, distintos = pd.factorize(meses, sort=True)
+        df['Mes_Ano'] = pd.Categorical.from_codes(codigos, distintos.strftime('%Y-%m'))
+        df['Mes_Ano_Exibicao'] = pd.Categorical.from_codes(codigos, distintos.strftime('%m/%Y'))
+        # --- ALTERAÇÃO 1: Adicionando coluna de Ano ---
+        df['Ano'] = pd.Categorical.from_codes(*pd.factorize(df['Data'].dt.year.astype(str), sort=True))
+
+    df = compactar(df)
+    if invalidos:
+        df.attrs["valores_invalidos"] = invalidos
+    return df
+
+
+def compactar(df):
+    """Converte o texto repetitivo em "category" e pré-calcula as marcações usadas em todo rerun."""
+    for coluna in df.columns:
+        if not eh_texto(df[coluna]):
+            continue
+        if coluna in COLUNAS_CATEGORICAS or df[coluna].nunique() <= PROPORCAO_MAXIMA_DISTINTOS * len(df):
+            df[coluna] = df[coluna].astype('category')
+
+    # Números inteiros ocupam o menor tipo que cabe; Centavos continua int64 para que
+    # as somas de todo o histórico nunca transbordem
+    for coluna in df.select_dtypes('integer').columns.drop('Centavos', errors='ignore'):
+        df[coluna] = pd.to_numeric(df[coluna], downcast='integer')
+
+    # As buscas por texto ("Investimento", "Cartão de Crédito") passam a ser feitas
+    # uma vez só, aqui, em vez de a cada clique no dashboard.
+    if 'Categoria' in df.columns:
+        df['is_invest'] = regras.contem(df['Categoria'], "Investimento")
+        if 'Centavos' in df.columns:
+            # Para o saldo, o investimento positivo subtrai e o negativo soma
+            df['Centavos_Saldo'] = df['Centavos'].where(~df['is_invest'], -df['Centavos'])
+    if 'Forma de Pagamento' in df.columns:
+        df['is_cartao'] = regras.contem(df['Forma de Pagamento'], "Cartão de Crédito")
+    return df
+
+
+def uso_memoria(df):
+    """Memória ocupada pelo DataFrame, em MB."""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+# --- VERSÃO DOS DADOS ---
+# Um hash por linha permite descobrir quais lançamentos são novos entre duas cargas,
+# e o hash de todos eles juntos identifica a versão do DataFrame.
+def hashes_linhas(df):
+    colunas = [c for c in df.columns if c not in COLUNAS_DERIVADAS]
+    return pd.util.hash_pandas_object(df[colunas], index=False).to_numpy()
+
+
+def linhas_novas(hashes, anteriores):
+    """Máscara das linhas novas de df (hashes) em relação a anteriores (ordenados), ou None se
+    alguma linha antiga sumiu ou foi editada e só uma reconstrução completa resolve."""
+    # Com os dois lados ordenados a busca binária anda para a frente na memória
+    # (np.isin refaria um unique de tudo) e as antigas já saem na ordem para comparar
+    ordem = np.argsort(hashes)
+    ordenados = hashes[ordem]
+    if len(anteriores):
+        posicoes = np.minimum(np.searchsorted(anteriores, ordenados), len(anteriores) - 1)
+        ja_vistas = anteriores[posicoes] == ordenados
+    else:
+        ja_vistas = np.zeros(len(hashes), dtype=bool)
+    if not np.array_equal(ordenados[ja_vistas], anteriores):
+        return None
+    novas = np.empty(len(hashes), dtype=bool)
+    novas[ordem] = ~ja_vistas
+    return novas
+
+
+def versao(df):
+    return hashlib.sha1(hashes_linhas(df).tobytes()).hexdigest()
+
+
+def versao_fonte(bruto):
+    """Versão do DataFrame cru lido da fonte (cabeçalho e valores), antes de normalizar."""
+    resumo = hashlib.sha1("\x1f".join(map(str, bruto.columns)).encode("utf-8"))
+    resumo.update(pd.util.hash_pandas_object(bruto, index=False).to_numpy().tobytes())
+    return resumo.hexdigest()
@@ -0,0 +1,57 @@
+import os
+
+import pandas as pd
+
+# --- AGREGAÇÃO COM PARCIAIS JUNTÁVEIS ---
+# Cada fatia do DataFrame vira um parcial com somas, contagens, mínimos e máximos
+# por grupo, e no fim juntamos os parciais (soma das somas, mínimo dos mínimos...).
+# A média sai de soma / contagem.
+# O dashboard agrega tudo no próprio processo, com um groupby vetorizado: abrir
+# processos (fork) a partir do servidor do Streamlit, que tem várias threads (o
+# laço do tornado, a atualização em segundo plano), pode travar, e em 1 núcleo
+# mesmo um pool já aberto saiu mais lento (0.2-0.3x com 1M de linhas no
+# benchmarks/bench_paralelo.py: mandar as fatias custa mais que o groupby).
+# Scripts fora do Streamlit podem passar um executor próprio, criado uma vez e
+# reaproveitado: cada tarefa leva a sua fatia dos dados e das chaves, sem estado
+# global entre chamadas.
+
+
+def _parcial(df, chaves, valor):
+    return df.groupby(chaves, observed=True, sort=False)[valor].agg(['sum', 'count', 'min', 'max'])
+
+
+def _fatiar(chaves, inicio, fim):
+    # Chaves podem ser nomes de colunas ou Series alinhadas ao DataFrame (como no groupby)
+    if isinstance(chaves, list):
+        return [_fatiar(chave, inicio, fim) for chave in chaves]
+    return chaves.iloc[inicio:fim] if isinstance(chaves, pd.Series) else chaves
+
+
+def _juntar(parciais, chaves):
+    niveis = list(range(len(chaves))) if isinstance(chaves, list) else 0
+    juntos = pd.concat(parciais).groupby(level=niveis, observed=True)
+    resultado = pd.DataFrame({
+        'sum': juntos['sum'].sum(),
+        'count': juntos['count'].sum(),
+        'min': juntos['min'].min(),
+        'max': juntos['max'].max(),
+    })
+    resultado['mean'] = resultado['sum'] / resultado['count']
+    return resultado
+
+
+def agregar(df, chaves, valor, executor=None, partes=None):
+    """groupby(chaves)[valor] com sum, count, min, max e mean.
+
+    Sem executor (o caso do dashboard), agrega no processo atual. Com um
+    ProcessPoolExecutor, divide df em `partes` fatias (padrão: um por núcleo).
+    """
+    if executor is None or len(df) == 0:
+        return _juntar([_parcial(df, chaves, valor)], chaves)
+
+    partes = partes or os.cpu_count() or 1
+    tamanho = -(-len(df) // partes)
+    fatias = [(inicio, min(inicio + tamanho, len(df))) for inicio in range(0, len(df), tamanho)]
+    parciais = executor.map(_parcial, [df.iloc[i:f] for i, f in fatias],
+                            [_fatiar(chaves, i, f) for i, f in fatias], [valor] * len(fatias))
+    return _juntar(list(parciais), chaves)
@@ -0,0 +1,178 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+import busca
+import moeda
+import normalizacao
+import regras
+
+# --- DETECTOR DE GASTOS RECORRENTES ---
+# A coluna Recorrência é preenchida à mão; aqui procuramos, em todo o histórico,
+# despesas que se repetem: mesmo texto normalizado (descrição + categoria, sem
+# acentos como em busca.py), valor parecido e intervalo regular entre as datas.
+# Nada é comparado par a par:
+#   1. cada despesa recebe o hash do seu texto normalizado (calculado uma vez por
+#      texto distinto);
+#   2. ordenando por (hash, valor), um grupo novo começa quando o texto muda ou o
+#      valor sobe mais de TOLERANCIA_VALOR em relação ao anterior;
+#   3. ordenando por (grupo, data), os intervalos entre lançamentos consecutivos
+#      saem de um np.diff e as estatísticas de cada grupo, de bincount/groupby.
+# Grupos com intervalos regulares viram "Fixos" (valor praticamente constante) ou
+# "Recorrentes"; o resto fica "Não Recorrentes", os mesmos rótulos da planilha.
+TOLERANCIA_VALOR = 0.15
+MIN_OCORRENCIAS = 3
+# Fração mínima dos intervalos do grupo que precisa estar perto da mediana
+MIN_REGULARIDADE = 0.75
+# Folga de cada intervalo em relação à mediana: alguns dias fixos (fim de semana,
+# compensação) mais uma fração do período (meses de 28 a 31 dias, anos bissextos)
+FOLGA_DIAS = 2
+FOLGA_FRACAO = 0.05
+# Diferença máxima entre o maior e o menor valor (relativa ao valor típico) para ser "Fixo"
+VARIACAO_FIXO = 0.02
+PERIODOS = {'Semanal': 7, 'Quinzenal': 14, 'Mensal': 30, 'Bimestral': 61, 'Trimestral': 91,
+            'Semestral': 182, 'Anual': 365}
+# Receitas ficam com o mesmo rótulo que têm na planilha
+ROTULOS = ['Fixos', 'Recorrentes', 'Não Recorrentes', 'Receitas']
+FIXO, RECORRENTE, NAO_RECORRENTE, RECEITA = range(len(ROTULOS))
+COLUNA_SUGESTAO = 'Recorrência Sugerida'
+
+
+def hashes_texto(serie):
+    """Hash do texto normalizado de cada linha (a normalização roda uma vez por texto distinto)."""
+    codigos, distintos = busca.codificar(serie)
+    normalizados = np.array([" ".join(busca.palavras(texto)) for texto in distintos], dtype=object)
+    return pd.util.hash_array(normalizados)[codigos]
+
+
+def folga(dias):
+    return FOLGA_DIAS + FOLGA_FRACAO * dias
+
+
+def detectar(df):
+    """(rótulo sugerido de cada linha de df, como Categorical de ROTULOS, e tabela das séries encontradas)."""
+    codigos = np.full(len(df), RECEITA, dtype=np.int8)
+    valor = df['Centavos'].to_numpy() if 'Centavos' in df.columns else (df['Valor'] * 100).round().to_numpy()
+    is_invest = regras.mascara_investimento(df).to_numpy()
+    # Despesa como em regras.definir_status: aplicação em investimento também é saída
+    linhas = np.flatnonzero(np.where(is_invest, valor > 0, valor < 0))
+    codigos[linhas] = NAO_RECORRENTE
+    if len(linhas) == 0:
+        return pd.Categorical.from_codes(codigos, ROTULOS), pd.DataFrame()
+
+    despesas = df[['Data', 'Categoria', 'Descrição (Opcional)']].iloc[linhas]
+    chave = hashes_texto(despesas['Descrição (Opcional)'])
+    chave = chave ^ (hashes_texto(despesas['Categoria']) * np.uint64(0x9E3779B97F4A7C15))
+    absoluto = np.abs(valor[linhas]).astype(np.int64)
+    dias = despesas['Data'].to_numpy().astype('datetime64[D]').astype(np.int64)
+
+    # Grupos: mesmo texto e valores encadeados a menos de TOLERANCIA_VALOR um do outro
+    ordem = np.lexsort((absoluto, chave))
+    k, v = chave[ordem], absoluto[ordem]
+    inicio_grupo = np.r_[True, (k[1:] != k[:-1]) | (v[1:] > v[:-1] * (1 + TOLERANCIA_VALOR))]
+    grupo = np.empty(len(linhas), dtype=np.int64)
+    grupo[ordem] = np.cumsum(inicio_grupo) - 1
+    grupos = int(grupo.max()) + 1
+    # Com a ordem por (texto, valor), cada grupo é contíguo: menor e maior valor nas pontas
+    primeiros = np.flatnonzero(inicio_grupo)
+    menor = v[primeiros]
+    maior = v[np.r_[primeiros[1:], len(v)] - 1]
+
+    # Intervalos entre lançamentos consecutivos do mesmo grupo
+    ordem = np.lexsort((dias, grupo))
+    g, t = grupo[ordem], dias[ordem]
+    mesmo = g[1:] == g[:-1]
+    g_intervalo, intervalo = g[1:][mesmo], (t[1:] - t[:-1])[mesmo]
+
+    ocorrencias = np.bincount(grupo, minlength=grupos)
+    mediana = pd.Series(intervalo).groupby(g_intervalo).median().reindex(range(grupos)).to_numpy()
+    perto = np.abs(intervalo - mediana[g_intervalo]) <= folga(mediana[g_intervalo])
+    regularidade = (np.bincount(g_intervalo, weights=perto, minlength=grupos)
+                    / np.maximum(np.bincount(g_intervalo, minlength=grupos), 1))
+
+    # A mediana precisa cair perto de um dos períodos conhecidos
+    periodos = np.array(list(PERIODOS.values()))
+    mais_perto = np.abs(np.nan_to_num(mediana)[:, None] - periodos).argmin(axis=1)
+    periodo = periodos[mais_perto]
+    recorrente = ((ocorrencias >= MIN_OCORRENCIAS) & (regularidade >= MIN_REGULARIDADE)
+                  & (np.abs(np.nan_to_num(mediana) - periodo) <= folga(periodo)))
+    tipico = pd.Series(absoluto).groupby(grupo).median().to_numpy()
+    fixo = (maior - menor) <= VARIACAO_FIXO * tipico
+
+    rotulo_grupo = np.where(recorrente, np.where(fixo, FIXO, RECORRENTE), NAO_RECORRENTE).astype(np.int8)
+    codigos[linhas] = rotulo_grupo[grupo]
+
+    # Uma linha por série encontrada, a partir do último lançamento de cada grupo
+    ultimos = ordem[np.r_[~mesmo, True]]
+    ultimos = ultimos[recorrente[grupo[ultimos]]]
+    g_serie = grupo[ultimos]
+    nomes = np.array(list(PERIODOS), dtype=object)
+    ultimo = despesas['Data'].to_numpy()[ultimos]
+    series = pd.DataFrame({
+        'Descrição': despesas['Descrição (Opcional)'].iloc[ultimos].astype(str).to_numpy(),
+        'Categoria': despesas['Categoria'].iloc[ultimos].astype(str).to_numpy(),
+        'Periodicidade': nomes[mais_perto[g_serie]],
+        'Valor Típico': moeda.para_reais(tipico[g_serie]),
+        'Ocorrências': ocorrencias[g_serie],
+        'Último': ultimo,
+        'Próximo Previsto': ultimo + np.round(mediana[g_serie]).astype('timedelta64[D]'),
+        'Sugestão': np.array(ROTULOS, dtype=object)[rotulo_grupo[g_serie]],
+    })
+    return pd.Categorical.from_codes(codigos, ROTULOS), series.sort_values(['Categoria', 'Descrição'], ignore_index=True)
+
+
+class Deteccao:
+    """Rótulos sugeridos e séries encontradas para uma versão do ledger; não muda depois de pronta.
+
+    Quem guarda um recorte de df (ex.: um fragmento que reroda sozinho) guarda também
+    a Deteccao dessa versão, e os índices dos dois continuam batendo mesmo que o
+    detector compartilhado já tenha passado para dados mais novos.
+    """
+
+    def __init__(self, df, versao):
+        self.versao = versao
+        rotulos, self.series = detectar(df)
+        self.rotulos = pd.Series(rotulos, index=df.index, name=COLUNA_SUGESTAO)
+
+        # Totais das despesas por (mês, categoria, sugestão), para o gráfico de cada mês
+        despesa = self.rotulos != 'Receitas'
+        valor = df['Centavos'] if 'Centavos' in df.columns else (df['Valor'] * 100).round().astype('int64')
+        self.tabela = (pd.DataFrame({'Mes_Ano': df['Mes_Ano'], 'Categoria': df['Categoria'],
+                                     'Recorrência': self.rotulos, 'Centavos_Abs': valor.abs()})[despesa]
+                       .groupby(['Mes_Ano', 'Categoria', 'Recorrência'], sort=False, observed=True)
+                       ['Centavos_Abs'].sum())
+
+    def rotulos_de(self, linhas):
+        """Sugestão das linhas (um recorte, pelo índice, do DataFrame desta versão)."""
+        return self.rotulos.loc[linhas.index]
+
+    def gastos_por_sugestao(self, mes, categorias):
+        """Mesmo formato de CuboMensal.gastos_por_recorrencia, com os rótulos sugeridos."""
+        try:
+            tabela = self.tabela.xs(mes, level='Mes_Ano')
+        except KeyError:
+            return pd.DataFrame({'Recorrência': [], 'Valor_Abs': []})
+        tabela = tabela[tabela.index.get_level_values('Categoria').isin(categorias)]
+        return moeda.para_reais(tabela.groupby(level='Recorrência').sum()).rename('Valor_Abs').reset_index()
+
+
+class DetectorRecorrencia:
+    """Guarda a Deteccao da última versão vista, refeita quando os dados mudam.
+
+    A sugestão de uma linha antiga pode mudar com lançamentos novos (uma série só
+    fica regular depois de algumas ocorrências), por isso não há modo incremental.
+    """
+
+    def __init__(self):
+        self.deteccao = None
+        self.trava = threading.Lock()
+
+    def atualizar(self, df):
+        """(Deteccao da versão de df, se ela precisou ser calculada agora)."""
+        versao = df.attrs.get("versao") or normalizacao.versao(df)
+        with self.trava:
+            if self.deteccao is not None and self.deteccao.versao == versao:
+                return self.deteccao, False
+            self.deteccao = Deteccao(df, versao)
+            return self.deteccao, True
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+# --- REGRAS DE CLASSIFICAÇÃO DO LEDGER ---
+# Versões vetorizadas das regras do dashboard: trabalham com a coluna inteira
+# de uma vez, em vez de chamar uma função Python para cada linha com apply.
+
+# Dia de fechamento do cartão: compras até o dia anterior entram na fatura do mês anterior
+DIA_FECHAMENTO = 3
+
+
+def contem(serie, texto):
+    """Equivalente a serie.str.contains(texto, case=False, na=False), mais rápido em colunas categóricas."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        # Testamos só as categorias distintas e espalhamos o resultado pelos códigos
+        categorias = np.asarray(serie.cat.categories.astype(str).str.contains(texto, case=False, regex=False))
+        codigos = serie.cat.codes.to_numpy()
+        return pd.Series(np.where(codigos >= 0, categorias[codigos], False), index=serie.index)
+    return serie.astype(str).str.contains(texto, case=False, na=False, regex=False)
+
+
+def mascara_investimento(df):
+    # Usa a marcação pré-calculada em normalizacao.compactar() quando ela existe
+    if 'is_invest' in df.columns:
+        return df['is_invest']
+    return contem(df['Categoria'], "Investimento")
+
+
+def mascara_cartao(df):
+    if 'is_cartao' in df.columns:
+        return df['is_cartao']
+    return contem(df['Forma de Pagamento'], "Cartão de Crédito")
+
+
+def definir_status(df):
+    """'Receitas' ou 'Despesas' para cada lançamento.
+
+    Investimento com valor negativo é resgate (entra como receita); para as
+    demais categorias, valor positivo é receita.
+    """
+    valor = df['Valor'].to_numpy()
+    is_invest = mascara_investimento(df).to_numpy()
+    is_receita = np.where(is_invest, valor < 0, valor > 0)
+    return pd.Series(np.where(is_receita, 'Receitas', 'Despesas'), index=df.index, name='Status')
+
+
+def mes_fatura(datas, dia_fechamento=DIA_FECHAMENTO):
+    """Mês da fatura de cada compra como inteiro (ano * 12 + mês - 1); dia_fechamento pode variar por linha."""
+    meses = datas.dt.year.to_numpy() * 12 + datas.dt.month.to_numpy() - 1
+    return meses - (datas.dt.day.to_numpy() < dia_fechamento)
+
+
+def rotular_meses(meses):
+    """Texto '%m/%Y' de cada mês inteiro, formatado uma vez por mês distinto."""
+    codigos, distintos = pd.factorize(np.asarray(meses))
+    rotulos = np.array([f"{m % 12 + 1:02d}/{m // 12}" for m in distintos], dtype=object)
+    return rotulos[codigos]
+
+
+def calcular_fatura(datas, dia_fechamento=DIA_FECHAMENTO):
+    """Mês da fatura ('%m/%Y') de cada compra no cartão, pela regra do dia de fechamento."""
+    # Trabalhamos com o mês como um número inteiro (ano * 12 + mês) e só
+    # formatamos o texto uma vez para cada mês distinto.
+    return pd.Series(rotular_meses(mes_fatura(datas, dia_fechamento)), index=datas.index)
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+# --- SALDO CORRIDO (SOMA DE PREFIXOS) ---
+# Guardamos as datas de todos os lançamentos em ordem e, ao lado, a soma corrida
+# dos valores em centavos (inteiros, sem erro de arredondamento). O saldo até
+# qualquer data é uma busca binária nas datas e uma leitura na soma corrida.
+# Lançamentos novos costumam ser os mais recentes: nesse caso a soma só continua
+# de onde parou; se algum for antigo, refazemos a soma a partir dele.
+
+
+class SaldoCorrido:
+    def __init__(self):
+        self.datas = np.array([], dtype='datetime64[ns]')
+        self.valores = np.array([], dtype=np.int64)
+        self.acumulado = np.array([], dtype=np.int64)
+
+    def adicionar(self, datas, centavos):
+        """Inclui lançamentos (datas e valores em centavos) mantendo a ordem por data."""
+        datas = np.asarray(datas, dtype='datetime64[ns]')
+        centavos = np.asarray(centavos, dtype=np.int64)
+        if len(datas) == 0:
+            return
+        ordem = np.argsort(datas, kind='stable')
+        datas, centavos = datas[ordem], centavos[ordem]
+
+        if len(self.datas) == 0 or datas[0] >= self.datas[-1]:
+            # Só lançamentos depois do último: a soma continua do total atual
+            inicio = len(self.datas)
+            self.datas = np.concatenate([self.datas, datas])
+            self.valores = np.concatenate([self.valores, centavos])
+        else:
+            # side='right': um lançamento novo entra depois dos antigos da mesma data
+            posicoes = np.searchsorted(self.datas, datas, side='right')
+            inicio = int(posicoes[0])
+            self.datas = np.insert(self.datas, posicoes, datas)
+            self.valores = np.insert(self.valores, posicoes, centavos)
+
+        anterior = self.acumulado[inicio - 1] if inicio else 0
+        self.acumulado = np.concatenate([self.acumulado[:inicio], anterior + np.cumsum(self.valores[inicio:])])
+
+    def ate(self, data):
+        """Saldo em centavos de todos os lançamentos até a data (inclusive)."""
+        posicao = np.searchsorted(self.datas, np.datetime64(pd.Timestamp(data), 'ns'), side='right')
+        return int(self.acumulado[posicao - 1]) if posicao else 0
+
+    def ate_fim_do_mes(self, mes):
+        """Saldo em centavos até o último instante do mês ('%Y-%m')."""
+        return self.ate(pd.Period(mes, 'M').end_time)
@@ -0,0 +1,145 @@
+import hashlib
+import json
+from pathlib import Path
+
+from gspread.utils import numericise_all, rowcol_to_a1
+
+# --- CONFIGURAÇÃO DA SINCRONIZAÇÃO INCREMENTAL ---
+# A planilha é dividida em blocos de linhas. Para cada bloco guardamos um hash,
+# assim conseguimos perceber quando uma linha antiga foi editada ou apagada.
+TAMANHO_BLOCO = 200
+# Blocos antigos conferidos a cada sincronização (rodízio): uma edição no meio da
+# planilha aparece em até ceil((blocos - 1) / BLOCOS_VERIFICADOS) sincronizações.
+BLOCOS_VERIFICADOS = 4
+# De tempos em tempos fazemos uma recarga completa por segurança.
+RECARGA_COMPLETA_A_CADA = 50
+PASTA_CACHE = Path(__file__).parent / ".cache"
+ARQUIVO_SINCRONIZACAO = PASTA_CACHE / "sincronizacao.json"
+
+
+def hash_bloco(linhas):
+    conteudo = json.dumps(linhas, ensure_ascii=False)
+    return hashlib.sha1(conteudo.encode("utf-8")).hexdigest()
+
+
+def calcular_hashes(linhas):
+    return [hash_bloco(linhas[i:i + TAMANHO_BLOCO]) for i in range(0, len(linhas), TAMANHO_BLOCO)]
+
+
+def carregar_estado(caminho=ARQUIVO_SINCRONIZACAO):
+    try:
+        with open(caminho, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+
+def salvar_estado(estado, caminho=ARQUIVO_SINCRONIZACAO):
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    temporario = caminho.with_suffix(".tmp")
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(estado, arquivo, ensure_ascii=False)
+    # Troca atômica: quem estiver lendo nunca vê um arquivo pela metade
+    temporario.replace(caminho)
+
+
+def recarga_completa(sheet):
+    valores = sheet.get_values()
+    if not valores:
+        return {"cabecalho": [], "linhas": [], "hashes": [], "sincronizacoes": 0, "bloco_verificado": 0}
+
+    cabecalho = valores[0]
+    linhas = completar_linhas(valores[1:], len(cabecalho))
+    return {
+        "cabecalho": cabecalho,
+        "linhas": linhas,
+        "hashes": calcular_hashes(linhas),
+        "sincronizacoes": 0,
+        "bloco_verificado": 0,
+    }
+
+
+def intervalo(linha_inicial, largura, quantidade=None):
+    # linha_inicial é o índice (0-based) da linha de dados; +2 pula o cabeçalho
+    inicio = rowcol_to_a1(linha_inicial + 2, 1)
+    if quantidade is None:
+        # Intervalo aberto ("A10:G") lê até a última linha preenchida
+        fim = rowcol_to_a1(1, largura).rstrip("0123456789")
+    else:
+        fim = rowcol_to_a1(linha_inicial + quantidade + 1, largura)
+    return f"{inicio}:{fim}"
+
+
+def sem_vazias_no_fim(linha):
+    # A API corta as células vazias do fim; o get_values() completa com "" até a maior largura
+    linha = list(linha)
+    while linha and linha[-1] == "":
+        linha.pop()
+    return linha
+
+
+def completar_linhas(linhas, largura):
+    # A API corta as células vazias do fim da linha, então completamos com ""
+    return [(linha + [""] * largura)[:largura] for linha in linhas]
+
+
+def _recarregar(sheet, caminho):
+    estado = recarga_completa(sheet)
+    salvar_estado(estado, caminho)
+    return estado["cabecalho"], estado["linhas"], "completa"
+
+
+def sincronizar(sheet, caminho=ARQUIVO_SINCRONIZACAO):
+    """Devolve (cabecalho, linhas, modo) lendo da planilha só o que mudou desde a última vez."""
+    estado = carregar_estado(caminho)
+
+    if not estado or not estado["cabecalho"] or estado["sincronizacoes"] >= RECARGA_COMPLETA_A_CADA:
+        return _recarregar(sheet, caminho)
+
+    largura = len(estado["cabecalho"])
+    linhas = estado["linhas"]
+    hashes = estado["hashes"]
+
+    # Relemos o último bloco conhecido junto com as linhas novas. Se alguma linha foi
+    # apagada no meio, o último bloco "anda" e o hash deixa de bater.
+    ultimo_bloco = max(len(hashes) - 1, 0)
+    inicio = ultimo_bloco * TAMANHO_BLOCO
+    # Conferimos também alguns blocos antigos (rodízio), para pegar edições feitas em
+    # linhas que não estão no fim da planilha
+    antigos = len(hashes) - 1
+    verificar = sorted({(estado["bloco_verificado"] + i) % antigos for i in range(min(BLOCOS_VERIFICADOS, antigos))}
+                       if antigos > 0 else set())
+
+    # Tudo em uma única chamada: cabeçalho, fim da planilha e blocos conferidos
+    intervalos = ["1:1", intervalo(inicio, largura)]
+    intervalos += [intervalo(bloco * TAMANHO_BLOCO, largura, TAMANHO_BLOCO) for bloco in verificar]
+    cabecalho, novas, *blocos = sheet.batch_get(intervalos)
+
+    # Cabeçalho diferente (coluna nova, renomeada ou trocada de lugar): a largura e o
+    # significado das colunas mudaram, só uma recarga completa resolve
+    cabecalho = cabecalho[0] if cabecalho else []
+    if sem_vazias_no_fim(cabecalho) != sem_vazias_no_fim(estado["cabecalho"]):
+        return _recarregar(sheet, caminho)
+
+    novas = completar_linhas(novas, largura)
+    if hashes and hash_bloco(novas[:len(linhas) - inicio]) != hashes[-1]:
+        return _recarregar(sheet, caminho)
+
+    for bloco, valores in zip(verificar, blocos):
+        if hash_bloco(completar_linhas(valores, largura)) != hashes[bloco]:
+            return _recarregar(sheet, caminho)
+    if verificar:
+        estado["bloco_verificado"] = (estado["bloco_verificado"] + len(verificar)) % antigos
+
+    linhas = linhas[:inicio] + novas
+    estado["linhas"] = linhas
+    estado["hashes"] = hashes[:ultimo_bloco] + calcular_hashes(linhas[inicio:])
+    estado["sincronizacoes"] += 1
+    salvar_estado(estado, caminho)
+    return estado["cabecalho"], linhas, "incremental"
+
+
+def para_registros(cabecalho, linhas):
+    # Mesmo formato de sheet.get_all_records(): lista de dicionários com números convertidos
+    return [dict(zip(cabecalho, numericise_all(linha, default_blank=""))) for linha in linhas]
@@ -0,0 +1,68 @@
+import json
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# --- SNAPSHOT LOCAL DO LEDGER ---
+# Guardamos o DataFrame já normalizado em Parquet. Na inicialização ele é lido
+# direto do disco (memory-map), sem rede e sem refazer a limpeza de Valor/Data.
+# Sempre que o formato das colunas mudar, aumente VERSAO_SNAPSHOT: os arquivos
+# antigos passam a ser ignorados e um novo snapshot é gerado a partir da planilha.
+VERSAO_SNAPSHOT = 3
+PASTA_CACHE = Path(__file__).parent / ".cache"
+
+
+def caminhos(nome):
+    # Cada fonte de dados (planilha, CSV, SQLite...) tem o seu próprio snapshot
+    return PASTA_CACHE / f"ledger-{nome}.parquet", PASTA_CACHE / f"ledger-{nome}.json"
+
+
+def salvar(df, nome="planilha"):
+    caminho, metadados = caminhos(nome)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+
+    temporario = caminho.with_suffix(".tmp")
+    df.to_parquet(temporario, index=False)
+    temporario.replace(caminho)
+
+    info = {
+        "versao": VERSAO_SNAPSHOT,
+        "linhas": len(df),
+        "colunas": {coluna: str(tipo) for coluna, tipo in df.dtypes.items()},
+        # Quando os dados foram lidos da fonte, e a versão dos dados crus (ver normalizacao.versao_fonte)
+        "salvo_em": df.attrs.get("lido_em", time.time()),
+        "versao_fonte": df.attrs.get("versao_fonte"),
+    }
+    with open(metadados, "w", encoding="utf-8") as arquivo:
+        json.dump(info, arquivo, ensure_ascii=False)
+
+
+def carregar(nome="planilha"):
+    """Devolve o snapshot salvo ou None se ele não existir ou for de outra versão.
+
+    df.attrs["lido_em"] guarda quando os dados foram lidos da fonte (snapshots
+    antigos, sem esse registro, usam a data do arquivo).
+    """
+    caminho, metadados = caminhos(nome)
+    try:
+        with open(metadados, encoding="utf-8") as arquivo:
+            info = json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+    if info.get("versao") != VERSAO_SNAPSHOT:
+        return None
+
+    try:
+        df = pd.read_parquet(caminho, memory_map=True)
+    except Exception:
+        return None
+
+    # Confere se o arquivo bate com o que foi registrado nos metadados
+    colunas = {coluna: str(tipo) for coluna, tipo in df.dtypes.items()}
+    if colunas != info.get("colunas") or len(df) != info.get("linhas"):
+        return None
+    df.attrs["lido_em"] = info.get("salvo_em") or caminho.stat().st_mtime
+    df.attrs["versao_fonte"] = info.get("versao_fonte")
+    return df
@@ -0,0 +1,77 @@
+import numpy as np
+import streamlit as st
+
+# --- ESTILO DAS TABELAS DO DASHBOARD ---
+# Funções que montam os Styler das tabelas, separadas do app.py para que o
+# benchmark (benchmarks/bench_dashboard.py) meça exatamente o mesmo trabalho.
+# As listas longas são paginadas: só as linhas da página atual são formatadas,
+# estilizadas e enviadas ao navegador, então o custo não cresce com o mês.
+TAMANHO_PAGINA = 50
+
+
+def color_valor_custom(val):
+    color = '#2ecc71' if val > 0 else '#e74c3c'
+    return f'color: {color}; font-weight: bold'
+
+
+def highlight_total(row):
+    return ['background-color: #990000; color: white; font-weight: bold' if row.Categoria == 'TOTAL' else ''
+            for _ in row]
+
+
+def estilo_lancamentos(df):
+    """Valores em verde/vermelho e formatados como R$."""
+    return (
+        df.style
+        .map(color_valor_custom, subset=['Valor'])
+        .format({"Valor": "R$ {:,.2f}"})
+    )
+
+
+def estilo_resumo(df):
+    """Resumo por categoria com a linha TOTAL destacada."""
+    return (
+        df.style
+        .apply(highlight_total, axis=1)
+        .format({"Valor": "R$ {:,.2f}"})
+    )
+
+
+# --- PAGINAÇÃO ---
+# O A04 da Imersão tem uma cópia proposital destas funções (paginacao.py), pois os
+# dois projetos não compartilham código; correções aqui valem para lá também.
+def janela(total, pagina, tamanho=TAMANHO_PAGINA):
+    """(início, fim, quantidade de páginas) da página pedida, que começa em 1 e é limitada ao total."""
+    paginas = max(-(-total // tamanho), 1)
+    pagina = min(max(int(pagina), 1), paginas)
+    inicio = (pagina - 1) * tamanho
+    return inicio, min(inicio + tamanho, total), paginas
+
+
+def pagina(df, posicoes, numero, tamanho=TAMANHO_PAGINA):
+    """Linhas da página `numero`, na ordem dada por posicoes (posições de df, já ordenadas)."""
+    inicio, fim, _ = janela(len(posicoes), numero, tamanho)
+    return df.iloc[posicoes[inicio:fim]]
+
+
+def preparar_lancamentos(df, colunas=None):
+    """Formata a data e aplica o estilo de valores só nas linhas recebidas (a página atual)."""
+    df = df[colunas] if colunas else df.copy()
+    df['Data'] = df['Data'].dt.strftime('%d/%m/%Y')
+    return estilo_lancamentos(df)
+
+
+def mostrar_paginada(df, chave, preparar, posicoes=None, tamanho=TAMANHO_PAGINA):
+    """st.dataframe com uma página de df por vez; preparar(página) devolve o que será exibido."""
+    posicoes = np.arange(len(df)) if posicoes is None else posicoes
+    total = len(posicoes)
+    _, _, paginas = janela(total, 1, tamanho)
+    numero = 1
+    if paginas > 1:
+        # Se o recorte diminuiu (outro mês, outro filtro), a página guardada pode não existir mais
+        if st.session_state.get(chave, 1) > paginas:
+            st.session_state[chave] = paginas
+        numero = st.number_input(f"Página (de {paginas})", min_value=1, max_value=paginas, step=1, key=chave)
+    inicio, fim, _ = janela(total, numero, tamanho)
+    st.dataframe(preparar(pagina(df, posicoes, numero, tamanho)), use_container_width=True, hide_index=True)
+    st.caption(f"Linhas {inicio + 1 if total else 0}–{fim} de {total:,}")
@@ -0,0 +1,116 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+import pytest
+
+import busca
+
+LANCAMENTOS = [
+    # (data, categoria, descrição)
+    ('2025-01-05', 'Saúde', 'Farmácia São João'),
+    ('2025-01-06', 'Alimentação', 'Mercado Extra'),
+    ('2025-01-07', 'Alimentação', 'Mercado Pão de Açúcar'),
+    ('2025-01-08', 'Saúde', 'Farmácia Drogasil'),
+    ('2025-01-09', 'Transporte', 'Uber'),
+    ('2025-01-10', 'Alimentação', 'Mercado Extra'),
+    ('2025-01-11', 'Lazer', 'abaxbab'),
+    ('2025-01-12', 'Alimentação', None),
+]
+
+
+def ledger(lancamentos=LANCAMENTOS, categorias=False):
+    df = pd.DataFrame({
+        'Data': pd.to_datetime([data for data, _, _ in lancamentos]),
+        'Categoria': [categoria for _, categoria, _ in lancamentos],
+        'Valor': [-1000 * (i + 1) for i in range(len(lancamentos))],
+        'Forma de Pagamento': 'Pix',
+        'Descrição (Opcional)': pd.Series([descricao for _, _, descricao in lancamentos], dtype=object),
+    })
+    if categorias:
+        df[busca.COLUNAS_BUSCA] = df[busca.COLUNAS_BUSCA].astype('category')
+    return df
+
+
+def descricoes(indice, texto):
+    linhas, posicoes = indice.buscar(texto)
+    return linhas['Descrição (Opcional)'].iloc[posicoes].tolist()
+
+
+@pytest.fixture(params=[False, True], ids=["texto", "categorias"])
+def indice(request):
+    indice = busca.IndiceBusca()
+    assert indice.atualizar(ledger(categorias=request.param)) == "completa"
+    return indice
+
+
+def test_sem_acento_e_sem_maiusculas(indice):
+    assert descricoes(indice, "FARMACIA") == ['Farmácia Drogasil', 'Farmácia São João']
+    assert descricoes(indice, "acucar") == ['Mercado Pão de Açúcar']
+
+
+def test_prefixo(indice):
+    assert descricoes(indice, "merc") == ['Mercado Extra', 'Mercado Pão de Açúcar', 'Mercado Extra']
+    assert descricoes(indice, "me") == descricoes(indice, "merc")
+
+
+def test_todas_as_palavras_precisam_casar(indice):
+    assert descricoes(indice, "mercado extra") == ['Mercado Extra', 'Mercado Extra']
+    assert descricoes(indice, "extra mercado") == ['Mercado Extra', 'Mercado Extra']
+    assert descricoes(indice, "farm joao") == ['Farmácia São João']
+    assert descricoes(indice, "mercado uber") == []
+
+
+def test_palavras_da_categoria(indice):
+    assert descricoes(indice, "saude drogasil") == ['Farmácia Drogasil']
+    # A linha sem descrição também é encontrada pela categoria
+    assert len(indice.buscar("alimentacao")[1]) == 4
+
+
+def test_trigramas_em_comum_sem_o_prefixo(indice):
+    # "abab" tem os mesmos trigramas que "abaxbab", mas não é o começo da palavra
+    assert descricoes(indice, "abab") == []
+    assert descricoes(indice, "abax") == ['abaxbab']
+
+
+def test_sem_resultado_e_busca_vazia(indice):
+    assert descricoes(indice, "padaria") == []
+    assert descricoes(indice, "xtra") == []
+    assert descricoes(indice, "") == []
+    assert descricoes(indice, "  !! ") == []
+
+
+def test_mais_recentes_primeiro(indice):
+    linhas, posicoes = indice.buscar("mercado")
+    assert linhas['Data'].iloc[posicoes].is_monotonic_decreasing
+
+
+def test_atualizacao_incremental_e_completa():
+    indice = busca.IndiceBusca()
+    df = ledger(LANCAMENTOS[:4])
+    indice.atualizar(df)
+    assert indice.atualizar(df) == "atual"
+
+    assert indice.atualizar(ledger(LANCAMENTOS)) == "incremental"
+    assert descricoes(indice, "mercado extra") == ['Mercado Extra', 'Mercado Extra']
+    assert descricoes(indice, "uber") == ['Uber']
+
+    # Linha antiga editada: o índice é refeito
+    editado = ledger([LANCAMENTOS[0][:2] + ('Farmácia Pague Menos',)] + LANCAMENTOS[1:])
+    assert indice.atualizar(editado) == "completa"
+    assert descricoes(indice, "farmacia") == ['Farmácia Drogasil', 'Farmácia Pague Menos']
+
+
+def test_resultado_anterior_nao_muda_com_a_atualizacao():
+    indice = busca.IndiceBusca()
+    indice.atualizar(ledger(LANCAMENTOS[:4]))
+    linhas, posicoes = indice.buscar("farmacia")
+    indice.atualizar(ledger(LANCAMENTOS))
+    assert linhas['Descrição (Opcional)'].iloc[posicoes].tolist() == ['Farmácia Drogasil', 'Farmácia São João']
+
+
+def test_indice_vazio():
+    linhas, posicoes = busca.IndiceBusca().buscar("mercado")
+    assert linhas is None and len(posicoes) == 0
@@ -0,0 +1,102 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import cubo
+import gerador
+import normalizacao
+import regras
+
+
+@pytest.fixture(scope="module")
+def ledger():
+    return normalizacao.normalizar(gerador.gerar_lancamentos(3000))
+
+
+def totais_diretos(df, mes, categorias):
+    recorte = df[(df['Mes_Ano'] == mes) & df['Categoria'].isin(categorias)]
+    status = regras.definir_status(recorte)
+    centavos = recorte['Centavos'].abs()
+    return centavos[status == 'Receitas'].sum() / 100, centavos[status == 'Despesas'].sum() / 100
+
+
+def test_consultas_batem_com_o_dataframe(ledger):
+    mensal = cubo.CuboMensal()
+    assert mensal.atualizar(ledger) == "completa"
+    categorias = ledger['Categoria'].cat.categories.tolist()
+
+    for mes in ['2020-01', '2022-07', '2024-12']:
+        assert mensal.totais_mes(mes, categorias) == totais_diretos(ledger, mes, categorias)
+        assert mensal.totais_mes(mes, categorias[:3]) == totais_diretos(ledger, mes, categorias[:3])
+        ate_o_mes = ledger[ledger['Mes_Ano'].astype(str) <= mes]
+        assert mensal.saldo_acumulado(mes) == ate_o_mes['Centavos_Saldo'].sum() / 100
+
+    investimentos = ledger[regras.mascara_investimento(ledger)]
+    assert mensal.total_investido() == investimentos['Centavos'].sum() / 100
+
+
+def test_gastos_por_categoria(ledger):
+    mensal = cubo.CuboMensal()
+    mensal.atualizar(ledger)
+    categorias = ledger['Categoria'].cat.categories.tolist()
+    recorte = ledger[ledger['Mes_Ano'] == '2023-03']
+    despesas = recorte[regras.definir_status(recorte) == 'Despesas']
+    esperado = (despesas.groupby('Categoria', observed=True)['Centavos'].sum().abs() / 100).sort_values(ascending=False)
+
+    resumo = mensal.gastos_por_categoria('2023-03', categorias)
+    assert resumo['Valor'].tolist() == esperado.tolist()
+    assert resumo['Categoria'].tolist() == esperado.index.astype(str).tolist()
+
+
+def test_mes_sem_lancamentos(ledger):
+    mensal = cubo.CuboMensal()
+    mensal.atualizar(ledger)
+    categorias = ledger['Categoria'].cat.categories.tolist()
+    assert mensal.totais_mes('1999-01', categorias) == (0, 0)
+    assert not mensal.tem_despesas('1999-01', categorias)
+    assert mensal.gastos_por_categoria('1999-01', categorias).empty
+
+
+def test_incremental_igual_a_completa(ledger):
+    completo = cubo.CuboMensal()
+    completo.atualizar(ledger)
+
+    incremental = cubo.CuboMensal()
+    incremental.atualizar(ledger.iloc[:2000])
+    assert incremental.atualizar(ledger) == "incremental"
+    assert incremental.atualizar(ledger) == "atual"
+
+    pd.testing.assert_frame_equal(incremental.tabela.sort_index(), completo.tabela.sort_index())
+    pd.testing.assert_series_equal(incremental.soma_faturas.sort_index(), completo.soma_faturas.sort_index())
+    assert np.array_equal(incremental.saldo.acumulado, completo.saldo.acumulado)
+    assert incremental.investido == completo.investido
+
+
+def test_linha_antiga_editada_refaz_o_cubo(ledger):
+    mensal = cubo.CuboMensal()
+    mensal.atualizar(ledger)
+    # A versão vem das colunas da planilha (Valor), não das derivadas (Centavos)
+    editado = ledger.copy()
+    editado.loc[0, 'Valor'] += 1
+    editado.loc[0, 'Centavos'] += 100
+    editado.loc[0, 'Centavos_Saldo'] += 100
+    assert mensal.atualizar(editado) == "completa"
+    assert mensal.saldo.ate(editado['Data'].max()) == int(editado['Centavos_Saldo'].sum())
+
+
+def test_faturas_somam_as_compras_no_cartao(ledger):
+    mensal = cubo.CuboMensal()
+    mensal.atualizar(ledger)
+    cartao = ledger[regras.mascara_cartao(ledger)]
+    # Cada compra é dividida em parcelas exatas: o total das faturas é o total das compras
+    assert mensal.faturas(hoje='2025-01-15')['Centavos'].sum() == cartao['Centavos'].sum()
+
+    fatura = mensal.faturas(hoje='2025-01-15').iloc[5]
+    lancamentos = mensal.lancamentos_fatura(fatura['Mes_Fatura'])
+    assert (regras.rotular_meses(lancamentos['Mes_Fatura']) == fatura['Mes_Fatura']).all()
+    assert lancamentos['Centavos'].sum() == fatura['Centavos']
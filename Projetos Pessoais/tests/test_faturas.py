@@ -0,0 +1,103 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import faturas
+
+
+def mes(ano, numero):
+    return ano * 12 + numero - 1
+
+
+def compras(datas, parcelas, formas=None, indice=None):
+    return pd.DataFrame({
+        'Data': pd.to_datetime(datas),
+        'Forma de Pagamento': formas or ['Cartão de Crédito'] * len(datas),
+        'Parcelas': parcelas,
+    }, index=indice)
+
+
+@pytest.mark.parametrize("total, parcelas", [
+    (-1000, 3), (1000, 3), (-100, 7), (-1, 2), (-99999, 12), (0, 4), (-600, 3),
+])
+def test_parcelas_somam_o_total_e_o_resto_fica_na_primeira(total, parcelas):
+    expandido = faturas.expandir(compras(['2025-01-05'], [str(parcelas)]), [total])
+    valores = expandido['Centavos'].tolist()
+    assert len(valores) == parcelas
+    assert sum(valores) == total
+    base = int(np.sign(total)) * (abs(total) // parcelas)
+    assert valores[1:] == [base] * (parcelas - 1)
+    assert valores[0] == base + int(np.sign(total)) * (abs(total) % parcelas)
+
+
+def test_parcelas_em_faturas_seguidas():
+    expandido = faturas.expandir(compras(['2025-11-20'], ['3x'], indice=[42]), [-900])
+    assert expandido['Linha'].tolist() == [42, 42, 42]
+    assert expandido['Mes_Fatura'].tolist() == [mes(2025, 11), mes(2025, 12), mes(2026, 1)]
+    assert expandido['Parcela'].astype(str).tolist() == ['1/3', '2/3', '3/3']
+
+
+def test_dia_de_fechamento():
+    # Antes do fechamento (dia 3) a compra cai na fatura do mês anterior
+    expandido = faturas.expandir(compras(['2025-03-02', '2025-03-03'], ['1', '1']), [-100, -100])
+    assert expandido['Mes_Fatura'].tolist() == [mes(2025, 2), mes(2025, 3)]
+
+
+def test_fechamento_por_cartao():
+    cartoes = {"Visa": {"fechamento": 20, "vencimento": 5}}
+    cartao = compras(['2025-03-10', '2025-03-10'], ['1', '1'], formas=['Visa', 'Cartão de Crédito'])
+    expandido = faturas.expandir(cartao, [-100, -100], cartoes)
+    assert expandido['Mes_Fatura'].tolist() == [mes(2025, 2), mes(2025, 3)]
+    assert expandido['Cartao'].astype(str).tolist() == ['Visa', 'Cartão de Crédito']
+
+
+def test_parcela_ja_lancada_entra_so_na_fatura_da_data():
+    expandido = faturas.expandir(compras(['2025-03-10'], ['2/10']), [-300])
+    assert expandido['Centavos'].tolist() == [-300]
+    assert expandido['Mes_Fatura'].tolist() == [mes(2025, 3)]
+    assert expandido['Parcela'].astype(str).tolist() == ['2/10']
+
+
+@pytest.mark.parametrize("parcelas", ['', 'abc', None, '0', '1'])
+def test_parcelas_vazias_ou_invalidas_sao_a_vista(parcelas):
+    expandido = faturas.expandir(compras(['2025-03-10'], [parcelas]), [-300])
+    assert expandido['Centavos'].tolist() == [-300]
+    assert expandido['Parcela'].astype(str).tolist() == ['1/1']
+
+
+def test_sem_coluna_de_parcelas():
+    cartao = compras(['2025-03-10', '2025-04-10'], ['5', '5']).drop(columns='Parcelas')
+    assert faturas.expandir(cartao, [-100, -200])['Centavos'].tolist() == [-100, -200]
+
+
+def test_limite_de_parcelas():
+    assert len(faturas.expandir(compras(['2025-03-10'], ['500']), [-50000])) == faturas.MAX_PARCELAS
+
+
+def test_parcelas_numericas():
+    quantidade, primeira, total = faturas.ler_parcelas(pd.Series([2.0, np.nan, 0, 100]))
+    assert quantidade.tolist() == [2, 1, 1, faturas.MAX_PARCELAS]
+    assert primeira.tolist() == [1, 1, 1, 1]
+    assert total.tolist() == quantidade.tolist()
+
+
+def test_tabela_de_faturas():
+    expandido = faturas.expandir(compras(['2025-01-05', '2025-01-02'], ['3', '1']), [-1000, -500])
+    soma = expandido.groupby(['Cartao', 'Mes_Fatura'], observed=True)['Centavos'].sum()
+    tabela = faturas.tabela_faturas(soma, hoje='2025-02-15')
+
+    assert tabela['Mes_Fatura'].tolist() == ['12/2024', '01/2025', '02/2025', '03/2025']
+    assert tabela['Centavos'].tolist() == [-500, -334, -333, -333]
+    assert tabela['Valor'].tolist() == [5.0, 3.34, 3.33, 3.33]
+    assert tabela['Situação'].tolist() == ['Fechada', 'Fechada', 'Em aberto', 'Futura']
+    # A fatura de janeiro fecha em fevereiro e vence no dia 10 de fevereiro
+    assert tabela['Vencimento'][1] == pd.Timestamp('2025-02-10')
+
+
+def test_mes_do_rotulo():
+    assert faturas.mes_do_rotulo('11/2024') == mes(2024, 11)
@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import filtros
+import gerador
+import normalizacao
+
+
+@pytest.fixture(scope="module")
+def ledger():
+    return normalizacao.normalizar(gerador.gerar_lancamentos(3000))
+
+
+def test_cache_lru():
+    cache = filtros.CacheLRU(capacidade=2)
+    calculos = []
+
+    def calcular(chave):
+        return lambda: calculos.append(chave) or chave * 10
+
+    assert cache.obter(1, calcular(1)) == 10
+    assert cache.obter(2, calcular(2)) == 20
+    assert cache.obter(1, calcular(1)) == 10
+    # 2 foi usada há mais tempo que 1: sai quando 3 entra
+    cache.obter(3, calcular(3))
+    assert list(cache.itens) == [1, 3]
+    cache.obter(2, calcular(2))
+    assert calculos == [1, 2, 3, 2]
+    assert (cache.acertos, cache.falhas) == (1, 4)
+
+
+def test_chave_nao_depende_da_ordem_das_categorias():
+    assert (filtros.chave_filtros("v1", "2024", "2024-05", ["b", "a"], 1)
+            == filtros.chave_filtros("v1", "2024", "2024-05", ["a", "b"], True))
+    assert filtros.chave_filtros("v1", "2024", "2024-05", ["a"], False) != filtros.chave_filtros(
+        "v2", "2024", "2024-05", ["a"], False)
+
+
+@pytest.mark.parametrize("coluna, valor", [('Mes_Ano', '2022-07'), ('Ano', '2020'), ('Mes_Ano', '1999-01'),
+                                           ('Categoria', 'Moradia')])
+def test_fatia_igual_a_mascara(ledger, coluna, valor):
+    pd.testing.assert_frame_equal(filtros.fatia(ledger, coluna, valor), ledger[ledger[coluna] == valor])
+
+
+def test_fatia_contigua_nao_copia(ledger):
+    fatia = filtros.fatia(ledger, 'Mes_Ano', '2022-07')
+    assert np.shares_memory(fatia['Centavos'].to_numpy(), ledger['Centavos'].to_numpy())
+
+
+def test_fatia_fora_de_ordem(ledger):
+    embaralhado = ledger.sample(frac=1, random_state=1)
+    pd.testing.assert_frame_equal(filtros.fatia(embaralhado, 'Mes_Ano', '2022-07'),
+                                  embaralhado[embaralhado['Mes_Ano'] == '2022-07'])
+
+
+def test_das_categorias(ledger):
+    todas = ledger['Categoria'].cat.categories.tolist()
+    assert filtros.das_categorias(ledger, todas) is ledger
+    algumas = todas[:2]
+    pd.testing.assert_frame_equal(filtros.das_categorias(ledger, algumas), ledger[ledger['Categoria'].isin(algumas)])
+
+
+@pytest.mark.parametrize("ver_tudo", [False, True])
+def test_recortar(ledger, ver_tudo):
+    categorias = ['Alimentação', 'Investimento - Ações', 'Moradia', 'Salário']
+    recorte = filtros.recortar(ledger, '2022', '2022-07', categorias, ver_tudo)
+
+    df_mes = ledger[(ledger['Mes_Ano'] == '2022-07') & ledger['Categoria'].isin(categorias)]
+    pd.testing.assert_frame_equal(recorte["df_mes"], df_mes)
+    assert recorte["df_mes"]['Data'].iloc[recorte["ordem_mes"]].is_monotonic_increasing
+
+    if ver_tudo:
+        do_ano = ledger[ledger['Ano'] == '2022']
+        pd.testing.assert_frame_equal(recorte["df_para_evolucao"], do_ano[do_ano['Categoria'].isin(categorias)])
+        pd.testing.assert_frame_equal(recorte["df_invest"], do_ano[do_ano['is_invest']])
+    else:
+        pd.testing.assert_frame_equal(recorte["df_para_evolucao"], df_mes)
+        pd.testing.assert_frame_equal(recorte["df_invest"], df_mes[df_mes['is_invest']])
+    assert len(recorte["status_evolucao"]) == len(recorte["df_para_evolucao"])
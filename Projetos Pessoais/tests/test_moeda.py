@@ -0,0 +1,90 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import moeda
+
+
+def converter(*valores, dtype=object):
+    centavos, invalidos = moeda.converter_brl(pd.Series(list(valores), dtype=dtype))
+    return centavos.tolist(), invalidos.tolist()
+
+
+@pytest.mark.parametrize("texto, centavos", [
+    ("R$ 1.234,56", 123456),
+    ("R$1.234.567,89", 123456789),
+    ("-R$ 5,00", -500),
+    ("R$ -5,00", -500),
+    ("(12,30)", -1230),
+    ("(R$ 12,30)", -1230),
+    ("1 000,00", 100000),
+    ("1 000,00", 100000),
+    ("R$ 5,", 500),
+    ("R$ 5,5", 550),
+    (",50", 50),
+    ("1.234", 123400),
+    ("0,00", 0),
+    ("9" * moeda.MAX_DIGITOS, int("9" * moeda.MAX_DIGITOS) * 100),
+])
+def test_textos_validos(texto, centavos):
+    assert converter(texto) == ([centavos], [False])
+
+
+@pytest.mark.parametrize("texto", [
+    "12.5",           # ponto só separa milhares
+    "1.23,45",
+    "5,123",          # no máximo 2 casas
+    "$5",
+    "5R$",
+    "(-5)",
+    "--5",
+    "(5",
+    "5)",
+    "",
+    "R$",
+    "abc",
+    "9" * (moeda.MAX_DIGITOS + 1),
+])
+def test_textos_invalidos_viram_zero_e_sao_apontados(texto):
+    assert converter(texto) == ([0], [True])
+
+
+def test_ausentes_sao_invalidos():
+    assert converter("R$ 1,00", None, np.nan) == ([100, 0, 0], [False, True, True])
+    assert converter(None, None) == ([0, 0], [True, True])
+
+
+def test_textos_repetidos_e_coluna_str():
+    valores = ["R$ 39,90", "-R$ 1.500,00", "R$ 39,90", "xx", "-R$ 1.500,00"] * 3
+    esperado = ([3990, -150000, 3990, 0, -150000] * 3, [False, False, False, True, False] * 3)
+    assert converter(*valores) == esperado
+    assert converter(*valores, dtype="str") == esperado
+
+
+def test_colunas_numericas():
+    assert converter(10, 2.5, -0.1, dtype=float) == ([1000, 250, -10], [False, False, False])
+    assert converter(1.5, np.inf, np.nan, dtype=float) == ([150, 0, 0], [False, True, True])
+
+
+def test_coluna_misturada():
+    # A API da planilha devolve números como números e o resto como texto
+    assert converter(10, "R$ 2,50", 1.25, "x", True) == ([1000, 250, 125, 0, 0], [False, False, False, True, True])
+
+
+def test_coluna_booleana_e_invalida():
+    assert converter(True, False, dtype=bool) == ([0, 0], [True, True])
+
+
+def test_coluna_vazia():
+    assert converter() == ([], [])
+    assert converter(dtype="str") == ([], [])
+
+
+def test_para_reais():
+    assert moeda.para_reais(np.array([123456, -5]))[0] == 1234.56
+    assert moeda.para_reais(-5) == -0.05
@@ -0,0 +1,118 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import normalizacao
+import recorrencia
+
+
+def lancamento(data, valor, categoria, descricao):
+    sinal = "-" if valor < 0 else ""
+    return {'Data': data.strftime('%d/%m/%Y'), 'Valor': f"{sinal}R$ {abs(valor):.2f}".replace('.', ','),
+            'Categoria': categoria, 'Forma de Pagamento': 'Pix', 'Parcelas': '1',
+            'Recorrência': 'Não Recorrentes', 'Descrição (Opcional)': descricao}
+
+
+def ledger(extras=()):
+    rng = np.random.default_rng(3)
+    linhas = []
+    for i in range(12):
+        mes = pd.Timestamp('2024-01-05') + pd.DateOffset(months=i)
+        linhas.append(lancamento(mes, -39.90, 'Assinaturas', 'Netflix'))
+        # Acento e maiúsculas diferentes são o mesmo texto
+        linhas.append(lancamento(mes + pd.Timedelta(days=5), -180 * rng.uniform(0.9, 1.1), 'Moradia',
+                                 'Conta de Luz' if i % 2 else 'conta de luz'))
+        linhas.append(lancamento(mes, 5000, 'Salário', 'Salário'))
+    for i in range(30):
+        linhas.append(lancamento(pd.Timestamp('2024-01-03') + pd.Timedelta(days=7 * i + int(rng.integers(-1, 2))),
+                                 -25, 'Saúde', 'Academia'))
+    for dia in rng.integers(0, 360, 8):
+        linhas.append(lancamento(pd.Timestamp('2024-01-01') + pd.Timedelta(days=int(dia)), -50, 'Lazer', 'Cinema'))
+    for dia in [10, 17, 90, 200]:
+        # Mesmo texto da assinatura, com valor bem diferente e datas soltas: outro grupo, não recorrente
+        linhas.append(lancamento(pd.Timestamp('2024-01-01') + pd.Timedelta(days=dia), -400, 'Assinaturas', 'Netflix'))
+    linhas += list(extras)
+    return normalizacao.normalizar(pd.DataFrame(linhas))
+
+
+@pytest.fixture(scope="module")
+def detectado():
+    df = ledger()
+    rotulos, series = recorrencia.detectar(df)
+    return df, pd.Series(rotulos, index=df.index), series
+
+
+def sugestoes(detectado, descricao):
+    df, rotulos, _ = detectado
+    textos = df['Descrição (Opcional)'].astype(str).str.lower()
+    return set(rotulos[textos == descricao.lower()])
+
+
+def test_series_encontradas(detectado):
+    _, _, series = detectado
+    encontradas = {linha['Descrição'].lower(): (linha['Periodicidade'], linha['Sugestão'])
+                   for _, linha in series.iterrows()}
+    assert encontradas == {
+        'netflix': ('Mensal', 'Fixos'),
+        'conta de luz': ('Mensal', 'Recorrentes'),
+        'academia': ('Semanal', 'Fixos'),
+    }
+
+
+def test_rotulos_por_linha(detectado):
+    df, rotulos, _ = detectado
+    assert sugestoes(detectado, 'conta de luz') == {'Recorrentes'}
+    assert sugestoes(detectado, 'academia') == {'Fixos'}
+    assert sugestoes(detectado, 'cinema') == {'Não Recorrentes'}
+    assert sugestoes(detectado, 'salário') == {'Receitas'}
+    netflix = df['Descrição (Opcional)'].astype(str) == 'Netflix'
+    valores = df.loc[netflix, 'Centavos']
+    assert set(rotulos[netflix & (valores == -3990)]) == {'Fixos'}
+    assert set(rotulos[netflix & (valores == -40000)]) == {'Não Recorrentes'}
+
+
+def test_proximo_previsto(detectado):
+    _, _, series = detectado
+    netflix = series[series['Descrição'] == 'Netflix'].iloc[0]
+    assert netflix['Último'] == pd.Timestamp('2024-12-05')
+    assert abs((netflix['Próximo Previsto'] - pd.Timestamp('2025-01-05')).days) <= 1
+    assert netflix['Valor Típico'] == 39.90
+    assert netflix['Ocorrências'] == 12
+
+
+def test_sem_despesas():
+    df = normalizacao.normalizar(pd.DataFrame([lancamento(pd.Timestamp('2024-01-05'), 5000, 'Salário', 'Salário')]))
+    rotulos, series = recorrencia.detectar(df)
+    assert list(rotulos) == ['Receitas'] and series.empty
+
+
+def test_detector_refaz_so_quando_os_dados_mudam():
+    detector = recorrencia.DetectorRecorrencia()
+    df = ledger()
+    deteccao, calculada = detector.atualizar(df)
+    assert calculada
+    assert detector.atualizar(df) == (deteccao, False)
+
+    novo = ledger([lancamento(pd.Timestamp('2025-01-05'), -39.90, 'Assinaturas', 'Netflix')])
+    nova_deteccao, calculada = detector.atualizar(novo)
+    assert calculada and nova_deteccao is not deteccao
+    # A detecção antiga continua valendo para o recorte que a guardou
+    assert deteccao.rotulos_de(df.iloc[:5]).index.tolist() == df.index[:5].tolist()
+
+
+def test_gastos_por_sugestao(detectado):
+    df, rotulos, _ = detectado
+    deteccao = recorrencia.Deteccao(df, "v")
+    categorias = df['Categoria'].cat.categories.tolist()
+    gastos = deteccao.gastos_por_sugestao('2024-03', categorias)
+    gastos = gastos.set_index(gastos['Recorrência'].astype(str))['Valor_Abs']
+
+    do_mes = (df['Mes_Ano'] == '2024-03') & (rotulos != 'Receitas')
+    esperado = df['Centavos'][do_mes].abs().groupby(rotulos[do_mes].astype(str)).sum() / 100
+    pd.testing.assert_series_equal(gastos.sort_index(), esperado.sort_index(), check_names=False)
+    assert deteccao.gastos_por_sugestao('1999-01', categorias).empty
@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import saldo
+
+
+def saldo_ingenuo(datas, centavos, data):
+    datas = pd.to_datetime(pd.Series(datas))
+    return int(np.asarray(centavos)[(datas <= pd.Timestamp(data)).to_numpy()].sum())
+
+
+def test_vazio():
+    corrido = saldo.SaldoCorrido()
+    assert corrido.ate('2025-01-01') == 0
+    corrido.adicionar([], [])
+    assert corrido.ate('2025-01-01') == 0
+
+
+def test_saldo_ate_cada_data():
+    corrido = saldo.SaldoCorrido()
+    corrido.adicionar(pd.to_datetime(['2025-01-10', '2025-01-05', '2025-01-10', '2025-02-01']), [100, -30, 5, 1])
+    assert corrido.ate('2025-01-04') == 0
+    assert corrido.ate('2025-01-05') == -30
+    assert corrido.ate('2025-01-09 23:59') == -30
+    # A data vale inteira: os dois lançamentos do dia 10 entram
+    assert corrido.ate('2025-01-10') == 75
+    assert corrido.ate('2030-01-01') == 76
+    assert corrido.ate_fim_do_mes('2025-01') == 75
+    assert corrido.ate_fim_do_mes('2024-12') == 0
+
+
+def test_lancamentos_novos_no_fim():
+    corrido = saldo.SaldoCorrido()
+    corrido.adicionar(pd.to_datetime(['2025-01-01', '2025-01-02']), [10, 20])
+    corrido.adicionar(pd.to_datetime(['2025-01-02', '2025-01-03']), [5, 7])
+    assert corrido.acumulado.tolist() == [10, 30, 35, 42]
+
+
+@pytest.mark.parametrize("semente", range(5))
+def test_lotes_fora_de_ordem_batem_com_a_soma_direta(semente):
+    rng = np.random.default_rng(semente)
+    datas = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 400, 300), unit='D')
+    centavos = rng.integers(-100_000, 100_000, 300)
+
+    corrido = saldo.SaldoCorrido()
+    for inicio in range(0, 300, 60):
+        corrido.adicionar(datas[inicio:inicio + 60], centavos[inicio:inicio + 60])
+
+    for data in pd.date_range('2023-12-31', '2025-02-10', freq='17D'):
+        assert corrido.ate(data) == saldo_ingenuo(datas, centavos, data)
+    assert corrido.ate_fim_do_mes('2024-06') == saldo_ingenuo(datas, centavos, '2024-06-30 23:59:59')
+
+
+def test_centavos_sao_exatos():
+    # Em float, 0.1 + 0.2 != 0.3; em centavos inteiros a soma é exata
+    corrido = saldo.SaldoCorrido()
+    corrido.adicionar(pd.to_datetime(['2025-01-01'] * 3), [10, 20, -30])
+    assert corrido.ate('2025-01-01') == 0
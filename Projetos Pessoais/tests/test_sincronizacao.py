@@ -0,0 +1,189 @@
+import math
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest
+from gspread.utils import a1_to_rowcol
+
+import sincronizacao
+
+CABECALHO = ['Data', 'Valor', 'Categoria', 'Forma de Pagamento', 'Parcelas', 'Recorrência', 'Descrição (Opcional)']
+
+
+class PlanilhaFalsa:
+    """Worksheet em memória que responde como a API: corta células e linhas vazias do fim."""
+
+    def __init__(self, valores):
+        self.valores = [list(linha) for linha in valores]
+        self.chamadas = 0
+
+    def _ler(self, intervalo):
+        if re.fullmatch(r"\d+:\d+", intervalo):
+            primeira, ultima = map(int, intervalo.split(":"))
+            coluna_final = None
+        else:
+            inicio, fim = intervalo.split(":")
+            primeira, _ = a1_to_rowcol(inicio)
+            if fim.isalpha():
+                ultima, coluna_final = len(self.valores), a1_to_rowcol(fim + "1")[1]
+            else:
+                ultima, coluna_final = a1_to_rowcol(fim)
+        linhas = [linha[:coluna_final] for linha in self.valores[primeira - 1:ultima]]
+        linhas = [sincronizacao.sem_vazias_no_fim(linha) for linha in linhas]
+        while linhas and not linhas[-1]:
+            linhas.pop()
+        return linhas
+
+    def get_values(self, intervalo=None):
+        self.chamadas += 1
+        if intervalo is None:
+            # get_values() sem intervalo devolve a planilha inteira, retangular
+            largura = max((len(linha) for linha in self.valores), default=0)
+            return [(linha + [""] * largura)[:largura] for linha in self.valores]
+        return self._ler(intervalo)
+
+    def batch_get(self, intervalos):
+        self.chamadas += 1
+        return [self._ler(intervalo) for intervalo in intervalos]
+
+    def dados(self):
+        largura = len(self.valores[0])
+        return sincronizacao.completar_linhas(self.valores[1:], largura)
+
+
+def lancamento(numero):
+    return [f"{numero % 28 + 1:02d}/01/2025", f"-R$ {numero},00", "Mercado", "Pix", "1", "Não Recorrentes",
+            f"compra {numero}"]
+
+
+@pytest.fixture
+def blocos_pequenos(monkeypatch):
+    # Blocos de 5 linhas: poucas linhas já bastam para ter vários blocos antigos
+    monkeypatch.setattr(sincronizacao, "TAMANHO_BLOCO", 5)
+
+
+@pytest.fixture
+def planilha():
+    return PlanilhaFalsa([CABECALHO] + [lancamento(i) for i in range(23)])
+
+
+def sincronizar(planilha, tmp_path):
+    return sincronizacao.sincronizar(planilha, tmp_path / "sincronizacao.json")
+
+
+def test_primeira_sincronizacao_e_completa(planilha, tmp_path, blocos_pequenos):
+    cabecalho, linhas, modo = sincronizar(planilha, tmp_path)
+    assert modo == "completa"
+    assert cabecalho == CABECALHO
+    assert linhas == planilha.dados()
+
+
+def test_linhas_novas_no_fim(planilha, tmp_path, blocos_pequenos):
+    sincronizar(planilha, tmp_path)
+    planilha.valores += [lancamento(i) for i in range(100, 108)]
+    planilha.chamadas = 0
+
+    _, linhas, modo = sincronizar(planilha, tmp_path)
+    assert modo == "incremental"
+    assert linhas == planilha.dados()
+    # Cabeçalho, fim da planilha e blocos conferidos vêm em uma única chamada
+    assert planilha.chamadas == 1
+
+
+def test_sem_mudancas(planilha, tmp_path, blocos_pequenos):
+    sincronizar(planilha, tmp_path)
+    for _ in range(3):
+        _, linhas, modo = sincronizar(planilha, tmp_path)
+        assert modo == "incremental"
+        assert linhas == planilha.dados()
+
+
+def test_linha_apagada_no_meio(planilha, tmp_path, blocos_pequenos):
+    sincronizar(planilha, tmp_path)
+    del planilha.valores[8]
+
+    _, linhas, modo = sincronizar(planilha, tmp_path)
+    assert modo == "completa"
+    assert linhas == planilha.dados()
+
+
+def test_linha_apagada_no_fim(planilha, tmp_path, blocos_pequenos):
+    sincronizar(planilha, tmp_path)
+    planilha.valores.pop()
+
+    _, linhas, _ = sincronizar(planilha, tmp_path)
+    assert linhas == planilha.dados()
+
+
+def test_edicao_no_ultimo_bloco(planilha, tmp_path, blocos_pequenos):
+    sincronizar(planilha, tmp_path)
+    planilha.valores[-1][1] = "-R$ 999,99"
+
+    _, linhas, modo = sincronizar(planilha, tmp_path)
+    assert modo == "completa"
+    assert linhas == planilha.dados()
+
+
+@pytest.mark.parametrize("linha_editada", [1, 7, 13, 61, 117])
+def test_edicao_antiga_aparece_dentro_do_rodizio(tmp_path, blocos_pequenos, linha_editada):
+    planilha = PlanilhaFalsa([CABECALHO] + [lancamento(i) for i in range(123)])
+    sincronizar(planilha, tmp_path)
+    planilha.valores[linha_editada][2] = "Farmácia"
+
+    blocos_antigos = math.ceil(123 / sincronizacao.TAMANHO_BLOCO) - 1
+    limite = math.ceil(blocos_antigos / sincronizacao.BLOCOS_VERIFICADOS)
+    for _ in range(limite):
+        _, linhas, modo = sincronizar(planilha, tmp_path)
+        if modo == "completa":
+            break
+    assert modo == "completa"
+    assert linhas == planilha.dados()
+
+
+def test_cabecalho_renomeado(planilha, tmp_path, blocos_pequenos):
+    sincronizar(planilha, tmp_path)
+    planilha.valores[0][2] = "Tipo"
+
+    cabecalho, linhas, modo = sincronizar(planilha, tmp_path)
+    assert modo == "completa"
+    assert cabecalho[2] == "Tipo"
+    assert linhas == planilha.dados()
+
+
+def test_coluna_nova(planilha, tmp_path, blocos_pequenos):
+    sincronizar(planilha, tmp_path)
+    planilha.valores[0].append("Conta")
+    for linha in planilha.valores[1:]:
+        linha.append("Nubank")
+
+    cabecalho, linhas, modo = sincronizar(planilha, tmp_path)
+    assert modo == "completa"
+    assert cabecalho == CABECALHO + ["Conta"]
+    assert linhas == planilha.dados()
+
+
+def test_celulas_vazias_no_fim_nao_mudam_o_cabecalho(planilha, tmp_path, blocos_pequenos):
+    # Uma linha com a descrição vazia vem cortada pela API, mas é a mesma linha
+    planilha.valores.append(lancamento(200)[:-1] + [""])
+    sincronizar(planilha, tmp_path)
+    planilha.valores.append(lancamento(201))
+
+    _, linhas, modo = sincronizar(planilha, tmp_path)
+    assert modo == "incremental"
+    assert linhas == planilha.dados()
+
+
+def test_recarga_completa_periodica(planilha, tmp_path, blocos_pequenos, monkeypatch):
+    monkeypatch.setattr(sincronizacao, "RECARGA_COMPLETA_A_CADA", 3)
+    modos = [sincronizar(planilha, tmp_path)[2] for _ in range(5)]
+    assert modos == ["completa", "incremental", "incremental", "incremental", "completa"]
+
+
+def test_estado_corrompido(planilha, tmp_path, blocos_pequenos):
+    (tmp_path / "sincronizacao.json").write_text("{", encoding="utf-8")
+    _, linhas, modo = sincronizar(planilha, tmp_path)
+    assert modo == "completa"
+    assert linhas == planilha.dados()
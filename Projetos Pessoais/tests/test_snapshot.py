@@ -0,0 +1,83 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+import pytest
+
+import snapshot
+
+
+@pytest.fixture(autouse=True)
+def pasta_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, "PASTA_CACHE", tmp_path)
+    return tmp_path
+
+
+def ledger():
+    df = pd.DataFrame({
+        'Data': pd.to_datetime(['2025-01-05', '2025-01-06', '2025-02-01']),
+        'Valor': [-1000, 250000, -3990],
+        'Categoria': pd.Categorical(['Mercado', 'Salário', 'Assinaturas']),
+        'Descrição (Opcional)': ['compra', '', 'Netflix'],
+    })
+    df.attrs["lido_em"] = 1_700_000_000.0
+    df.attrs["versao_fonte"] = "abc123"
+    return df
+
+
+def reescrever_metadados(nome="planilha", **mudancas):
+    _, metadados = snapshot.caminhos(nome)
+    info = json.loads(metadados.read_text(encoding="utf-8"))
+    info.update(mudancas)
+    metadados.write_text(json.dumps(info), encoding="utf-8")
+
+
+def test_ida_e_volta():
+    snapshot.salvar(ledger())
+    df = snapshot.carregar()
+    pd.testing.assert_frame_equal(df, ledger())
+    assert df.attrs["lido_em"] == 1_700_000_000.0
+    assert df.attrs["versao_fonte"] == "abc123"
+
+
+def test_cada_fonte_tem_o_seu_snapshot():
+    snapshot.salvar(ledger(), "csv")
+    assert snapshot.carregar("planilha") is None
+    assert len(snapshot.carregar("csv")) == 3
+
+
+def test_sem_snapshot():
+    assert snapshot.carregar() is None
+
+
+def test_outra_versao_e_descartada():
+    snapshot.salvar(ledger())
+    reescrever_metadados(versao=snapshot.VERSAO_SNAPSHOT - 1)
+    assert snapshot.carregar() is None
+
+
+@pytest.mark.parametrize("mudancas", [{"linhas": 4}, {"colunas": {"Data": "datetime64[ns]"}}])
+def test_arquivo_diferente_dos_metadados(mudancas):
+    snapshot.salvar(ledger())
+    reescrever_metadados(**mudancas)
+    assert snapshot.carregar() is None
+
+
+def test_arquivos_corrompidos():
+    snapshot.salvar(ledger())
+    caminho, metadados = snapshot.caminhos("planilha")
+    caminho.write_bytes(b"nao e parquet")
+    assert snapshot.carregar() is None
+
+    metadados.write_text("{", encoding="utf-8")
+    assert snapshot.carregar() is None
+
+
+def test_snapshot_antigo_sem_data_de_leitura():
+    snapshot.salvar(ledger())
+    reescrever_metadados(salvo_em=None)
+    caminho, _ = snapshot.caminhos("planilha")
+    assert snapshot.carregar().attrs["lido_em"] == caminho.stat().st_mtime